@@ -3,10 +3,13 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.contrib.admin import SimpleListFilter
+from django.db import transaction
 from django.db.models import Count
 from django.utils.text import slugify
 from .models import BookCategory, Book, Article, ArticleComment
+from . import popularity
 from courses.models import Tags
+from extras import home
 
 
 class PublishedFilter(SimpleListFilter):
@@ -112,7 +115,7 @@ class BookAdmin(admin.ModelAdmin):
     file_size_display.short_description = 'حجم الملف'
     
     def popularity_score(self, obj):
-        return f'{obj.popularity_score:,} نقطة'
+        return f'{obj.popularity_score:,.1f} نقطة'
     popularity_score.short_description = 'نقاط الشعبية'
     
     def get_queryset(self, request):
@@ -188,12 +191,13 @@ class ArticleAdmin(admin.ModelAdmin):
     featured_display.short_description = 'مميز'
     
     def comments_count(self, obj):
-        count = obj.comments.filter(is_approved=True).count()
+        count = obj.comments_count
         if count > 0:
             url = reverse('admin:articles_articlecomment_changelist') + f'?article__id__exact={obj.id}'
             return format_html('<a href="{}">{} تعليق</a>', url, count)
         return '0 تعليق'
     comments_count.short_description = 'التعليقات'
+    comments_count.admin_order_field = 'comments_count'
     
     def reading_time_display(self, obj):
         return f'{obj.reading_time} دقيقة'
@@ -218,21 +222,32 @@ class ArticleAdmin(admin.ModelAdmin):
     
     def make_featured(self, request, queryset):
         updated = queryset.update(featured=True)
+        # update() sends no post_save: drop the homepage article feeds here
+        home.invalidate_for_model(Article)
         self.message_user(request, f'تم تمييز {updated} مقال.')
     make_featured.short_description = "تمييز المقالات المحددة"
     
     def remove_featured(self, request, queryset):
         updated = queryset.update(featured=False)
+        home.invalidate_for_model(Article)
         self.message_user(request, f'تم إلغاء تمييز {updated} مقال.')
     remove_featured.short_description = "إلغاء تمييز المقالات المحددة"
     
     def publish_articles(self, request, queryset):
-        updated = queryset.update(status='published')
+        # save() per article sets published_at and refreshes the related-articles index
+        updated = 0
+        for article in queryset.exclude(status='published'):
+            article.status = 'published'
+            article.save()
+            updated += 1
         self.message_user(request, f'تم نشر {updated} مقال.')
     publish_articles.short_description = "نشر المقالات المحددة"
     
     def unpublish_articles(self, request, queryset):
         updated = queryset.update(status='draft')
+        for article in queryset:
+            popularity.refresh_related_articles(article)
+        home.invalidate_for_model(Article)
         self.message_user(request, f'تم إلغاء نشر {updated} مقال.')
     unpublish_articles.short_description = "إلغاء نشر المقالات المحددة"
 
@@ -289,13 +304,23 @@ class ArticleCommentAdmin(admin.ModelAdmin):
         return f'{obj.replies.count():,}' if hasattr(obj, 'replies') else '0'
     replies_count.short_description = 'الردود'
     
+    def _set_approval(self, queryset, is_approved):
+        # Bulk update bypasses ArticleComment.save(), so adjust the article counters per article
+        changed = queryset.exclude(is_approved=is_approved)
+        counts = changed.values('article_id').annotate(total=Count('id')).order_by()
+        delta_sign = 1 if is_approved else -1
+        with transaction.atomic():
+            for row in counts:
+                Article.adjust_counters(row['article_id'], comments_count=delta_sign * row['total'])
+            return changed.update(is_approved=is_approved)
+
     def approve_comments(self, request, queryset):
-        updated = queryset.update(is_approved=True)
+        updated = self._set_approval(queryset, True)
         self.message_user(request, f'تم قبول {updated} تعليق.')
     approve_comments.short_description = "قبول التعليقات المحددة"
     
     def disapprove_comments(self, request, queryset):
-        updated = queryset.update(is_approved=False)
+        updated = self._set_approval(queryset, False)
         self.message_user(request, f'تم رفض {updated} تعليق.')
     disapprove_comments.short_description = "رفض التعليقات المحددة"
     
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from articles import view_counter
+
+
+class Command(BaseCommand):
+    help = 'Write buffered article/book view and download counters to the database'
+
+    def handle(self, *args, **options):
+        summary = view_counter.flush()
+        if not summary:
+            self.stdout.write('Nothing flushed (no closed windows or another flush is running)')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            ', '.join(f'{name}: {count}' for name, count in sorted(summary.items()))
+        ))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from articles import popularity
+from articles.models import Article
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored article/book popularity scores (time decayed) and optionally the related-articles index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild-related',
+            action='store_true',
+            help='Also rebuild the whole related-articles index',
+        )
+        parser.add_argument(
+            '--recount-interactions',
+            action='store_true',
+            help='First recount the stored like/bookmark/comment/rating aggregates of every article',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of rows written per bulk update',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if options['recount_interactions']:
+            for article in Article.objects.only('pk').iterator(chunk_size=batch_size):
+                article.update_interaction_statistics()
+
+        articles = popularity.recompute_article_popularity(batch_size=batch_size)
+        books = popularity.recompute_book_popularity(batch_size=batch_size)
+        message = f'Updated popularity of {articles} articles and {books} books'
+
+        if options['rebuild_related']:
+            links = popularity.rebuild_related_articles(batch_size=batch_size)
+            message += f', rebuilt {links} related-article links'
+
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0004_alter_article_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedArticle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shared_tags', models.PositiveIntegerField(default=0, verbose_name='الوسوم المشتركة')),
+            ],
+            options={
+                'verbose_name': 'مقالة ذات صلة',
+                'verbose_name_plural': 'المقالات ذات الصلة',
+                'ordering': ['-shared_tags', '-related__popularity_score'],
+            },
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='popularity_score',
+            field=models.FloatField(default=0, editable=False, verbose_name='نقاط الشعبية'),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='popularity_score',
+            field=models.FloatField(default=0, editable=False, verbose_name='نقاط الشعبية'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['status', '-popularity_score'], name='articles_ar_status_cdb39d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['is_available', '-popularity_score'], name='articles_bo_is_avai_5ed59d_idx'),
+        ),
+        migrations.AddField(
+            model_name='relatedarticle',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='articles.article'),
+        ),
+        migrations.AddField(
+            model_name='relatedarticle',
+            name='related',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='articles.article'),
+        ),
+        migrations.AddIndex(
+            model_name='relatedarticle',
+            index=models.Index(fields=['article', '-shared_tags'], name='articles_re_article_fca273_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='relatedarticle',
+            constraint=models.UniqueConstraint(fields=('article', 'related'), name='unique_related_article'),
+        ),
+    ]
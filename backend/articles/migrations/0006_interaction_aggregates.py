@@ -0,0 +1,92 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:32
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_interaction_aggregates(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    Like = apps.get_model('articles', 'Like')
+    Bookmark = apps.get_model('articles', 'Bookmark')
+    ArticleRating = apps.get_model('articles', 'ArticleRating')
+    ArticleComment = apps.get_model('articles', 'ArticleComment')
+
+    values = {}
+
+    def collect(queryset, **aggregates):
+        for row in queryset.values('article_id').annotate(**aggregates).order_by():
+            article_values = values.setdefault(row.pop('article_id'), {})
+            article_values.update({field: value or 0 for field, value in row.items()})
+
+    collect(Like.objects.all(), likes_count=Count('id'))
+    collect(Bookmark.objects.all(), bookmarks_count=Count('id'))
+    collect(ArticleComment.objects.filter(is_approved=True), comments_count=Count('id'))
+    collect(
+        ArticleRating.objects.all(),
+        ratings_count=Count('id'),
+        ratings_sum=Sum('rating'),
+        **{f'rating_{star}_count': Count('id', filter=Q(rating=star)) for star in range(1, 6)}
+    )
+    for article_id, article_values in values.items():
+        Article.objects.filter(pk=article_id).update(**article_values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0005_popularity_and_related'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='bookmarks_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='عدد الإشارات المرجعية'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='عدد التعليقات'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='عدد الإعجابات'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='تقييمات نجمة واحدة'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='تقييمات نجمتين'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='تقييمات 3 نجوم'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='تقييمات 4 نجوم'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='تقييمات 5 نجوم'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='ratings_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='عدد التقييمات'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='ratings_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='مجموع التقييمات'),
+        ),
+        migrations.RunPython(backfill_interaction_aggregates, migrations.RunPython.noop),
+    ]
@@ -4,10 +4,16 @@ from django.contrib.auth.models import User
 from django_ckeditor_5.fields import CKEditor5Field
 from django.utils.text import slugify
 from django.urls import reverse
-from django.db.models import Count, Avg, Q
+from django.db import transaction
+from django.db.models import Count, Avg, F, Q, Sum, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.db.models.signals import m2m_changed, post_delete
+from django.dispatch import receiver
 from courses.models import Tags
 
+from . import popularity, view_counter
+
 User = get_user_model()
 
 
@@ -37,6 +43,7 @@ class Book(models.Model):
     is_available = models.BooleanField(default=True, verbose_name="متاح")
     download_count = models.PositiveIntegerField(default=0, verbose_name="عدد التحميلات")
     view_count = models.PositiveIntegerField(default=0, verbose_name="عدد المشاهدات")
+    popularity_score = models.FloatField(default=0, editable=False, verbose_name="نقاط الشعبية")
     file_size = models.PositiveIntegerField(null=True, blank=True, verbose_name="حجم الملف (بايت)")
     isbn = models.CharField(max_length=20, blank=True, null=True, verbose_name="ISBN")
     language = models.CharField(max_length=50, default='العربية', verbose_name="اللغة")
@@ -54,22 +61,16 @@ class Book(models.Model):
             models.Index(fields=['author_name']),
             models.Index(fields=['category']),
             models.Index(fields=['is_available']),
+            models.Index(fields=['is_available', '-popularity_score']),
         ]
 
     def increment_downloads(self):
-        """زيادة عدد التحميلات"""
-        self.download_count += 1
-        self.save(update_fields=['download_count'])
+        """زيادة عدد التحميلات (يتم تجميعها في الكاش ثم كتابتها دفعة واحدة)"""
+        view_counter.increment('book_downloads', self.pk)
 
     def increment_views(self):
-        """زيادة عدد المشاهدات"""
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
-
-    @property
-    def popularity_score(self):
-        """حساب نقاط الشعبية بناءً على المشاهدات والتحميلات"""
-        return (self.view_count * 1) + (self.download_count * 3)
+        """زيادة عدد المشاهدات (يتم تجميعها في الكاش ثم كتابتها دفعة واحدة)"""
+        view_counter.increment('book_views', self.pk)
 
     def get_file_size_display(self):
         """عرض حجم الملف بطريقة مقروءة"""
@@ -103,6 +104,20 @@ class Article(models.Model):
     image = models.ImageField(upload_to='articles/', null=True, blank=True, verbose_name='الصورة')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft', verbose_name='الحالة')
     views_count = models.PositiveIntegerField(default=0, verbose_name='عدد المشاهدات')
+    popularity_score = models.FloatField(default=0, editable=False, verbose_name='نقاط الشعبية')
+
+    # Interaction aggregates (denormalized, maintained by Like/Bookmark/ArticleRating/ArticleComment)
+    likes_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='عدد الإعجابات')
+    bookmarks_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='عدد الإشارات المرجعية')
+    comments_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='عدد التعليقات')
+    ratings_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='عدد التقييمات')
+    ratings_sum = models.PositiveIntegerField(default=0, editable=False, verbose_name='مجموع التقييمات')
+    rating_1_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='تقييمات نجمة واحدة')
+    rating_2_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='تقييمات نجمتين')
+    rating_3_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='تقييمات 3 نجوم')
+    rating_4_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='تقييمات 4 نجوم')
+    rating_5_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='تقييمات 5 نجوم')
+
     featured = models.BooleanField(default=False, verbose_name='مميز')
     meta_description = models.CharField(max_length=160, blank=True, null=True, verbose_name='وصف SEO')
     meta_keywords = models.CharField(max_length=255, blank=True, null=True, verbose_name='كلمات مفتاحية SEO')
@@ -117,6 +132,7 @@ class Article(models.Model):
             models.Index(fields=['status', '-created_at']),
             models.Index(fields=['featured', '-created_at']),
             models.Index(fields=['author', '-created_at']),
+            models.Index(fields=['status', '-popularity_score']),
         ]
 
     def __str__(self):
@@ -138,17 +154,24 @@ class Article(models.Model):
         if self.status == 'published' and not self.published_at:
             from django.utils import timezone
             self.published_at = timezone.now()
-        
+
+        previous_status = None
+        if self.pk:
+            previous_status = Article.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+
         super().save(*args, **kwargs)
 
+        # Keep the related-articles index in sync when publication state changes
+        if previous_status != self.status and 'published' in (previous_status, self.status):
+            popularity.refresh_related_articles(self)
+
     def get_absolute_url(self):
         """الحصول على رابط المقالة"""
         return reverse('article_detail', kwargs={'slug': self.slug})
 
     def increment_views(self):
-        """زيادة عدد المشاهدات"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+        """زيادة عدد المشاهدات (يتم تجميعها في الكاش ثم كتابتها دفعة واحدة)"""
+        view_counter.increment('article_views', self.pk)
 
     @property
     def reading_time(self):
@@ -170,11 +193,23 @@ class Article(models.Model):
 
     def get_related_articles(self, limit=5):
         """
-        الحصول على المقالات ذات الصلة
+        الحصول على المقالات ذات الصلة من الفهرس المحسوب مسبقاً (الوسوم المشتركة)،
+        مع الرجوع لأحدث المقالات المنشورة إذا لم يوجد ما يكفي
         """
-        return Article.objects.filter(
-            status='published'
-        ).exclude(id=self.id).order_by('-published_at')[:limit]
+        links = (
+            RelatedArticle.objects
+            .filter(article=self, related__status='published')
+            .select_related('related', 'related__author')[:limit]
+        )
+        related = [link.related for link in links]
+        if len(related) < limit:
+            related += list(
+                Article.objects.filter(status='published')
+                .exclude(pk__in=[self.pk] + [article.pk for article in related])
+                .select_related('author')
+                .order_by('-published_at')[:limit - len(related)]
+            )
+        return related
 
     # Like-related methods
     def like(self, user):
@@ -244,23 +279,68 @@ class Article(models.Model):
             }
         )
     
+    @property
+    def average_rating(self):
+        """متوسط التقييم من القيم المخزنة"""
+        return self.ratings_sum / self.ratings_count if self.ratings_count else 0
+
     def get_average_rating(self):
         """Get the average rating of the article"""
-        return self.ratings.aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0
-    
+        return self.average_rating
+
     def get_rating_count(self):
         """Get the total number of ratings"""
-        return self.ratings.count()
-    
+        return self.ratings_count
+
     def get_rating_distribution(self):
         """Get the distribution of ratings (count per star)"""
-        return (
-            self.ratings
-            .values('rating')
-            .annotate(count=Count('id'))
-            .order_by('rating')
+        return [
+            {'rating': star, 'count': getattr(self, f'rating_{star}_count')}
+            for star in range(1, 6)
+        ]
+
+    # Denormalized interaction aggregates
+    @classmethod
+    def adjust_counters(cls, article_id, **deltas):
+        """Apply counter deltas (e.g. ``likes_count=1``) in a single UPDATE with F() expressions"""
+        updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if updates:
+            cls.objects.filter(pk=article_id).update(**updates)
+
+    @classmethod
+    def apply_rating_change(cls, article_id, old_rating=None, new_rating=None):
+        """Move one rating in/out of the stored count, sum and histogram"""
+        if old_rating == new_rating:
+            return
+        deltas = {
+            'ratings_count': (new_rating is not None) - (old_rating is not None),
+            'ratings_sum': (new_rating or 0) - (old_rating or 0),
+        }
+        if old_rating is not None:
+            deltas[f'rating_{old_rating}_count'] = -1
+        if new_rating is not None:
+            deltas[f'rating_{new_rating}_count'] = deltas.get(f'rating_{new_rating}_count', 0) + 1
+        cls.adjust_counters(article_id, **deltas)
+
+    def update_interaction_statistics(self):
+        """Recompute all interaction aggregates from the source tables (repair/backfill)"""
+        ratings = self.ratings.aggregate(
+            count=Count('id'),
+            total=Sum('rating'),
+            **{f'stars_{star}': Count('id', filter=Q(rating=star)) for star in range(1, 6)}
         )
-    
+        values = {
+            'likes_count': self.likes.count(),
+            'bookmarks_count': self.bookmarks.count(),
+            'comments_count': self.comments.filter(is_approved=True).count(),
+            'ratings_count': ratings['count'],
+            'ratings_sum': ratings['total'] or 0,
+            **{f'rating_{star}_count': ratings[f'stars_{star}'] for star in range(1, 6)},
+        }
+        for field, value in values.items():
+            setattr(self, field, value)
+        Article.objects.filter(pk=self.pk).update(**values)
+
     def get_user_rating(self, user):
         """Get the user's rating for this article if it exists"""
         if not user.is_authenticated:
@@ -272,26 +352,74 @@ class Article(models.Model):
     
     # View tracking
     def track_view(self, request):
-        """Track a view of this article"""
-        from .models_interaction import ArticleView
-        
+        """Track a view of this article.
+
+        The counter and the raw ArticleView row are buffered in the cache and
+        written in bulk by ``view_counter.flush()``. Returns the estimated
+        current view count (stored count + buffered hits).
+        """
         # Get the user's IP address
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         ip_address = x_forwarded_for.split(',')[0] if x_forwarded_for else request.META.get('REMOTE_ADDR')
-        
-        # Create the view record
-        ArticleView.objects.create(
-            article=self,
-            user=request.user if request.user.is_authenticated else None,
+
+        view_counter.log_article_view(
+            article_id=self.pk,
+            user_id=request.user.pk if request.user.is_authenticated else None,
             ip_address=ip_address,
-            user_agent=request.META.get('HTTP_USER_AGENT', '')
+            user_agent=request.META.get('HTTP_USER_AGENT', ''),
+        )
+        view_counter.increment('article_views', self.pk)
+
+        return self.views_count + view_counter.pending('article_views', self.pk)
+
+
+class RelatedArticle(models.Model):
+    """فهرس المقالات ذات الصلة المحسوب مسبقاً من الوسوم المشتركة"""
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='+')
+    shared_tags = models.PositiveIntegerField(default=0, verbose_name='الوسوم المشتركة')
+
+    class Meta:
+        ordering = ['-shared_tags', '-related__popularity_score']
+        verbose_name = 'مقالة ذات صلة'
+        verbose_name_plural = 'المقالات ذات الصلة'
+        constraints = [
+            models.UniqueConstraint(fields=['article', 'related'], name='unique_related_article'),
+        ]
+        indexes = [
+            models.Index(fields=['article', '-shared_tags']),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id} -> {self.related_id}"
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def refresh_related_on_tags_change(sender, instance, action, reverse, pk_set=None, **kwargs):
+    """تحديث المقالات ذات الصلة عند تغيير وسوم مقالة منشورة"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        articles = [instance]
+    elif pk_set:
+        articles = Article.objects.filter(pk__in=pk_set)
+    else:
+        return
+    for article in articles:
+        if article.status == 'published':
+            popularity.refresh_related_articles(article)
+
+
+class ArticleCommentQuerySet(models.QuerySet):
+    def with_listing_stats(self):
+        """إضافة عدد الردود وبيانات الكاتب في استعلام واحد لقوائم التعليقات"""
+        replies = ArticleComment.objects.filter(parent=OuterRef('pk')).order_by().values('parent')
+        return self.select_related('user', 'user__profile').annotate(
+            reply_count=Coalesce(
+                Subquery(replies.annotate(total=Count('pk')).values('total'), output_field=models.IntegerField()),
+                Value(0)
+            )
         )
-        
-        # Update the view count
-        self.views_count = models.F('views_count') + 1
-        self.save(update_fields=['views_count'])
-        
-        return self.views_count
 
 
 class ArticleComment(models.Model):
@@ -304,6 +432,8 @@ class ArticleComment(models.Model):
     is_approved = models.BooleanField(default=True, verbose_name='موافق عليه')
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies', verbose_name='التعليق الأصلي')
 
+    objects = ArticleCommentQuerySet.as_manager()
+
     class Meta:
         ordering = ['created_at']
         verbose_name = 'تعليق المقالة'
@@ -312,7 +442,29 @@ class ArticleComment(models.Model):
     def __str__(self):
         return f'تعليق {self.user.username} على {self.article.title}'
 
+    def save(self, *args, **kwargs):
+        previous = None
+        if self.pk:
+            previous = ArticleComment.objects.filter(pk=self.pk).values('article_id', 'is_approved').first()
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Only approved comments are counted
+            old_article = previous['article_id'] if previous and previous['is_approved'] else None
+            new_article = self.article_id if self.is_approved else None
+            if old_article != new_article:
+                if old_article is not None:
+                    Article.adjust_counters(old_article, comments_count=-1)
+                if new_article is not None:
+                    Article.adjust_counters(new_article, comments_count=1)
+
     @property
     def is_reply(self):
         """فحص إذا كان هذا رد على تعليق آخر"""
         return self.parent is not None
+
+
+@receiver(post_delete, sender=ArticleComment)
+def update_comments_count_on_delete(sender, instance, **kwargs):
+    if instance.is_approved:
+        Article.adjust_counters(instance.article_id, comments_count=-1)
@@ -1,10 +1,18 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 from django.db.models import Avg, Count
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.apps import apps
+
+
+def _article_model():
+    # models.py imports this module, so resolve Article lazily
+    return apps.get_model('articles', 'Article')
 
 class Like(models.Model):
     """
@@ -24,6 +32,13 @@ class Like(models.Model):
     def __str__(self):
         return f"{self.user.username} likes {self.article.title}"
 
+    def save(self, *args, **kwargs):
+        created = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if created:
+                _article_model().adjust_counters(self.article_id, likes_count=1)
+
 class Bookmark(models.Model):
     """
     Model to allow users to bookmark articles.
@@ -42,6 +57,13 @@ class Bookmark(models.Model):
     def __str__(self):
         return f"{self.user.username} bookmarked {self.article.title}"
 
+    def save(self, *args, **kwargs):
+        created = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if created:
+                _article_model().adjust_counters(self.article_id, bookmarks_count=1)
+
 class ArticleRating(models.Model):
     """
     Model to store user ratings for articles.
@@ -74,6 +96,24 @@ class ArticleRating(models.Model):
     def __str__(self):
         return f"{self.user.username} rated {self.article.title} with {self.rating} stars"
 
+    def save(self, *args, **kwargs):
+        previous = None
+        if self.pk:
+            previous = ArticleRating.objects.filter(pk=self.pk).values('article_id', 'rating').first()
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            Article = _article_model()
+            rating = int(self.rating)
+            if previous and previous['article_id'] != self.article_id:
+                Article.apply_rating_change(previous['article_id'], old_rating=previous['rating'])
+                previous = None
+            Article.apply_rating_change(
+                self.article_id,
+                old_rating=previous['rating'] if previous else None,
+                new_rating=rating,
+            )
+
 class ArticleView(models.Model):
     """
     Model to track article views for analytics.
@@ -91,3 +131,18 @@ class ArticleView(models.Model):
     
     def __str__(self):
         return f"View of {self.article.title} by {self.user.username if self.user else 'Anonymous'}"
+
+
+@receiver(post_delete, sender=Like)
+def update_likes_count_on_delete(sender, instance, **kwargs):
+    _article_model().adjust_counters(instance.article_id, likes_count=-1)
+
+
+@receiver(post_delete, sender=Bookmark)
+def update_bookmarks_count_on_delete(sender, instance, **kwargs):
+    _article_model().adjust_counters(instance.article_id, bookmarks_count=-1)
+
+
+@receiver(post_delete, sender=ArticleRating)
+def update_rating_aggregates_on_delete(sender, instance, **kwargs):
+    _article_model().apply_rating_change(instance.article_id, old_rating=instance.rating)
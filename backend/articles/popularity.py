@@ -0,0 +1,174 @@
+"""
+Materialized popularity scores and related-article index.
+
+``Article.popularity_score`` and ``Book.popularity_score`` are stored,
+indexed columns recomputed periodically (``recompute_popularity``
+management command) so listings can ``order_by('-popularity_score')``.
+The score is a weighted engagement total multiplied by an exponential
+time decay based on the publish/upload date.
+
+``RelatedArticle`` rows hold, per article, the published articles sharing
+the most tags with it. They are refreshed incrementally when an article
+is published or its tags change, so detail pages read them with a single
+indexed query.
+"""
+import math
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+# Popularity weights per interaction
+VIEW_WEIGHT = 1
+LIKE_WEIGHT = 3
+BOOKMARK_WEIGHT = 4
+RATING_WEIGHT = 1  # multiplied by the star value of each rating
+DOWNLOAD_WEIGHT = 3
+
+# The score halves every HALF_LIFE_DAYS after publication
+HALF_LIFE_DAYS = 30
+
+# Related articles kept per article
+RELATED_LIMIT = 10
+
+
+def decay_factor(published_at, now=None):
+    if not published_at:
+        return 1.0
+    age_days = max(0.0, ((now or timezone.now()) - published_at).total_seconds() / 86400)
+    return math.pow(0.5, age_days / HALF_LIFE_DAYS)
+
+
+def _changed(old, new):
+    return abs((old or 0) - new) > 1e-6
+
+
+def recompute_article_popularity(queryset=None, now=None, batch_size=500):
+    """Recompute ``Article.popularity_score``; returns the number of rows changed"""
+    from .models import Article
+
+    now = now or timezone.now()
+    queryset = queryset if queryset is not None else Article.objects.all()
+    articles = queryset.only(
+        'id', 'views_count', 'likes_count', 'bookmarks_count', 'ratings_sum',
+        'published_at', 'created_at', 'popularity_score',
+    )
+
+    stale = []
+    for article in articles.iterator(chunk_size=batch_size):
+        engagement = (
+            article.views_count * VIEW_WEIGHT
+            + article.likes_count * LIKE_WEIGHT
+            + article.bookmarks_count * BOOKMARK_WEIGHT
+            + article.ratings_sum * RATING_WEIGHT
+        )
+        score = engagement * decay_factor(article.published_at or article.created_at, now)
+        if _changed(article.popularity_score, score):
+            article.popularity_score = score
+            stale.append(article)
+    Article.objects.bulk_update(stale, ['popularity_score'], batch_size=batch_size)
+    return len(stale)
+
+
+def recompute_book_popularity(queryset=None, now=None, batch_size=500):
+    """Recompute ``Book.popularity_score``; returns the number of rows changed"""
+    from .models import Book
+
+    now = now or timezone.now()
+    queryset = queryset if queryset is not None else Book.objects.all()
+    books = queryset.only('id', 'view_count', 'download_count', 'upload_date', 'popularity_score')
+
+    stale = []
+    for book in books.iterator(chunk_size=batch_size):
+        engagement = book.view_count * VIEW_WEIGHT + book.download_count * DOWNLOAD_WEIGHT
+        score = engagement * decay_factor(book.upload_date, now)
+        if _changed(book.popularity_score, score):
+            book.popularity_score = score
+            stale.append(book)
+    Book.objects.bulk_update(stale, ['popularity_score'], batch_size=batch_size)
+    return len(stale)
+
+
+def _related_candidates(article_id, tag_ids):
+    """``[(article_id, shared_tags), ...]`` best first, for published articles"""
+    from .models import Article
+
+    if not tag_ids:
+        return []
+    through = Article.tags.through
+    rows = (
+        through.objects
+        .filter(tag_id__in=tag_ids, article__status='published')
+        .exclude(article_id=article_id)
+        .values('article_id')
+        .annotate(shared=Count('tag_id'))
+        .order_by('-shared', '-article__popularity_score', '-article__published_at')
+    )
+    return [(row['article_id'], row['shared']) for row in rows[:RELATED_LIMIT]]
+
+
+def refresh_related_articles(article):
+    """Rebuild one article's related list and link it into its neighbours' lists.
+
+    Each neighbour keeps its best ``RELATED_LIMIT`` rows. Unpublished articles
+    are removed from the index entirely.
+    """
+    from .models import RelatedArticle
+
+    with transaction.atomic():
+        # Rows pointing at this article are stale whatever its new state is
+        RelatedArticle.objects.filter(related_id=article.pk).delete()
+        RelatedArticle.objects.filter(article_id=article.pk).delete()
+        if article.status != 'published':
+            return []
+
+        tag_ids = list(article.tags.values_list('pk', flat=True))
+        candidates = _related_candidates(article.pk, tag_ids)
+        RelatedArticle.objects.bulk_create(
+            [RelatedArticle(article_id=article.pk, related_id=pk, shared_tags=shared)
+             for pk, shared in candidates]
+            + [RelatedArticle(article_id=pk, related_id=article.pk, shared_tags=shared)
+               for pk, shared in candidates]
+        )
+        _trim_related([pk for pk, _ in candidates])
+    return [pk for pk, _ in candidates]
+
+
+def _trim_related(article_ids):
+    """Cut the related lists of ``article_ids`` back to their best ``RELATED_LIMIT`` rows"""
+    from .models import RelatedArticle
+
+    rows = RelatedArticle.objects.filter(article_id__in=article_ids).order_by(
+        'article_id', '-shared_tags', '-related__popularity_score', '-related__published_at'
+    ).values_list('pk', 'article_id')
+    kept, excess = {}, []
+    for pk, article_id in rows:
+        kept[article_id] = kept.get(article_id, 0) + 1
+        if kept[article_id] > RELATED_LIMIT:
+            excess.append(pk)
+    if excess:
+        RelatedArticle.objects.filter(pk__in=excess).delete()
+
+
+def rebuild_related_articles(batch_size=500):
+    """Full rebuild of the related-article index (trims neighbour lists too)"""
+    from .models import Article, RelatedArticle
+
+    through = Article.tags.through
+    tags_by_article = {}
+    for article_id, tag_id in through.objects.filter(
+        article__status='published'
+    ).values_list('article_id', 'tag_id'):
+        tags_by_article.setdefault(article_id, []).append(tag_id)
+
+    rows = []
+    for article_id, tag_ids in tags_by_article.items():
+        rows.extend(
+            RelatedArticle(article_id=article_id, related_id=pk, shared_tags=shared)
+            for pk, shared in _related_candidates(article_id, tag_ids)
+        )
+
+    with transaction.atomic():
+        RelatedArticle.objects.all().delete()
+        RelatedArticle.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
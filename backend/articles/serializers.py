@@ -1,18 +1,17 @@
 from rest_framework import serializers
+from core.images import ImageVariantsField
 from .models import BookCategory, Article, ArticleComment
 
 
 class BookCategorySerializer(serializers.ModelSerializer):
-    articles_count = serializers.SerializerMethodField()
+    # Annotated by BookCategoryViewSet (articles have no category since 0003)
+    books_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = BookCategory
-        fields = ['id', 'name', 'description', 'created_at', 'articles_count']
+        fields = ['id', 'name', 'description', 'created_at', 'books_count']
         read_only_fields = ['created_at']
 
-    def get_articles_count(self, obj):
-        return obj.articles.filter(is_published=True).count()
-
 
 class ArticleCommentSerializer(serializers.ModelSerializer):
     author_name = serializers.SerializerMethodField()
@@ -47,31 +46,31 @@ class ArticleCommentSerializer(serializers.ModelSerializer):
         return 'مستخدم'
 
     def get_replies_count(self, obj):
-        return getattr(obj, 'replies', []).count() if hasattr(obj, 'replies') else 0
+        if hasattr(obj, 'reply_count'):
+            return obj.reply_count
+        return obj.replies.count()
 
 
 class ArticleSerializer(serializers.ModelSerializer):
     author_name = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
+    average_rating = serializers.FloatField(read_only=True)
     reading_time = serializers.SerializerMethodField()
     tags = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
 
     class Meta:
         model = Article
         fields = [
             'id', 'title', 'slug', 'author', 'author_name', 
-            'content', 'summary', 'image', 'status', 'featured', 'allow_comments',
+            'content', 'summary', 'image', 'image_variants', 'status', 'featured', 'allow_comments',
             'meta_description', 'meta_keywords', 'views_count', 'comments_count', 'likes_count',
+            'bookmarks_count', 'ratings_count', 'average_rating',
             'reading_time', 'created_at', 'updated_at', 'published_at', 'tags'
         ]
-        read_only_fields = ['author', 'slug', 'views_count', 'created_at', 'updated_at', 'published_at']
-
-    def get_comments_count(self, obj):
-        return obj.comments.filter(is_approved=True).count()
-
-    def get_likes_count(self, obj):
-        return getattr(obj, 'likes', []).count() if hasattr(obj, 'likes') else 0
+        read_only_fields = [
+            'author', 'slug', 'views_count', 'comments_count', 'likes_count',
+            'bookmarks_count', 'ratings_count', 'created_at', 'updated_at', 'published_at'
+        ]
 
     def get_reading_time(self, obj):
         if obj.content:
@@ -26,10 +26,10 @@ class BookmarkSerializer(serializers.ModelSerializer):
     class Meta:
         model = Bookmark
         fields = [
-            'id', 'user', 'article', 'notes', 'created_at', 'updated_at',
+            'id', 'user', 'article', 'notes', 'created_at',
             'article_title', 'article_slug', 'article_summary', 'article_image'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at']
     
     def validate(self, attrs):
         user = self.context['request'].user
@@ -0,0 +1,255 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from articles import popularity, view_counter
+from articles.models import Article, ArticleComment, Book, RelatedArticle
+from articles.models_interaction import ArticleRating, ArticleView, Like
+from courses.models import Tag
+
+User = get_user_model()
+
+STORED_AGGREGATES = [
+    'likes_count', 'bookmarks_count', 'comments_count', 'ratings_count', 'ratings_sum',
+    *[f'rating_{star}_count' for star in range(1, 6)],
+]
+
+VIEW_COUNTER = {'FLUSH_INTERVAL': 30, 'VIEW_LOG_SAMPLE_RATE': 1.0, 'AUTO_FLUSH': False, 'BATCH_SIZE': 2}
+
+
+@override_settings(VIEW_COUNTER=VIEW_COUNTER)
+class BufferedViewCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='writer', password='testpass123')
+        self.articles = [
+            Article.objects.create(
+                title=f'Article {i}', content='content', author=self.author, status='published'
+            )
+            for i in range(3)
+        ]
+        self.book = Book.objects.create(title='Book', author_name='Someone')
+
+    def _flush(self):
+        return view_counter.flush(now=time.time() + 3 * VIEW_COUNTER['FLUSH_INTERVAL'])
+
+    def test_views_are_buffered_until_flush(self):
+        client = APIClient()
+        article = self.articles[0]
+        url = reverse('article-view-list', kwargs={'article_pk': article.pk})
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(url)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['views_count'], 1)
+        self.assertFalse(any(q['sql'].startswith(('UPDATE', 'INSERT')) for q in queries))
+
+        client.post(url)
+        article.refresh_from_db()
+        self.assertEqual(article.views_count, 0)
+        self.assertEqual(view_counter.pending('article_views', article.pk), 2)
+
+        summary = self._flush()
+        article.refresh_from_db()
+        self.assertEqual(article.views_count, 2)
+        self.assertEqual(summary['logged_views'], 2)
+        self.assertEqual(ArticleView.objects.filter(article=article).count(), 2)
+        self.assertEqual(view_counter.pending('article_views', article.pk), 0)
+
+    def test_flush_issues_one_update_per_distinct_delta(self):
+        for article in self.articles:
+            article.increment_views()
+        self.articles[2].increment_views()
+        self.book.increment_views()
+        self.book.increment_downloads()
+
+        with CaptureQueriesContext(connection) as queries:
+            self._flush()
+        updates = [q for q in queries if q['sql'].startswith('UPDATE')]
+        # Articles: delta 1 (two rows) + delta 2 (one row); book views + downloads
+        self.assertEqual(len(updates), 4)
+
+        self.assertEqual(
+            list(Article.objects.order_by('pk').values_list('views_count', flat=True)), [1, 1, 2]
+        )
+        self.book.refresh_from_db()
+        self.assertEqual((self.book.view_count, self.book.download_count), (1, 1))
+
+        # Already flushed windows are not applied twice
+        self._flush()
+        self.assertEqual(Article.objects.get(pk=self.articles[2].pk).views_count, 2)
+
+    @override_settings(VIEW_COUNTER={**VIEW_COUNTER, 'VIEW_LOG_SAMPLE_RATE': 0})
+    def test_sampling_keeps_counts_exact(self):
+        request = APIClient().get('/').wsgi_request
+        for _ in range(5):
+            self.articles[0].track_view(request)
+        self._flush()
+        self.articles[0].refresh_from_db()
+        self.assertEqual(self.articles[0].views_count, 5)
+        self.assertEqual(ArticleView.objects.count(), 0)
+
+
+class PopularityAndRelatedArticlesTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', password='testpass123')
+        self.python, self.django, self.web = (Tag.objects.create(name=name) for name in ('python', 'django', 'web'))
+
+    def _article(self, title, tags, status='published'):
+        article = Article.objects.create(title=title, content='content', author=self.author, status=status)
+        article.tags.set(tags)
+        return article
+
+    def test_popularity_is_stored_weighted_and_decayed(self):
+        fresh = self._article('Fresh', [])
+        old = self._article('Old', [])
+        Article.objects.filter(pk=fresh.pk).update(views_count=10)
+        Article.objects.filter(pk=old.pk).update(
+            views_count=10, published_at=timezone.now() - timedelta(days=popularity.HALF_LIFE_DAYS)
+        )
+        Like.objects.create(user=self.author, article=fresh)
+
+        popularity.recompute_article_popularity()
+        fresh.refresh_from_db()
+        old.refresh_from_db()
+        self.assertAlmostEqual(fresh.popularity_score, 10 + popularity.LIKE_WEIGHT, places=2)
+        self.assertAlmostEqual(old.popularity_score, 5, places=2)
+
+        book = Book.objects.create(title='Book', author_name='Someone', view_count=2, download_count=1)
+        popularity.recompute_book_popularity()
+        book.refresh_from_db()
+        self.assertAlmostEqual(book.popularity_score, 2 + popularity.DOWNLOAD_WEIGHT, places=2)
+
+        response = APIClient().get(reverse('popular-articles'))
+        self.assertEqual([item['id'] for item in response.data['results']][:2], [fresh.pk, old.pk])
+
+    def test_related_index_follows_tags_and_publication(self):
+        base = self._article('Base', [self.python, self.django, self.web])
+        close = self._article('Close', [self.python, self.django])
+        far = self._article('Far', [self.web])
+        draft = self._article('Draft', [self.python, self.django, self.web], status='draft')
+        self._article('Unrelated', [])
+
+        self.assertEqual(base.get_related_articles(limit=2), [close, far])
+        self.assertIn(base, close.get_related_articles(limit=1))
+
+        draft.status = 'published'
+        draft.save()
+        self.assertEqual(base.get_related_articles(limit=1), [draft])
+
+        close.tags.clear()
+        self.assertFalse(RelatedArticle.objects.filter(related=close).exists())
+
+        draft.status = 'archived'
+        draft.save()
+        self.assertFalse(RelatedArticle.objects.filter(related=draft).exists())
+
+        RelatedArticle.objects.all().delete()
+        popularity.rebuild_related_articles()
+        self.assertEqual(
+            list(RelatedArticle.objects.filter(article=base).values_list('related_id', flat=True)), [far.pk]
+        )
+
+        url = reverse('article-related', kwargs={'pk': base.pk})
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().get(url, {'limit': 1})
+        self.assertEqual([item['id'] for item in response.data], [far.pk])
+        self.assertLess(len(queries), 10)
+
+        self.assertEqual(APIClient().get(url, {'limit': 'abc'}).status_code, 400)
+        self.assertEqual(len(APIClient().get(url, {'limit': -1}).data), 1)
+        response = APIClient().get(url, {'limit': 500})
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(response.data), popularity.RELATED_LIMIT)
+
+
+    def test_neighbour_lists_stay_within_the_limit(self):
+        base = self._article('Base', [self.python, self.django])
+        neighbours = [self._article(f'Close {n}', [self.python, self.django]) for n in range(popularity.RELATED_LIMIT)]
+        self.assertEqual(RelatedArticle.objects.filter(article=base).count(), popularity.RELATED_LIMIT)
+
+        # Weaker than every current entry of base's list: it is not linked in
+        self._article('Weak', [self.python])
+        self.assertEqual(RelatedArticle.objects.filter(article=base).count(), popularity.RELATED_LIMIT)
+        self.assertEqual(set(base.get_related_articles(limit=popularity.RELATED_LIMIT)), set(neighbours))
+
+        # Stronger: it displaces base's weakest entry
+        strong = self._article('Strong', [self.python, self.django, self.web])
+        base.tags.add(self.web)
+        self.assertEqual(RelatedArticle.objects.filter(article=base).count(), popularity.RELATED_LIMIT)
+        self.assertEqual(base.get_related_articles(limit=1), [strong])
+        for neighbour in neighbours:
+            self.assertLessEqual(RelatedArticle.objects.filter(article=neighbour).count(), popularity.RELATED_LIMIT)
+
+
+class ArticleInteractionAggregateTests(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'reader{i}', password='testpass123') for i in range(3)]
+        self.article = Article.objects.create(
+            title='Aggregated', content='content', author=self.users[0], status='published'
+        )
+
+    def test_write_paths_maintain_aggregates(self):
+        for user in self.users:
+            self.article.like(user)
+            self.article.add_to_bookmarks(user)
+        self.article.rate(self.users[0], 5)
+        self.article.rate(self.users[1], '3')
+        self.article.rate(self.users[0], 4)
+        comment = ArticleComment.objects.create(article=self.article, user=self.users[0], content='hi')
+        ArticleComment.objects.create(article=self.article, user=self.users[1], content='re', parent=comment)
+        ArticleComment.objects.create(article=self.article, user=self.users[2], content='x', is_approved=False)
+
+        self.article.refresh_from_db()
+        self.assertEqual((self.article.likes_count, self.article.bookmarks_count), (3, 3))
+        self.assertEqual(self.article.comments_count, 2)
+        self.assertEqual((self.article.ratings_count, self.article.ratings_sum), (2, 7))
+        self.assertEqual(
+            [row['count'] for row in self.article.get_rating_distribution()], [0, 0, 1, 1, 0]
+        )
+
+        self.article.unlike(self.users[0])
+        self.article.remove_from_bookmarks(self.users[1])
+        ArticleRating.objects.filter(user=self.users[1]).delete()
+        comment.delete()  # cascades to its reply
+
+        self.article.refresh_from_db()
+        self.assertEqual((self.article.likes_count, self.article.bookmarks_count), (2, 2))
+        self.assertEqual(self.article.comments_count, 0)
+        self.assertEqual((self.article.ratings_count, self.article.ratings_sum), (1, 4))
+        self.assertEqual(self.article.rating_3_count, 0)
+
+        stored = Article.objects.values(*STORED_AGGREGATES).get(pk=self.article.pk)
+        self.article.update_interaction_statistics()
+        self.assertEqual(stored, Article.objects.values(*STORED_AGGREGATES).get(pk=self.article.pk))
+
+    def test_endpoints_read_stored_aggregates(self):
+        self.article.like(self.users[1])
+        self.article.rate(self.users[1], 4)
+        client = APIClient()
+        client.force_authenticate(self.users[1])
+
+        stats_url = reverse('article-rating-stats', kwargs={'article_pk': self.article.pk})
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(stats_url)
+        self.assertEqual(response.data['rating_count'], 1)
+        self.assertEqual(response.data['average_rating'], 4.0)
+        self.assertEqual(response.data['user_rating'], 4)
+        self.assertFalse(any('COUNT(' in q['sql'] or 'AVG(' in q['sql'] for q in queries))
+
+        response = client.get(reverse('my-article-interactions'))
+        self.assertEqual(response.data['liked_articles'], [self.article.pk])
+        self.assertEqual(response.data['article_stats'][self.article.pk]['likes_count'], 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('article-detail', kwargs={'pk': self.article.pk}))
+        self.assertEqual(response.data['likes_count'], 1)
+        self.assertEqual(response.data['ratings_count'], 1)
+        self.assertFalse(any('articles_like' in q['sql'] for q in queries))
@@ -0,0 +1,202 @@
+"""
+Buffered view/download counters for articles and books.
+
+Page views are counted in the shared cache instead of the database:
+every hit is an atomic ``incr`` on a per-object key inside the current
+time window. ``flush()`` later applies each closed window with one
+``UPDATE ... SET count = count + delta`` per distinct delta and
+bulk-inserts the (optionally sampled) ``ArticleView`` rows.
+
+Keys are namespaced by window so writers never touch a window that is
+being flushed:
+
+    viewcounter:<counter>:<window>:<pk>     pending delta for one object
+    viewcounter:<counter>:id:<window>:seq   number of objects registered
+    viewcounter:<counter>:id:<window>:<n>   n-th object registered
+    viewcounter:log:<window>:seq / :<n>     sampled raw view rows
+"""
+import logging
+import random
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'viewcounter'
+
+# counter name -> (model label, counter field)
+COUNTERS = {
+    'article_views': ('articles.Article', 'views_count'),
+    'book_views': ('articles.Book', 'view_count'),
+    'book_downloads': ('articles.Book', 'download_count'),
+}
+
+# Closed windows older than this are assumed lost (their keys have expired)
+MAX_LOOKBACK_WINDOWS = 10
+
+
+def _config(name, default):
+    return getattr(settings, 'VIEW_COUNTER', {}).get(name, default)
+
+
+def _interval():
+    return max(1, int(_config('FLUSH_INTERVAL', 30)))
+
+
+def _ttl():
+    return _interval() * (MAX_LOOKBACK_WINDOWS + 2)
+
+
+def current_window(now=None):
+    return int((now if now is not None else time.time()) // _interval())
+
+
+def _incr(key, delta=1):
+    """Atomic increment that creates the key when missing"""
+    if cache.add(key, delta, timeout=_ttl()):
+        return delta
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(key, delta, timeout=_ttl())
+        return delta
+
+
+def _append(list_name, window, value):
+    """Append a value to a window-scoped list built from a sequence counter"""
+    n = _incr(f'{KEY_PREFIX}:{list_name}:{window}:seq')
+    cache.set(f'{KEY_PREFIX}:{list_name}:{window}:{n}', value, timeout=_ttl())
+
+
+def increment(counter, pk, delta=1):
+    """Buffer ``delta`` hits for object ``pk`` on one of ``COUNTERS``"""
+    window = current_window()
+    key = f'{KEY_PREFIX}:{counter}:{window}:{pk}'
+    if cache.add(key, delta, timeout=_ttl()):
+        # First hit of this object in the window: register it for the flusher
+        _append(f'{counter}:id', window, pk)
+    else:
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.set(key, delta, timeout=_ttl())
+    maybe_flush()
+
+
+def log_article_view(article_id, user_id=None, ip_address=None, user_agent=''):
+    """Buffer a raw ArticleView row, keeping only VIEW_LOG_SAMPLE_RATE of them"""
+    sample_rate = float(_config('VIEW_LOG_SAMPLE_RATE', 1.0))
+    if sample_rate <= 0 or (sample_rate < 1 and random.random() >= sample_rate):
+        return
+    _append('log', current_window(), {
+        'article_id': article_id,
+        'user_id': user_id,
+        'ip_address': ip_address,
+        'user_agent': user_agent,
+    })
+
+
+def pending(counter, pk, now=None):
+    """Hits buffered for an object that are not in the database yet"""
+    window = current_window(now)
+    keys = [
+        f'{KEY_PREFIX}:{counter}:{w}:{pk}'
+        for w in range(window - MAX_LOOKBACK_WINDOWS, window + 1)
+    ]
+    return sum(cache.get_many(keys).values())
+
+
+def maybe_flush():
+    """Flush from request traffic at most once per interval (when enabled)"""
+    if not _config('AUTO_FLUSH', True):
+        return
+    if cache.add(f'{KEY_PREFIX}:autoflush', 1, timeout=_interval()):
+        try:
+            flush()
+        except Exception:
+            logger.exception('Error flushing buffered view counters')
+
+
+def _read_list(list_name, window):
+    seq_key = f'{KEY_PREFIX}:{list_name}:{window}:seq'
+    seq = cache.get(seq_key) or 0
+    item_keys = [f'{KEY_PREFIX}:{list_name}:{window}:{n}' for n in range(1, seq + 1)]
+    values = list(cache.get_many(item_keys).values()) if item_keys else []
+    return values, item_keys + [seq_key]
+
+
+def _flush_counter_window(counter, window):
+    model_label, field = COUNTERS[counter]
+    model = apps.get_model(model_label)
+
+    pks, list_keys = _read_list(f'{counter}:id', window)
+    count_keys = {f'{KEY_PREFIX}:{counter}:{window}:{pk}': pk for pk in pks}
+    deltas = cache.get_many(list(count_keys)) if count_keys else {}
+
+    # One UPDATE per distinct delta: most objects in a window share small deltas
+    pks_by_delta = defaultdict(list)
+    for key, delta in deltas.items():
+        if delta:
+            pks_by_delta[delta].append(count_keys[key])
+
+    with transaction.atomic():
+        for delta, delta_pks in pks_by_delta.items():
+            model.objects.filter(pk__in=delta_pks).update(**{field: F(field) + delta})
+
+    cache.delete_many(list_keys + list(count_keys))
+    return sum(deltas.values())
+
+
+def _flush_log_window(window, batch_size):
+    from .models_interaction import ArticleView
+
+    rows, list_keys = _read_list('log', window)
+    if rows:
+        existing = set(
+            apps.get_model('articles', 'Article').objects.filter(
+                pk__in={row['article_id'] for row in rows}
+            ).values_list('pk', flat=True)
+        )
+        ArticleView.objects.bulk_create(
+            [ArticleView(**row) for row in rows if row['article_id'] in existing],
+            batch_size=batch_size,
+        )
+    cache.delete_many(list_keys)
+    return len(rows)
+
+
+def flush(now=None):
+    """Apply every closed window to the database.
+
+    The window right before the current one is left alone as a grace period
+    for requests that computed their window just before the boundary.
+    Returns a ``{counter: hits}`` summary (plus ``'logged_views'``).
+    """
+    lock_key = f'{KEY_PREFIX}:flush-lock'
+    if not cache.add(lock_key, 1, timeout=_interval() * 2):
+        return {}
+
+    summary = defaultdict(int)
+    try:
+        batch_size = int(_config('BATCH_SIZE', 500))
+        last_window_key = f'{KEY_PREFIX}:last-flushed-window'
+        latest_closed = current_window(now) - 2
+        oldest = latest_closed - MAX_LOOKBACK_WINDOWS
+        last_flushed = cache.get(last_window_key)
+        first = max(oldest, last_flushed + 1) if last_flushed is not None else oldest
+
+        for window in range(first, latest_closed + 1):
+            for counter in COUNTERS:
+                summary[counter] += _flush_counter_window(counter, window)
+            summary['logged_views'] += _flush_log_window(window, batch_size)
+            cache.set(last_window_key, window, timeout=None)
+    finally:
+        cache.delete(lock_key)
+    return dict(summary)
@@ -6,6 +6,7 @@ from django.db.models import Q, Count
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from .models import BookCategory, Article, ArticleComment
+from . import popularity
 from .serializers import (
     BookCategorySerializer, ArticleSerializer, 
     ArticleCommentSerializer
@@ -13,7 +14,7 @@ from .serializers import (
 
 
 class BookCategoryViewSet(viewsets.ModelViewSet):
-    queryset = BookCategory.objects.all()
+    queryset = BookCategory.objects.annotate(books_count=Count('books'))
     serializer_class = BookCategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -29,7 +30,7 @@ class ArticleViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['featured', 'status']
     search_fields = ['title', 'content', 'summary']
-    ordering_fields = ['created_at', 'updated_at', 'views_count']
+    ordering_fields = ['created_at', 'updated_at', 'views_count', 'popularity_score']
     ordering = ['-created_at']
 
     def get_queryset(self):
@@ -42,6 +43,18 @@ class ArticleViewSet(viewsets.ModelViewSet):
         # For other users, only show published articles
         return queryset.filter(status='published').select_related('author', 'author__profile').prefetch_related('tags')
 
+    @action(detail=True, methods=['get'])
+    def related(self, request, pk=None):
+        """Related articles from the precomputed tag-overlap index"""
+        article = self.get_object()
+        try:
+            limit = int(request.query_params.get('limit', 5))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, popularity.RELATED_LIMIT))
+        serializer = self.get_serializer(article.get_related_articles(limit=limit), many=True)
+        return Response(serializer.data)
+
     @action(detail=True, methods=['post'])
     def like(self, request, pk=None):
         article = self.get_object()
@@ -64,7 +77,7 @@ class ArticleCommentViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        return super().get_queryset().select_related('user', 'user__profile')
+        return super().get_queryset().with_listing_stats()
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -73,10 +86,6 @@ class ArticleCommentViewSet(viewsets.ModelViewSet):
         """Override list to handle filtering better"""
         queryset = self.filter_queryset(self.get_queryset())
         
-        # Add debug logging
-        print(f"Filtering comments for article: {request.query_params.get('article')}")
-        print(f"Found {queryset.count()} comments")
-        
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -94,7 +103,7 @@ class RecentArticlesView(generics.ListAPIView):
 
 
 class PopularArticlesView(generics.ListAPIView):
-    queryset = Article.objects.filter(status='published').select_related('author', 'author__profile').order_by('-views_count')[:10]
+    queryset = Article.objects.filter(status='published').select_related('author', 'author__profile').order_by('-popularity_score', '-views_count')[:10]
     serializer_class = ArticleSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
@@ -105,9 +105,11 @@ class BookmarkViewSet(viewsets.GenericViewSet, mixins.CreateModelMixin, mixins.D
         article = get_object_or_404(Article, pk=article_pk)
         return Response({"bookmarked": article.is_bookmarked_by(request.user)})
     
-    def list(self, request):
-        """List all bookmarks for the current user"""
+    def list(self, request, article_pk=None):
+        """List the current user's bookmarks (of one article when nested under it)"""
         bookmarks = self.get_queryset().select_related('article')
+        if article_pk is not None:
+            bookmarks = bookmarks.filter(article_id=article_pk)
         page = self.paginate_queryset(bookmarks)
         
         if page is not None:
@@ -147,6 +149,20 @@ class ArticleRatingViewSet(viewsets.GenericViewSet, mixins.CreateModelMixin, mix
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
+    def list(self, request, article_pk=None):
+        """List the current user's ratings (of one article when nested under it)"""
+        ratings = self.get_queryset().select_related('article')
+        if article_pk is not None:
+            ratings = ratings.filter(article_id=article_pk)
+        page = self.paginate_queryset(ratings)
+        
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+            
+        serializer = self.get_serializer(ratings, many=True)
+        return Response(serializer.data)
+    
     @action(detail=False, methods=['get'])
     def my_rating(self, request, article_pk=None):
         """Get the current user's rating for an article"""
@@ -165,7 +181,7 @@ class ArticleRatingViewSet(viewsets.GenericViewSet, mixins.CreateModelMixin, mix
     
     @action(detail=False, methods=['get'])
     def stats(self, request, article_pk=None):
-        """Get rating statistics for an article"""
+        """Get rating statistics for an article (read from the stored aggregates)"""
         article = get_object_or_404(Article, pk=article_pk)
         
         stats = {
@@ -197,10 +213,9 @@ class ArticleViewViewSet(viewsets.GenericViewSet, mixins.CreateModelMixin):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Track the view
-        view = article.track_view(request)
-        serializer = self.get_serializer(view)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        # Track the view (buffered, written in bulk by the view counter flush)
+        views_count = article.track_view(request)
+        return Response({'views_count': views_count}, status=status.HTTP_201_CREATED)
 
 
 class UserInteractionViewSet(viewsets.GenericViewSet):
@@ -210,37 +225,48 @@ class UserInteractionViewSet(viewsets.GenericViewSet):
     permission_classes = [IsAuthenticated]
     
     @action(detail=False, methods=['get'])
-    def my_interactions(self, request):
-        """Get all the current user's interactions with articles"""
-        user = request.user
-        
-        # Get liked articles
-        liked_articles = Article.objects.filter(likes__user=user).values_list('id', flat=True)
+    def my_interactions(self, request, article_pk=None):
+        """Get the current user's interactions with articles (or with one article when nested under it)"""
+        lookup = {'user': request.user}
+        if article_pk is not None:
+            lookup['article_id'] = article_pk
         
+        # Plain id lookups: no joins against the article table
+        liked_articles = list(Like.objects.filter(**lookup).values_list('article_id', flat=True))
+
         # Get bookmarked articles with notes
-        bookmarks = Bookmark.objects.filter(user=user).select_related('article')
-        bookmarked_articles = [
-            {
-                'article_id': b.article_id,
-                'notes': b.notes,
-                'created_at': b.created_at
-            } for b in bookmarks
-        ]
-        
+        bookmarks = Bookmark.objects.filter(**lookup).values('article_id', 'notes', 'created_at')
+        bookmarked_articles = list(bookmarks)
+
         # Get user's ratings
-        ratings = ArticleRating.objects.filter(user=user).select_related('article')
-        user_ratings = [
-            {
-                'article_id': r.article_id,
-                'rating': r.rating,
-                'comment': r.comment,
-                'created_at': r.created_at,
-                'updated_at': r.updated_at
-            } for r in ratings
-        ]
-        
+        user_ratings = list(
+            ArticleRating.objects.filter(**lookup).values(
+                'article_id', 'rating', 'comment', 'created_at', 'updated_at'
+            )
+        )
+
+        # Stored aggregates for every article the user interacted with, in one query
+        article_ids = (
+            set(liked_articles)
+            | {b['article_id'] for b in bookmarked_articles}
+            | {r['article_id'] for r in user_ratings}
+        )
+        article_stats = {
+            row['id']: {
+                'likes_count': row['likes_count'],
+                'bookmarks_count': row['bookmarks_count'],
+                'comments_count': row['comments_count'],
+                'ratings_count': row['ratings_count'],
+                'average_rating': row['ratings_sum'] / row['ratings_count'] if row['ratings_count'] else 0,
+            }
+            for row in Article.objects.filter(pk__in=article_ids).values(
+                'id', 'likes_count', 'bookmarks_count', 'comments_count', 'ratings_count', 'ratings_sum'
+            )
+        }
+
         return Response({
-            'liked_articles': list(liked_articles),
+            'liked_articles': liked_articles,
             'bookmarked_articles': bookmarked_articles,
-            'ratings': user_ratings
+            'ratings': user_ratings,
+            'article_stats': article_stats
         })
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from core.images import ImageVariantsField
 from .models import (
     Assessment, QuestionBank, AssessmentQuestions, 
     StudentSubmission, StudentAnswer, Flashcard, StudentFlashcardProgress
@@ -139,6 +140,8 @@ class FlashcardSerializer(serializers.ModelSerializer):
     lesson_title = serializers.CharField(source='lesson.title', read_only=True)
     course_title = serializers.CharField(source='lesson.module.course.title', read_only=True)
     module_title = serializers.CharField(source='lesson.module.title', read_only=True)
+    front_image_variants = ImageVariantsField(source='front_image')
+    back_image_variants = ImageVariantsField(source='back_image')
     
     class Meta:
         model = Flashcard
@@ -146,6 +149,7 @@ class FlashcardSerializer(serializers.ModelSerializer):
             'id', 'front_text', 'back_text', 'related_question',
             'related_question_text', 'lesson', 'lesson_title', 
             'course_title', 'module_title', 'tags', 'front_image', 'back_image',
+            'front_image_variants', 'back_image_variants',
             'created_by', 'created_by_name', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_by', 'created_at', 'updated_at']
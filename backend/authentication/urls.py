@@ -12,7 +12,7 @@ urlpatterns = [
     # الملف الشخصي
     path('profile/', views.profile_view, name='profile'),
     path('profile/update/', views.update_profile, name='update_profile'),
-    path('profile/<int:profile_id>/', views.ProfileDetailView.as_view(), name='profile_detail'),
+    path('profile/<uuid:profile_id>/', views.ProfileDetailView.as_view(), name='profile_detail'),
     
     # كلمة المرور
     path('change-password/', views.change_password, name='change_password'),
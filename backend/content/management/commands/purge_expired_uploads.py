@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from content import uploads
+
+
+class Command(BaseCommand):
+    help = 'Delete expired and completed chunked upload sessions and their temporary files'
+
+    def handle(self, *args, **options):
+        count = uploads.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'Purged {count} upload sessions'))
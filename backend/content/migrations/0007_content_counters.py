@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0006_remove_lesson_slug_global_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='module',
+            name='total_duration_minutes',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Denormalized sum of the duration of all lessons in this module', verbose_name='total lessons duration in minutes'),
+        ),
+    ]
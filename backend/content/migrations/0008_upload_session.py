@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:23
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('content', '0007_content_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('target', models.CharField(choices=[('module_video', 'Module video'), ('lesson_resource', 'Lesson resource')], max_length=20, verbose_name='target')),
+                ('filename', models.CharField(max_length=255, verbose_name='file name')),
+                ('title', models.CharField(blank=True, max_length=255, verbose_name='title')),
+                ('resource_type', models.CharField(blank=True, choices=[('document', 'Document'), ('presentation', 'Presentation'), ('spreadsheet', 'Spreadsheet'), ('image', 'Image'), ('audio', 'Audio'), ('video', 'Video'), ('link', 'External Link'), ('other', 'Other')], max_length=20, verbose_name='resource type')),
+                ('size', models.PositiveBigIntegerField(verbose_name='size in bytes')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='bytes received')),
+                ('checksum', models.CharField(blank=True, help_text='Hex SHA-256 of the whole file, verified on completion', max_length=64, verbose_name='SHA-256 checksum')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('completed', 'Completed')], default='active', max_length=20, verbose_name='status')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('expires_at', models.DateTimeField(verbose_name='expires at')),
+                ('lesson', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='content.lesson', verbose_name='lesson')),
+                ('module', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='content.module', verbose_name='module')),
+                ('resource', models.ForeignKey(blank=True, help_text='Resource whose file is replaced; a new resource is created when empty', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload_sessions', to='content.lessonresource', verbose_name='resource')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'upload session',
+                'verbose_name_plural': 'upload sessions',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='content_upl_status_eb088c_idx')],
+            },
+        ),
+    ]
@@ -1,8 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Max
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 from django.core.validators import MinValueValidator, MaxValueValidator, FileExtensionValidator
 from django.conf import settings
@@ -11,6 +11,7 @@ from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 import os
+import uuid
 from urllib.parse import urlparse
 
 User = get_user_model()
@@ -83,6 +84,12 @@ class Module(models.Model):
         default=0,
         help_text=_('Duration of the video in seconds')
     )
+    total_duration_minutes = models.PositiveIntegerField(
+        _('total lessons duration in minutes'),
+        default=0,
+        editable=False,
+        help_text=_('Denormalized sum of the duration of all lessons in this module')
+    )
     # Bunny CDN integration fields
     bunny_video_id = models.CharField(
         _('Bunny video ID'),
@@ -201,7 +208,21 @@ class Module(models.Model):
             self.clean()
         else:
             self.full_clean()
-        super().save(*args, **kwargs)
+        
+        is_new = self.pk is None
+        previous_course_id = None
+        if not is_new:
+            previous_course_id = Module.objects.filter(pk=self.pk).values_list('course_id', flat=True).first()
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            
+            # Keep the course's denormalized module/lesson counters in sync
+            if is_new or previous_course_id != self.course_id:
+                from courses.models import Course
+                Course.update_content_statistics(self.course_id)
+                if previous_course_id and previous_course_id != self.course_id:
+                    Course.update_content_statistics(previous_course_id)
         
         # Update course's updated_at timestamp
         from django.utils import timezone
@@ -215,10 +236,17 @@ class Module(models.Model):
     
     @property
     def total_duration(self):
-        """Calculate total duration of all lessons in this module"""
-        return self.lessons.aggregate(
+        """Total duration of all lessons in this module (denormalized)"""
+        return self.total_duration_minutes
+    
+    @classmethod
+    def update_duration(cls, module_id):
+        """Recompute the denormalized lessons duration of a module"""
+        total = Lesson.objects.filter(module_id=module_id).aggregate(
             total=models.Sum('duration_minutes')
         )['total'] or 0
+        # Update directly in database to avoid triggering save() side effects
+        cls.objects.filter(pk=module_id).update(total_duration_minutes=total)
     
     @property
     def is_submodule(self):
@@ -426,7 +454,23 @@ class Lesson(models.Model):
                 num += 1
                 
         self.full_clean()
-        super().save(*args, **kwargs)
+        
+        previous = None
+        if self.pk:
+            previous = Lesson.objects.filter(pk=self.pk).values('module_id', 'duration_minutes').first()
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            
+            # Keep module/course duration and lesson counters in sync
+            if (
+                previous is None
+                or previous['module_id'] != self.module_id
+                or previous['duration_minutes'] != self.duration_minutes
+            ):
+                refresh_content_statistics(self.module_id)
+                if previous and previous['module_id'] != self.module_id:
+                    refresh_content_statistics(previous['module_id'])
         
         # Update module's updated_at timestamp
         self.module.updated_at = timezone.now()
@@ -1186,7 +1230,119 @@ class LessonResource(models.Model):
         return icon_map.get(self.resource_type, 'file')
 
 
+class UploadSession(models.Model):
+    """
+    A chunked, resumable upload of a module video or lesson resource file.
+    Chunks are appended to a temporary file on disk (see ``content.uploads``)
+    and the file is moved into the target's ``FileField`` on completion.
+    """
+    class Target(models.TextChoices):
+        MODULE_VIDEO = 'module_video', _('Module video')
+        LESSON_RESOURCE = 'lesson_resource', _('Lesson resource')
+
+    class Status(models.TextChoices):
+        ACTIVE = 'active', _('Active')
+        COMPLETED = 'completed', _('Completed')
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions',
+        verbose_name=_('user')
+    )
+    target = models.CharField(_('target'), max_length=20, choices=Target.choices)
+    module = models.ForeignKey(
+        Module,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='upload_sessions',
+        verbose_name=_('module')
+    )
+    lesson = models.ForeignKey(
+        Lesson,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='upload_sessions',
+        verbose_name=_('lesson')
+    )
+    resource = models.ForeignKey(
+        LessonResource,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='upload_sessions',
+        verbose_name=_('resource'),
+        help_text=_('Resource whose file is replaced; a new resource is created when empty')
+    )
+    filename = models.CharField(_('file name'), max_length=255)
+    title = models.CharField(_('title'), max_length=255, blank=True)
+    resource_type = models.CharField(
+        _('resource type'),
+        max_length=20,
+        choices=LessonResource.ResourceType.choices,
+        blank=True
+    )
+    size = models.PositiveBigIntegerField(_('size in bytes'))
+    offset = models.PositiveBigIntegerField(_('bytes received'), default=0)
+    checksum = models.CharField(
+        _('SHA-256 checksum'),
+        max_length=64,
+        blank=True,
+        help_text=_('Hex SHA-256 of the whole file, verified on completion')
+    )
+    status = models.CharField(
+        _('status'),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.ACTIVE
+    )
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('updated at'), auto_now=True)
+    expires_at = models.DateTimeField(_('expires at'))
+
+    class Meta:
+        verbose_name = _('upload session')
+        verbose_name_plural = _('upload sessions')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'expires_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+
+def refresh_content_statistics(module_id):
+    """Recompute denormalized duration/counters for a module and its course"""
+    from courses.models import Course
+    
+    course_id = Module.objects.filter(pk=module_id).values_list('course_id', flat=True).first()
+    Module.update_duration(module_id)
+    if course_id:
+        Course.update_content_statistics(course_id)
+
+
 # Signals
+@receiver(post_delete, sender=Lesson)
+def update_stats_on_lesson_delete(sender, instance, **kwargs):
+    """Refresh module/course counters when a lesson is removed"""
+    refresh_content_statistics(instance.module_id)
+
+
+@receiver(post_delete, sender=Module)
+def update_stats_on_module_delete(sender, instance, **kwargs):
+    """Refresh course counters when a module is removed"""
+    from courses.models import Course
+    Course.update_content_statistics(instance.course_id)
+
+
 @receiver(post_save, sender=UserProgress)
 def create_initial_module_progress(sender, instance, created, **kwargs):
     """Create ModuleProgress for all modules when UserProgress is created"""
@@ -3,69 +3,10 @@ from django.db.models import Count, Avg, Sum, Max
 from django.db import models
 from django.utils import timezone
 from courses.models import Course, Enrollment
-from content.models import Module, UserProgress, ModuleProgress, Lesson, LessonResource
+from content.models import Module, ModuleProgress, Lesson, LessonResource, UploadSession
 from users.models import User
 
 
-class ModuleProgressSerializer(serializers.ModelSerializer):
-    """
-    Serializer for tracking module progress
-    """
-    module_title = serializers.CharField(source='module.title', read_only=True)
-    course_title = serializers.CharField(source='module.course.title', read_only=True)
-    total_lessons = serializers.SerializerMethodField()
-    completed_lessons = serializers.SerializerMethodField()
-    progress_percentage = serializers.SerializerMethodField()
-    
-    class Meta:
-        model = ModuleProgress
-        fields = [
-            'id', 'user', 'module', 'module_title', 'course_title',
-            'is_completed', 'completed_at', 'last_accessed', 'started_at',
-            'total_lessons', 'completed_lessons', 'progress_percentage'
-        ]
-        read_only_fields = [
-            'id', 'user', 'module_title', 'course_title', 'completed_at',
-            'last_accessed', 'started_at', 'total_lessons', 'completed_lessons',
-            'progress_percentage'
-        ]
-    
-    def get_total_lessons(self, obj):
-        """Get total number of lessons in the module"""
-        return obj.module.lessons.count()
-    
-    def get_completed_lessons(self, obj):
-        """Get number of completed lessons in the module"""
-        return obj.module.lessons.filter(
-            userprogress__user_id=obj.user.id,
-            userprogress__is_completed=True
-        ).count()
-    
-    def get_progress_percentage(self, obj):
-        """Calculate progress percentage"""
-        try:
-            # Use the model's method if available
-            if hasattr(obj, 'get_completion_percentage'):
-                return obj.get_completion_percentage()
-            
-            # Fallback calculation based on module components
-            total_components = 4  # video, pdf, notes, quiz
-            if total_components == 0:
-                return 0
-                
-            completed_components = sum([
-                obj.video_watched,
-                obj.pdf_viewed,
-                obj.notes_read,
-                obj.quiz_completed
-            ])
-            
-            return int((completed_components / total_components) * 100)
-        except Exception as e:
-            print(f"Error calculating progress percentage: {e}")
-            return 0
-
-
 class ModuleCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating a new module"""
     video = serializers.FileField(required=False, allow_null=True)
@@ -392,22 +333,6 @@ class LessonResourceSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class UserProgressSerializer(serializers.ModelSerializer):
-    """Serializer for user progress tracking"""
-    course_title = serializers.CharField(source='course.title', read_only=True)
-    module_title = serializers.CharField(source='module.title', read_only=True)
-    
-    class Meta:
-        model = UserProgress
-        fields = [
-            'id', 'user', 'course', 'course_title', 'module', 'module_title',
-            'video_watched', 'pdf_viewed', 'notes_read', 'quiz_completed',
-            'is_completed', 'completed_at', 'created_at', 'updated_at',
-            'progress_percentage'
-        ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'progress_percentage']
-
-
 class ProgressUpdateSerializer(serializers.Serializer):
     """Serializer for updating user progress"""
     content_type = serializers.ChoiceField(
@@ -494,6 +419,7 @@ class ProgressUpdateSerializer(serializers.Serializer):
 
 class ModuleSearchSerializer(serializers.ModelSerializer):
     """Serializer for module search results"""
+    title = serializers.CharField(source='name', read_only=True)
     course_title = serializers.CharField(source='course.title', read_only=True)
     content_type = serializers.SerializerMethodField()
     
@@ -511,7 +437,7 @@ class ModuleSearchSerializer(serializers.ModelSerializer):
 
 class LessonSearchSerializer(serializers.ModelSerializer):
     """Serializer for lesson search results"""
-    module_title = serializers.CharField(source='module.title', read_only=True)
+    module_title = serializers.CharField(source='module.name', read_only=True)
     course_title = serializers.CharField(source='module.course.title', read_only=True)
     content_type = serializers.SerializerMethodField()
     
@@ -530,7 +456,7 @@ class LessonSearchSerializer(serializers.ModelSerializer):
 class ResourceSearchSerializer(serializers.ModelSerializer):
     """Serializer for resource search results"""
     lesson_title = serializers.CharField(source='lesson.title', read_only=True)
-    module_title = serializers.CharField(source='lesson.module.title', read_only=True)
+    module_title = serializers.CharField(source='lesson.module.name', read_only=True)
     course_title = serializers.CharField(source='lesson.module.course.title', read_only=True)
     content_type = serializers.SerializerMethodField()
     
@@ -544,3 +470,33 @@ class ResourceSearchSerializer(serializers.ModelSerializer):
     
     def get_content_type(self, obj):
         return 'resource'
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """Chunked upload session (see content.uploads)"""
+    checksum = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False, allow_blank=True)
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'target', 'module', 'lesson', 'resource', 'filename', 'title', 'resource_type',
+            'size', 'offset', 'checksum', 'status', 'created_at', 'expires_at'
+        ]
+        read_only_fields = ['id', 'offset', 'status', 'created_at', 'expires_at']
+        extra_kwargs = {
+            'size': {'min_value': 1},
+        }
+
+    def validate(self, attrs):
+        if attrs['target'] == UploadSession.Target.MODULE_VIDEO:
+            if not attrs.get('module'):
+                raise serializers.ValidationError({'module': 'A module is required for a module video'})
+            attrs['lesson'] = attrs['resource'] = None
+        else:
+            resource = attrs.get('resource')
+            if resource:
+                attrs['lesson'] = resource.lesson
+            elif not attrs.get('lesson'):
+                raise serializers.ValidationError({'lesson': 'A lesson or resource is required for a lesson resource'})
+            attrs['module'] = None
+        return attrs
@@ -32,9 +32,8 @@ class ModuleProgressSerializer(serializers.ModelSerializer):
         return obj.module.lessons.count()
 
     def get_completed_lessons(self, obj):
-        # This assumes you have a way to track completed lessons
-        # You might need to adjust this based on your actual implementation
-        return obj.module.lessons.filter(completions__user=obj.user).count()
+        # Completion is tracked per module: complete_lesson marks the whole module done
+        return self.get_total_lessons(obj) if obj.is_completed else 0
 
     def get_progress_percentage(self, obj):
         return obj.get_completion_percentage()
@@ -0,0 +1,138 @@
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from . import uploads
+from .models import Lesson, LessonResource, Module, UploadSession
+
+User = get_user_model()
+
+OCTET_STREAM = 'application/offset+octet-stream'
+
+
+def sha256_header(data):
+    return 'sha256 ' + base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+
+class ChunkedUploadTest(TestCase):
+    """Test cases for the chunked, resumable upload API"""
+
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            MAX_MODULE_FILE_MB=1,
+            CHUNKED_UPLOADS={'TEMP_DIR': self.temp_dir, 'MAX_CHUNK_MB': 1},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.course = Course.objects.create(title='Upload Course', description='Description')
+        self.module = Module.objects.create(name='Module 1', course=self.course, order=1)
+        self.admin = User.objects.create_user('uploader', password='x', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def _start(self, **data):
+        payload = {'target': 'module_video', 'module': self.module.pk, 'filename': 'intro.mp4', **data}
+        return self.client.post('/api/content/uploads/', payload, format='json')
+
+    def _patch(self, session_id, chunk, offset, **headers):
+        return self.client.generic(
+            'PATCH', f'/api/content/uploads/{session_id}/', chunk,
+            content_type=OCTET_STREAM, HTTP_UPLOAD_OFFSET=str(offset), **headers
+        )
+
+    def test_chunks_are_assembled_into_the_module_video(self):
+        data = os.urandom(250_000)
+        response = self._start(size=len(data), checksum=hashlib.sha256(data).hexdigest())
+        self.assertEqual(response.status_code, 201)
+        session_id = response.data['id']
+
+        for offset in range(0, len(data), 100_000):
+            chunk = data[offset:offset + 100_000]
+            response = self._patch(session_id, chunk, offset, HTTP_UPLOAD_CHECKSUM=sha256_header(chunk))
+            self.assertEqual(response.status_code, 204)
+            self.assertEqual(response['Upload-Offset'], str(offset + len(chunk)))
+
+        response = self.client.head(f'/api/content/uploads/{session_id}/')
+        self.assertEqual(response['Upload-Offset'], str(len(data)))
+
+        response = self.client.post(f'/api/content/uploads/{session_id}/complete/')
+        self.assertEqual(response.status_code, 200, response.data)
+
+        self.module.refresh_from_db()
+        self.assertTrue(
+            self.module.video.name.startswith(f'courses/{self.course.pk}/modules/{self.module.pk}/videos/intro')
+        )
+        with self.module.video.open('rb') as video:
+            self.assertEqual(video.read(), data)
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_resume_requires_the_current_offset(self):
+        session_id = self._start(size=10).data['id']
+        self.assertEqual(self._patch(session_id, b'hello', 0).status_code, 204)
+
+        response = self._patch(session_id, b'world', 0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Upload-Offset'], '5')
+
+        response = self.client.post(f'/api/content/uploads/{session_id}/complete/')
+        self.assertEqual(response.status_code, 409)
+
+    def test_corrupt_chunk_is_discarded(self):
+        session_id = self._start(size=10).data['id']
+        response = self._patch(session_id, b'hello', 0, HTTP_UPLOAD_CHECKSUM=sha256_header(b'other'))
+        self.assertEqual(response.status_code, uploads.CHECKSUM_MISMATCH)
+        self.assertEqual(UploadSession.objects.get(pk=session_id).offset, 0)
+        self.assertEqual(os.path.getsize(os.path.join(self.temp_dir, f'{session_id}.part')), 0)
+
+    def test_size_is_validated_before_and_during_the_upload(self):
+        response = self._start(size=2 * 1024 * 1024)
+        self.assertEqual(response.status_code, 400)
+        response = self._start(size=10, filename='intro.exe')
+        self.assertEqual(response.status_code, 400)
+
+        session_id = self._start(size=4).data['id']
+        self.assertEqual(self._patch(session_id, b'hello', 0).status_code, 413)
+
+    def test_only_course_instructors_can_upload(self):
+        self.client.force_authenticate(User.objects.create_user('student', password='x'))
+        self.assertEqual(self._start(size=10).status_code, 403)
+
+    def test_lesson_resource_upload_creates_the_resource(self):
+        lesson = Lesson.objects.create(title='Lesson 1', module=self.module, order=1)
+        response = self._start(target='lesson_resource', module=None, lesson=lesson.pk, filename='notes.pdf', size=3)
+        session_id = response.data['id']
+        self._patch(session_id, b'pdf', 0)
+
+        response = self.client.post(f'/api/content/uploads/{session_id}/complete/')
+        self.assertEqual(response.status_code, 200, response.data)
+        resource = LessonResource.objects.get(lesson=lesson)
+        self.assertEqual(resource.title, 'notes.pdf')
+        self.assertIn(f'/lessons/{lesson.pk}/resources/notes', resource.file.name)
+
+    def test_purge_removes_expired_sessions_and_files(self):
+        session_id = self._start(size=10).data['id']
+        UploadSession.objects.filter(pk=session_id).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        call_command('purge_expired_uploads', stdout=StringIO())
+
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(self.temp_dir), [])
@@ -0,0 +1,237 @@
+"""
+Chunked, resumable uploads of module videos and lesson resource files.
+
+A tus-like protocol on top of ``UploadSession``:
+
+1. ``POST /api/content/uploads/`` declares the target, file name, total size
+   and optionally the SHA-256 of the whole file. The extension and size are
+   checked against the target field's validators (``MAX_MODULE_FILE_MB``)
+   before any byte is sent.
+2. ``PATCH /api/content/uploads/<id>/`` appends the raw request body
+   (``Content-Type: application/offset+octet-stream``) at ``Upload-Offset``.
+   An ``Upload-Checksum: sha256 <base64 digest>`` header makes the chunk
+   all-or-nothing; without it whatever arrived before a dropped connection
+   is kept. ``HEAD``/``GET`` report the offset to resume from.
+3. ``POST /api/content/uploads/<id>/complete/`` verifies the whole-file
+   checksum and moves the file into ``module_video_upload_path`` /
+   ``lesson_resource_upload_path``.
+
+Bodies are copied from the socket to ``<TEMP_DIR>/<id>.part`` in
+``BUFFER_SIZE`` blocks, so an upload holds one block in memory whatever the
+file size, and a chunk can never grow the file past its declared size.
+``purge_expired_uploads`` removes abandoned sessions and their files.
+"""
+import base64
+import hashlib
+import os
+import tempfile
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+
+from .models import LessonResource, Module, UploadSession
+
+BUFFER_SIZE = 64 * 1024
+LOCK_KEY = 'content:upload:lock:{session_id}'
+CHECKSUM_MISMATCH = 460  # tus "Checksum Mismatch"
+
+# Target -> (model, file field)
+TARGET_FIELDS = {
+    UploadSession.Target.MODULE_VIDEO: (Module, 'video'),
+    UploadSession.Target.LESSON_RESOURCE: (LessonResource, 'file'),
+}
+
+
+class UploadError(Exception):
+    def __init__(self, message, status_code=status.HTTP_400_BAD_REQUEST):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def _config(name, default):
+    return getattr(settings, 'CHUNKED_UPLOADS', {}).get(name, default)
+
+
+def temp_dir():
+    directory = _config('TEMP_DIR', None) or os.path.join(tempfile.gettempdir(), 'lms-uploads')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def max_chunk_size():
+    return int(_config('MAX_CHUNK_MB', 16)) * 1024 * 1024
+
+
+def part_path(session):
+    return os.path.join(temp_dir(), f'{session.pk}.part')
+
+
+def validate_declared_file(target, filename, size):
+    """Run the target field's validators (extension, ``MAX_MODULE_FILE_MB``) on the declared file"""
+    model, field_name = TARGET_FIELDS[target]
+    declared = SimpleNamespace(name=filename, size=size)
+    for validator in model._meta.get_field(field_name).validators:
+        validator(declared)
+
+
+def start(user, target, filename, size, **fields):
+    """Open an upload session with an empty part file"""
+    try:
+        validate_declared_file(target, filename, size)
+    except ValidationError as exc:
+        raise UploadError(' '.join(exc.messages))
+
+    session = UploadSession.objects.create(
+        user=user,
+        target=target,
+        filename=filename,
+        size=size,
+        expires_at=timezone.now() + timedelta(hours=int(_config('EXPIRE_HOURS', 24))),
+        **fields
+    )
+    open(part_path(session), 'wb').close()
+    return session
+
+
+def _check_active(session):
+    if session.status != UploadSession.Status.ACTIVE:
+        raise UploadError(_('This upload is already complete'), status.HTTP_409_CONFLICT)
+    if session.is_expired:
+        raise UploadError(_('This upload has expired'), status.HTTP_410_GONE)
+
+
+def _parse_checksum(header):
+    """``sha256 <base64 digest>`` -> digest bytes"""
+    algorithm, _sep, encoded = (header or '').partition(' ')
+    if algorithm.lower() != 'sha256':
+        raise UploadError(_('Only sha256 checksums are supported'))
+    try:
+        return base64.b64decode(encoded.strip(), validate=True)
+    except ValueError:
+        raise UploadError(_('Malformed Upload-Checksum header'))
+
+
+def append(session, stream, length, offset, checksum=None):
+    """Append ``length`` bytes of ``stream`` at ``offset``; returns the new offset"""
+    _check_active(session)
+    expected_digest = _parse_checksum(checksum) if checksum else None
+
+    lock_key = LOCK_KEY.format(session_id=session.pk)
+    if not cache.add(lock_key, 1, timeout=600):
+        raise UploadError(_('Another chunk of this upload is being received'), status.HTTP_409_CONFLICT)
+    try:
+        session.refresh_from_db(fields=['offset'])
+        if offset != session.offset:
+            raise UploadError(_('Upload-Offset does not match the current offset'), status.HTTP_409_CONFLICT)
+        if length > max_chunk_size() or session.offset + length > session.size:
+            raise UploadError(
+                _('The chunk is larger than the chunk limit or the rest of the file'),
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        digest = hashlib.sha256()
+        received = 0
+        with open(part_path(session), 'r+b') as part:
+            # Drop bytes written after the last recorded offset (e.g. by an interrupted request)
+            part.truncate(session.offset)
+            part.seek(session.offset)
+            while stream is not None and received < length:
+                block = stream.read(min(BUFFER_SIZE, length - received))
+                if not block:
+                    break
+                part.write(block)
+                digest.update(block)
+                received += len(block)
+            if expected_digest is not None and (received != length or digest.digest() != expected_digest):
+                part.truncate(session.offset)
+                raise UploadError(_('The chunk does not match Upload-Checksum'), CHECKSUM_MISMATCH)
+
+        session.offset += received
+        UploadSession.objects.filter(pk=session.pk).update(offset=session.offset, updated_at=timezone.now())
+        return session.offset
+    finally:
+        cache.delete(lock_key)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as part:
+        for block in iter(lambda: part.read(BUFFER_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AssembledFile(File):
+    """The finished part file; ``FileSystemStorage`` moves it into place instead of copying it"""
+
+    def __init__(self, file, name, path):
+        super().__init__(file, name)
+        self.path = path
+
+    def temporary_file_path(self):
+        return self.path
+
+
+def complete(session):
+    """Verify the assembled file and store it in the target field; returns the target object"""
+    _check_active(session)
+    if session.offset != session.size:
+        raise UploadError(_('The upload is incomplete'), status.HTTP_409_CONFLICT)
+    path = part_path(session)
+    if session.checksum and file_sha256(path) != session.checksum.lower():
+        raise UploadError(_('The file does not match its checksum; delete the upload and start over'), CHECKSUM_MISMATCH)
+
+    with open(path, 'rb') as part:
+        assembled = AssembledFile(part, session.filename, path)
+        if session.target == UploadSession.Target.MODULE_VIDEO:
+            target = session.module
+            target.video.save(session.filename, assembled, save=False)
+            target.save(update_fields=['video', 'updated_at'], skip_file_validation=True)
+        else:
+            target = session.resource or LessonResource(
+                lesson=session.lesson,
+                title=session.title or session.filename,
+                resource_type=session.resource_type or LessonResource.ResourceType.DOCUMENT,
+            )
+            target.url = None
+            target.file.save(session.filename, assembled, save=True)
+            session.resource = target
+    _remove(path)  # storages other than the filesystem copy it
+
+    session.status = UploadSession.Status.COMPLETED
+    session.save(update_fields=['status', 'resource', 'updated_at'])
+    return target
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def discard(session):
+    _remove(part_path(session))
+    session.delete()
+
+
+def purge_expired(now=None):
+    """Delete expired and completed sessions with their part files; returns how many"""
+    now = now or timezone.now()
+    sessions = UploadSession.objects.filter(
+        Q(expires_at__lte=now) | Q(status=UploadSession.Status.COMPLETED)
+    ).only('pk')
+    count = 0
+    for session in sessions.iterator():
+        discard(session)
+        count += 1
+    return count
@@ -4,12 +4,14 @@ from . import views
 from .views_progress import ProgressViewSet
 from .views_search import ContentSearchView
 from . import views_bunny
+from .views_uploads import UploadSessionViewSet
 
 # Create a router for the ModuleViewSet
 router = DefaultRouter()
 router.register(r'modules', views.ModuleViewSet, basename='module')
 router.register(r'lessons', views.LessonViewSet, basename='lesson')
 router.register(r'resources', views.LessonResourceViewSet, basename='resource')
+router.register(r'uploads', UploadSessionViewSet, basename='upload')
 
 # Progress tracking viewset
 progress_view = ProgressViewSet.as_view({
@@ -6,8 +6,8 @@ from rest_framework.decorators import action
 from django.shortcuts import get_object_or_404
 from django.db import models
 
+from courses.access import HasCourseAccess, get_course_access
 from courses.models import Course, Enrollment
-from users.models import Profile
 from content.models import Module, ModuleProgress, UserProgress, Lesson, LessonResource
 from content.serializers import (
     ModuleDetailSerializer, ModuleCreateSerializer, ProgressUpdateSerializer,
@@ -95,35 +95,16 @@ class ModuleViewSet(ModelViewSet):
                 'error': 'الوحدة غير موجودة'
             }, status=status.HTTP_404_NOT_FOUND)
             
-        course = module.course
-        user = request.user
-        
-        # Debug logging
-        print(f"Debug - Module ID: {module.id}, Course ID: {course.id}, User: {user.id}")
-        
-        # Check permissions: enrolled student or instructor/admin
-        is_enrolled = course.enrollments.filter(student=user, status__in=['active', 'completed']).exists()
-        is_instructor_or_admin = False
-        
-        try:
-            profile = user.profile
-            if profile.status == 'Admin' or user.is_staff:
-                is_instructor_or_admin = True
-            elif profile.status == 'Instructor':
-                instructor = profile.get_instructor_object()
-                if instructor and instructor in course.instructors.all():
-                    is_instructor_or_admin = True
-        except Profile.DoesNotExist:
-            pass
-        
-        print(f"Debug - is_enrolled: {is_enrolled}, is_instructor_or_admin: {is_instructor_or_admin}")
-        
-        # For now, allow access to all authenticated users for testing
-        # TODO: Implement proper permission checking
-        if not user.is_authenticated:
+        if not request.user.is_authenticated:
             return Response({
                 'error': 'يجب تسجيل الدخول للوصول لهذا المحتوى'
             }, status=status.HTTP_401_UNAUTHORIZED)
+
+        # Enrolled students, course instructors and admins only
+        if not get_course_access(request).can_access(module.course):
+            return Response({
+                'error': 'يجب أن تكون مسجلاً في الدورة للوصول لهذا المحتوى'
+            }, status=status.HTTP_403_FORBIDDEN)
         
         serializer = self.get_serializer(module)
         return Response(serializer.data)
@@ -135,7 +116,7 @@ class ModuleViewSet(ModelViewSet):
         course = module.course
         
         # Check if user is enrolled
-        if not course.enrollments.filter(student=request.user, status__in=['active', 'completed']).exists():
+        if not get_course_access(request).is_enrolled(course):
             return Response({
                 'error': 'يجب أن تكون مسجلاً في الدورة'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -168,7 +149,7 @@ class ModuleViewSet(ModelViewSet):
         course = module.course
         
         # Check if user is enrolled
-        if not course.enrollments.filter(student=request.user, status__in=['active', 'completed']).exists():
+        if not get_course_access(request).is_enrolled(course):
             return Response({
                 'error': 'يجب أن تكون مسجلاً في الدورة'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -261,24 +242,9 @@ class CourseProgressMixin:
     def modules(self, request, pk=None):
         """جلب وحدات الدورة"""
         course = self.get_object()
-        user = request.user
         
         # Check if user is enrolled or is the instructor/admin
-        is_enrolled = course.enrollments.filter(student=user, status__in=['active', 'completed']).exists()
-        is_instructor_or_admin = False
-        
-        try:
-            profile = user.profile
-            if profile.status == 'Admin' or user.is_staff:
-                is_instructor_or_admin = True
-            elif profile.status == 'Instructor':
-                instructor = profile.get_instructor_object()
-                if instructor and instructor in course.instructors.all():
-                    is_instructor_or_admin = True
-        except Profile.DoesNotExist:
-            pass
-        
-        if not is_enrolled and not is_instructor_or_admin:
+        if not get_course_access(request).can_access(course):
             return Response({
                 'error': 'يجب أن تكون مسجلاً في الدورة للوصول لهذا المحتوى'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -434,32 +400,14 @@ class LessonResourceViewSet(ModelViewSet):
 # New APIs for course content
 class CourseModulesWithLessonsViewSet(ModelViewSet):
     """Get all modules with their lessons for a specific course"""
-    permission_classes = [permissions.IsAuthenticated]
+    # Enrolled students, the course's instructors and admins
+    permission_classes = [permissions.IsAuthenticated, HasCourseAccess]
     
     def list(self, request, course_id=None):
         try:
             # Get the course
             course = get_object_or_404(Course, id=course_id)
             
-            # Check if user is enrolled or is instructor/admin
-            user = request.user
-            is_enrolled = course.enrollments.filter(student=user, status__in=['active', 'completed']).exists()
-            is_instructor_or_admin = False
-            
-            try:
-                profile = user.profile
-                is_instructor_or_admin = (
-                    profile.role in ['instructor', 'admin'] or 
-                    course.instructor == user
-                )
-            except:
-                pass
-            
-            if not (is_enrolled or is_instructor_or_admin):
-                return Response({
-                    'error': 'ليس لديك صلاحية للوصول إلى هذا الكورس'
-                }, status=status.HTTP_403_FORBIDDEN)
-            
             # Get modules with lessons (including submodules)
             modules = Module.objects.filter(course=course, is_active=True).prefetch_related('lessons', 'submodules').order_by('order')
             
@@ -524,32 +472,14 @@ class CourseModulesWithLessonsViewSet(ModelViewSet):
 
 class CourseQuestionBankViewSet(ModelViewSet):
     """Get all question banks for all lessons in a specific course"""
-    permission_classes = [permissions.IsAuthenticated]
+    # Enrolled students, the course's instructors and admins
+    permission_classes = [permissions.IsAuthenticated, HasCourseAccess]
     
     def list(self, request, course_id=None):
         try:
             # Get the course
             course = get_object_or_404(Course, id=course_id)
             
-            # Check if user is enrolled or is instructor/admin
-            user = request.user
-            is_enrolled = course.enrollments.filter(student=user, status__in=['active', 'completed']).exists()
-            is_instructor_or_admin = False
-            
-            try:
-                profile = user.profile
-                is_instructor_or_admin = (
-                    profile.role in ['instructor', 'admin'] or 
-                    course.instructor == user
-                )
-            except:
-                pass
-            
-            if not (is_enrolled or is_instructor_or_admin):
-                return Response({
-                    'error': 'ليس لديك صلاحية للوصول إلى هذا الكورس'
-                }, status=status.HTTP_403_FORBIDDEN)
-            
             # Get all questions for all lessons in this course
             questions = QuestionBank.objects.filter(
                 lesson__module__course=course,
@@ -624,32 +554,14 @@ class CourseQuestionBankViewSet(ModelViewSet):
 
 class CourseFlashcardsViewSet(ModelViewSet):
     """Get all flashcards for all questions in all lessons of a specific course"""
-    permission_classes = [permissions.IsAuthenticated]
+    # Enrolled students, the course's instructors and admins
+    permission_classes = [permissions.IsAuthenticated, HasCourseAccess]
     
     def list(self, request, course_id=None):
         try:
             # Get the course
             course = get_object_or_404(Course, id=course_id)
             
-            # Check if user is enrolled or is instructor/admin
-            user = request.user
-            is_enrolled = course.enrollments.filter(student=user, status__in=['active', 'completed']).exists()
-            is_instructor_or_admin = False
-            
-            try:
-                profile = user.profile
-                is_instructor_or_admin = (
-                    profile.role in ['instructor', 'admin'] or 
-                    course.instructor == user
-                )
-            except:
-                pass
-            
-            if not (is_enrolled or is_instructor_or_admin):
-                return Response({
-                    'error': 'ليس لديك صلاحية للوصول إلى هذا الكورس'
-                }, status=status.HTTP_403_FORBIDDEN)
-            
             # Get all flashcards for all lessons in this course
             flashcards = Flashcard.objects.filter(
                 lesson__module__course=course,
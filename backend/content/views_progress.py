@@ -5,8 +5,9 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from .models import ModuleProgress, UserProgress, Lesson
-from .serializers import ModuleProgressSerializer, UserProgressSerializer
-from .serializers_progress import LessonCompletionSerializer, ContentTrackingSerializer
+from .serializers_progress import (
+    LessonCompletionSerializer, ContentTrackingSerializer, ModuleProgressSerializer, UserProgressSerializer
+)
 
 class ProgressViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
@@ -1,5 +1,6 @@
-from rest_framework import generics, filters
+from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from django.db.models import Q
 from .models import Module, Lesson, LessonResource
 from .serializers import (
@@ -11,20 +12,21 @@ from .serializers import (
 class ContentSearchView(generics.ListAPIView):
     """Search across modules, lessons, and resources"""
     permission_classes = [IsAuthenticated]
-    search_fields = ['title', 'description', 'content']
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    ordering_fields = ['title', 'created_at', 'updated_at']
-    ordering = ['-created_at']
+    serializers = {
+        'modules': ModuleSearchSerializer,
+        'lessons': LessonSearchSerializer,
+        'resources': ResourceSearchSerializer,
+    }
 
-    def get_queryset(self):
+    def get_querysets(self):
+        """``{content type: queryset}`` of the matches, newest first"""
         query = self.request.query_params.get('q', '')
-        content_type = self.request.query_params.get('type', 'all')
         course_id = self.request.query_params.get('course_id')
         
         # Base querysets
-        modules = Module.objects.all()
-        lessons = Lesson.objects.all()
-        resources = LessonResource.objects.all()
+        modules = Module.objects.select_related('course')
+        lessons = Lesson.objects.select_related('module__course')
+        resources = LessonResource.objects.select_related('lesson__module__course')
         
         # Filter by course if specified
         if course_id:
@@ -35,7 +37,7 @@ class ContentSearchView(generics.ListAPIView):
         # Apply search query if provided
         if query:
             modules = modules.filter(
-                Q(title__icontains=query) |
+                Q(name__icontains=query) |
                 Q(description__icontains=query)
             )
             
@@ -49,59 +51,28 @@ class ContentSearchView(generics.ListAPIView):
                 Q(title__icontains=query) |
                 Q(description__icontains=query))
         
-        # Filter by content type
-        if content_type == 'modules':
-            return modules
-        elif content_type == 'lessons':
-            return lessons
-        elif content_type == 'resources':
-            return resources
-        else:
-            # Return all content types
-            return list(modules) + list(lessons) + list(resources)
+        return {
+            'modules': modules.order_by('-created_at'),
+            'lessons': lessons.order_by('-created_at'),
+            'resources': resources.order_by('-created_at'),
+        }
     
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        
-        # Get the content type for filtering
+        querysets = self.get_querysets()
         content_type = self.request.query_params.get('type', 'all')
         
-        # Serialize based on content type
-        if content_type == 'modules' or isinstance(queryset, list):
-            modules = [item for item in queryset if isinstance(item, Module)]
-            modules_serializer = ModuleSearchSerializer(modules, many=True)
-            if content_type == 'modules':
-                return Response({
-                    'modules': modules_serializer.data,
-                    'count': len(modules_serializer.data)
-                })
+        # A single content type
+        if content_type in querysets:
+            data = self.serializers[content_type](querysets[content_type], many=True).data
+            return Response({
+                content_type: data,
+                'count': len(data)
+            })
         
-        if content_type == 'lessons' or isinstance(queryset, list):
-            lessons = [item for item in queryset if isinstance(item, Lesson)]
-            lessons_serializer = LessonSearchSerializer(lessons, many=True)
-            if content_type == 'lessons':
-                return Response({
-                    'lessons': lessons_serializer.data,
-                    'count': len(lessons_serializer.data)
-                })
-        
-        if content_type == 'resources' or isinstance(queryset, list):
-            resources = [item for item in queryset if isinstance(item, LessonResource)]
-            resources_serializer = ResourceSearchSerializer(resources, many=True)
-            if content_type == 'resources':
-                return Response({
-                    'resources': resources_serializer.data,
-                    'count': len(resources_serializer.data)
-                })
-        
-        # If no specific type or mixed results
-        return Response({
-            'modules': modules_serializer.data if 'modules_serializer' in locals() else [],
-            'lessons': lessons_serializer.data if 'lessons_serializer' in locals() else [],
-            'resources': resources_serializer.data if 'resources_serializer' in locals() else [],
-            'count': (
-                len(modules_serializer.data if 'modules_serializer' in locals() else []) +
-                len(lessons_serializer.data if 'lessons_serializer' in locals() else []) +
-                len(resources_serializer.data if 'resources_serializer' in locals() else [])
-            )
-        })
+        # All content types
+        results = {
+            name: self.serializers[name](queryset, many=True).data
+            for name, queryset in querysets.items()
+        }
+        results['count'] = sum(len(items) for items in results.values())
+        return Response(results)
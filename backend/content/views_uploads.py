@@ -0,0 +1,105 @@
+"""
+Chunked, resumable upload endpoints for module videos and lesson resources
+(protocol in content.uploads)
+"""
+from django.shortcuts import get_object_or_404
+from django.utils.translation import gettext_lazy as _
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from courses.access import get_course_access
+from . import uploads
+from .models import UploadSession
+from .serializers import UploadSessionSerializer, LessonResourceSerializer
+
+
+def _error(exc):
+    return Response({'error': exc.message}, status=exc.status_code)
+
+
+class UploadSessionViewSet(viewsets.GenericViewSet):
+    """
+    POST   /api/content/uploads/                  start an upload
+    HEAD   /api/content/uploads/<id>/             Upload-Offset to resume from
+    PATCH  /api/content/uploads/<id>/             append a chunk at Upload-Offset
+    POST   /api/content/uploads/<id>/complete/    store the file in its target
+    DELETE /api/content/uploads/<id>/             abort
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user).select_related('module', 'lesson', 'resource')
+
+    def _offset_headers(self, response, session):
+        response['Upload-Offset'] = str(session.offset)
+        response['Upload-Length'] = str(session.size)
+        response['Cache-Control'] = 'no-store'
+        return response
+
+    def create(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        module = data.get('module')
+        course_id = module.course_id if module else data['lesson'].module.course_id
+        if not get_course_access(request).is_instructor_or_admin(course_id):
+            return Response({
+                'error': _('Only the course instructors can upload its content')
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            session = uploads.start(request.user, **data)
+        except uploads.UploadError as exc:
+            return _error(exc)
+
+        response = Response(
+            {**self.get_serializer(session).data, 'chunk_size': uploads.max_chunk_size()},
+            status=status.HTTP_201_CREATED,
+        )
+        response['Location'] = request.build_absolute_uri(f'{session.pk}/')
+        return self._offset_headers(response, session)
+
+    def retrieve(self, request, pk=None):
+        session = self.get_object()
+        return self._offset_headers(Response(self.get_serializer(session).data), session)
+
+    def partial_update(self, request, pk=None):
+        session = self.get_object()
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.headers.get('Content-Length') or 0)
+        except ValueError:
+            return Response({'error': _('Upload-Offset header is required')}, status=status.HTTP_400_BAD_REQUEST)
+        if request.content_type != 'application/offset+octet-stream':
+            return Response({
+                'error': _('Chunks must be sent as application/offset+octet-stream')
+            }, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+        try:
+            # request.stream is the unread request body; request.data is never touched
+            uploads.append(session, request.stream, length, offset, request.headers.get('Upload-Checksum'))
+        except uploads.UploadError as exc:
+            return self._offset_headers(_error(exc), session)
+        return self._offset_headers(Response(status=status.HTTP_204_NO_CONTENT), session)
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        session = self.get_object()
+        try:
+            target = uploads.complete(session)
+        except uploads.UploadError as exc:
+            return _error(exc)
+
+        data = self.get_serializer(session).data
+        if session.target == UploadSession.Target.MODULE_VIDEO:
+            data['file'] = request.build_absolute_uri(target.video.url)
+        else:
+            data['lesson_resource'] = LessonResourceSerializer(target, context={'request': request}).data
+        return Response(data)
+
+    def destroy(self, request, pk=None):
+        uploads.discard(self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
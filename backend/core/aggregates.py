@@ -0,0 +1,19 @@
+"""
+Per-row counts as correlated subqueries.
+
+``count_subquery`` backs the listing annotations of reviews and meetings and
+the annotated admin changelists (users, courses, notifications, meetings):
+unlike ``Count()`` over joins it does not multiply rows when a queryset
+carries several counts, is only evaluated for the rows of the page being
+rendered, and is dropped by ``QuerySet.count()`` when the paginator counts
+the result.
+"""
+from django.db import models
+from django.db.models import Count, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, field):
+    """Correlated ``COUNT(*)`` subquery over ``queryset`` (filtered on an ``OuterRef``) grouped by ``field``"""
+    counts = queryset.order_by().values(field).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=models.IntegerField()), Value(0))
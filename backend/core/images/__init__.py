@@ -0,0 +1,217 @@
+"""
+Resized and WebP derivatives of uploaded images.
+
+Each registered image field (``IMAGE_FIELDS``) gets a set of size variants
+(``VARIANTS``, bounding boxes; images are never upscaled). Every variant is
+written twice next to the original -- as WebP and in a fallback format (PNG
+for sources that may carry transparency, JPEG otherwise)::
+
+    courses/images/intro.jpg
+    courses/images/intro__thumb.jpg
+    courses/images/intro__thumb.webp
+    ...
+
+Names are derived from the original's name alone, so serializers build the
+variant URLs without storing anything (``ImageVariantsField``). The last
+file written -- the WebP of the field's last variant -- marks the set as
+complete; until it exists serializers return None and clients keep using
+the original. Missing sets are remembered for ``IMAGE_DERIVATIVES
+['MISSING_TTL']`` seconds, so listings do not stat every image whose
+variants are pending or failed to generate on every request.
+
+Variants are generated after the saving transaction commits, on a
+background worker thread with ``IMAGE_DERIVATIVES['ASYNC']`` (inline
+otherwise). ``generate_image_derivatives`` backfills existing media.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_save
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+# Variant -> bounding box (width, height)
+VARIANTS = {
+    'thumb': (200, 200),
+    'card': (640, 640),
+    'hero': (1920, 1920),
+}
+
+# Model label -> {image field: variants}
+IMAGE_FIELDS = {
+    'courses.Course': {'image': ('thumb', 'card', 'hero')},
+    'courses.Category': {'image': ('thumb', 'card')},
+    'users.Profile': {'image_profile': ('thumb', 'card')},
+    'extras.Banner': {'image': ('card', 'hero')},
+    'articles.Article': {'image': ('thumb', 'card', 'hero')},
+    'articles.Book': {'cover_image': ('thumb', 'card')},
+    'assessment.Flashcard': {'front_image': ('card',), 'back_image': ('card',)},
+}
+
+# Source extensions whose images may be transparent get PNG fallbacks
+TRANSPARENT_EXTENSIONS = ('.png', '.gif', '.webp')
+
+# Names whose variants are known to exist (they never go away for a given name)
+_ready = set()
+# Names whose variants were missing -> monotonic time the entry expires
+_missing = {}
+_MEMO_SIZE = 50000
+_executor = None
+
+
+def _config(name, default):
+    return getattr(settings, 'IMAGE_DERIVATIVES', {}).get(name, default)
+
+
+def fallback_format(name):
+    """(Pillow format, extension) of the non-WebP variants of ``name``"""
+    if os.path.splitext(name)[1].lower() in TRANSPARENT_EXTENSIONS:
+        return 'PNG', 'png'
+    return 'JPEG', 'jpg'
+
+
+def variant_name(name, variant, extension):
+    root, _ext = os.path.splitext(name)
+    return f'{root}__{variant}.{extension}'
+
+
+def variants_for(fieldfile):
+    return IMAGE_FIELDS.get(fieldfile.instance._meta.label, {}).get(fieldfile.field.name, ())
+
+
+def is_ready(name, variants, storage=default_storage):
+    if name in _ready:
+        return True
+    now = time.monotonic()
+    if _missing.get(name, 0) > now:
+        return False
+    if not storage.exists(variant_name(name, variants[-1], 'webp')):
+        if len(_missing) >= _MEMO_SIZE:
+            _missing.clear()
+        _missing[name] = now + float(_config('MISSING_TTL', 60))
+        return False
+    _missing.pop(name, None)
+    if len(_ready) >= _MEMO_SIZE:
+        _ready.clear()
+    _ready.add(name)
+    return True
+
+
+def _write(path, image, image_format, storage):
+    buffer = BytesIO()
+    quality = int(_config('QUALITY', 80))
+    if image_format == 'WEBP':
+        image.save(buffer, 'WEBP', quality=quality, method=4)
+    elif image_format == 'JPEG':
+        image.convert('RGB').save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(buffer, image_format, optimize=True)
+    if storage.exists(path):
+        storage.delete(path)
+    storage.save(path, ContentFile(buffer.getvalue()))
+
+
+def generate(name, variants, force=False, storage=default_storage):
+    """Write the variants of the image ``name``; returns how many files were written"""
+    if not force and is_ready(name, variants, storage):
+        return 0
+    image_format, extension = fallback_format(name)
+    with storage.open(name, 'rb') as source:
+        image = Image.open(source)
+        # JPEG: decode at the smallest scale that still covers the largest variant
+        image.draft('RGB', max(VARIANTS[variant] for variant in variants))
+        image.load()
+    image = ImageOps.exif_transpose(image)
+    image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+    written = 0
+    for variant in variants:
+        resized = image.copy()
+        resized.thumbnail(VARIANTS[variant], Image.Resampling.LANCZOS)
+        _write(variant_name(name, variant, extension), resized, image_format, storage)
+        # WebP last: the final variant's WebP marks the set as complete
+        _write(variant_name(name, variant, 'webp'), resized, 'WEBP', storage)
+        written += 2
+    _ready.discard(name)
+    _missing.pop(name, None)
+    return written
+
+
+def _run_generation(name, variants):
+    close_old_connections()
+    try:
+        generate(name, variants)
+    except Exception:
+        logger.exception('Error generating image derivatives of %s', name)
+    finally:
+        close_old_connections()
+
+
+def schedule(name, variants):
+    """Generate the variants of ``name`` once the current transaction commits"""
+    def run():
+        global _executor
+        if not _config('ASYNC', True):
+            _run_generation(name, variants)
+            return
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-derivatives')
+        _executor.submit(_run_generation, name, variants)
+
+    transaction.on_commit(run)
+
+
+def variant_urls(fieldfile, request=None):
+    """``{variant: {'webp': url, 'fallback': url}}`` of a stored image, None until generated"""
+    if not fieldfile:
+        return None
+    variants = variants_for(fieldfile)
+    if not variants or not is_ready(fieldfile.name, variants, fieldfile.storage):
+        return None
+    _format, extension = fallback_format(fieldfile.name)
+
+    def url(path):
+        path = fieldfile.storage.url(path)
+        return request.build_absolute_uri(path) if request else path
+
+    return {
+        variant: {
+            'webp': url(variant_name(fieldfile.name, variant, 'webp')),
+            'fallback': url(variant_name(fieldfile.name, variant, extension)),
+        }
+        for variant in variants
+    }
+
+
+class ImageVariantsField(serializers.Field):
+    """Read-only variant URLs of an image field, e.g. ``ImageVariantsField(source='image')``"""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return variant_urls(value, self.context.get('request'))
+
+
+def image_saved(sender, instance, update_fields=None, **kwargs):
+    for field_name, variants in IMAGE_FIELDS[sender._meta.label].items():
+        if update_fields is not None and field_name not in update_fields:
+            continue
+        name = getattr(instance, field_name).name
+        if name and not is_ready(name, variants):
+            schedule(name, variants)
+
+
+def connect_signals():
+    for label in IMAGE_FIELDS:
+        post_save.connect(image_saved, sender=label, dispatch_uid=f'image_derivatives:{label}')
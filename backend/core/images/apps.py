@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class ImageDerivativesConfig(AppConfig):
+    name = 'core.images'
+    label = 'image_derivatives'
+    verbose_name = 'Image derivatives'
+
+    def ready(self):
+        """Generate resized/WebP variants of the registered image fields on save"""
+        from . import connect_signals
+        connect_signals()
@@ -0,0 +1,49 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from core import images
+
+
+class Command(BaseCommand):
+    help = (
+        'Backfill resized/WebP variants of course, category, profile, banner, article, book and '
+        'flashcard images; images whose variants already exist are skipped'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            choices=list(images.IMAGE_FIELDS),
+            help='Only process the given model (can be repeated)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate variants that already exist',
+        )
+
+    def handle(self, *args, **options):
+        for label in options['models'] or images.IMAGE_FIELDS:
+            model = apps.get_model(label)
+            for field_name, variants in images.IMAGE_FIELDS[label].items():
+                generated = skipped = failed = 0
+                names = (
+                    model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                    .order_by().values_list(field_name, flat=True).distinct()
+                )
+                for name in names.iterator():
+                    try:
+                        written = images.generate(name, variants, force=options['force'])
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f'{name}: {exc}')
+                        continue
+                    if written:
+                        generated += 1
+                    else:
+                        skipped += 1
+                self.stdout.write(
+                    f'{label}.{field_name}: {generated} generated, {skipped} up to date, {failed} failed'
+                )
@@ -0,0 +1,269 @@
+"""
+HTTP load test of the core learner journey.
+
+Every virtual user logs in and then repeats the journey that matters in
+production::
+
+    browse catalog -> course detail -> enroll -> course tracking page
+    -> video heartbeats -> submit assessment -> add to cart -> checkout
+
+against a running server (``run_load_test`` management command). Each
+iteration works on a different course the user is not enrolled in yet, so
+the writes are real ones and not "already enrolled" shortcuts.
+
+``prepare_plans()`` reads the users and courses of a dataset created by
+``generate_load_data`` and sets up what the HTTP API cannot: an open
+assessment submission per planned course and an empty cart. ``run()``
+drives the plans from one thread per virtual user and returns per-step
+latency percentiles, throughput (requests of the step per second of the
+whole run) and error counts; ``compare()`` diffs them against a saved
+baseline.
+"""
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+STEPS = (
+    'login',
+    'catalog',
+    'course_detail',
+    'enroll',
+    'tracking',
+    'video_heartbeat',
+    'submit_assessment',
+    'add_to_cart',
+    'checkout',
+)
+
+PERCENTILES = (50, 95, 99)
+
+# A step regresses when its p95 grows or its throughput drops by more than this
+DEFAULT_TOLERANCE = 0.2
+
+
+class VirtualUserPlan:
+    """Credentials and the courses one virtual user will walk through"""
+
+    def __init__(self, email, password, iterations):
+        self.email = email
+        self.password = password
+        # [{'course_id', 'module_ids', 'submission_id', 'question_ids', 'cart_course_id'}]
+        self.iterations = iterations
+
+
+def prepare_plans(users, iterations, prefix='load', password='loadtest', seed=0):
+    """Plans for ``users`` virtual users of the ``prefix`` dataset.
+
+    Only courses with a published status, modules and an assessment are
+    used. Creates an open submission for every planned course and empties
+    the users' carts.
+    """
+    from django.db.models import Max
+
+    from assessment.models import AssessmentQuestions, StudentSubmission
+    from content.models import Module
+    from courses.models import Enrollment
+    from store.models import CartItem
+    from users.models import Profile
+
+    rng = random.Random(seed)
+    student_ids = list(Profile.objects.filter(
+        status='Student', user__username__startswith=f'{prefix}-user-'
+    ).order_by('user_id').values_list('user_id', 'user__email')[:users])
+
+    courses = {}
+    for question_id, assessment_id, course_id in AssessmentQuestions.objects.filter(
+        assessment__course__status='published', assessment__course__slug__startswith=f'{prefix}-course-'
+    ).values_list('question_id', 'assessment_id', 'assessment__course_id'):
+        course = courses.setdefault(course_id, {'assessment_id': assessment_id, 'question_ids': []})
+        course['question_ids'].append(question_id)
+    for module_id, course_id in Module.objects.filter(course_id__in=courses).values_list('pk', 'course_id'):
+        courses[course_id].setdefault('module_ids', []).append(module_id)
+    course_ids = sorted(course_id for course_id, course in courses.items() if course.get('module_ids'))
+
+    enrolled = {}
+    for student_id, course_id in Enrollment.objects.filter(
+        student_id__in=[user_id for user_id, _ in student_ids]
+    ).values_list('student_id', 'course_id'):
+        enrolled.setdefault(student_id, set()).add(course_id)
+    attempts = {
+        (row['student_id'], row['assessment_id']): row['last']
+        for row in StudentSubmission.objects.filter(
+            student_id__in=[user_id for user_id, _ in student_ids]
+        ).values('student_id', 'assessment_id').annotate(last=Max('attempt_number'))
+    }
+
+    plans, submissions = [], []
+    for user_id, email in student_ids:
+        available = [course_id for course_id in course_ids if course_id not in enrolled.get(user_id, ())]
+        if len(available) < iterations * 2:
+            continue
+        picked = rng.sample(available, iterations * 2)
+        steps = []
+        for course_id, cart_course_id in zip(picked[::2], picked[1::2]):
+            course = courses[course_id]
+            submission = StudentSubmission(
+                student_id=user_id, assessment_id=course['assessment_id'],
+                attempt_number=attempts.get((user_id, course['assessment_id']), 0) + 1,
+            )
+            submissions.append(submission)
+            steps.append({
+                'course_id': course_id,
+                'module_ids': course['module_ids'],
+                'submission': submission,
+                'question_ids': course['question_ids'],
+                'cart_course_id': cart_course_id,
+            })
+        plans.append(VirtualUserPlan(email, password, steps))
+
+    StudentSubmission.objects.bulk_create(submissions)
+    for plan in plans:
+        for step in plan.iterations:
+            step['submission_id'] = step.pop('submission').pk
+    CartItem.objects.filter(cart__user_id__in=[user_id for user_id, _ in student_ids]).delete()
+    return plans
+
+
+class Recorder:
+    """Thread-safe latency samples and status counts per step"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {step: [] for step in STEPS}
+        self.errors = {step: 0 for step in STEPS}
+        self.statuses = {step: {} for step in STEPS}
+
+    def record(self, step, elapsed, status):
+        with self._lock:
+            self.samples[step].append(elapsed)
+            self.statuses[step][status] = self.statuses[step].get(status, 0) + 1
+            if not isinstance(status, int) or status >= 400:
+                self.errors[step] += 1
+
+
+class VirtualUser:
+    def __init__(self, base_url, plan, recorder, heartbeats, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.plan = plan
+        self.recorder = recorder
+        self.heartbeats = heartbeats
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def request(self, step, method, path, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+        except requests.RequestException as exc:
+            self.recorder.record(step, time.perf_counter() - start, type(exc).__name__)
+            return None
+        self.recorder.record(step, time.perf_counter() - start, response.status_code)
+        return response
+
+    def run(self):
+        response = self.request('login', 'post', '/api/users/auth/login/', json={
+            'email': self.plan.email, 'password': self.plan.password,
+        })
+        if response is None or response.status_code != 200:
+            return
+        self.session.headers['Authorization'] = f'Bearer {response.json()["token"]}'
+
+        for step in self.plan.iterations:
+            course_id = step['course_id']
+            self.request('catalog', 'get', '/api/courses/courses/')
+            self.request('course_detail', 'get', f'/api/courses/courses/{course_id}/')
+            self.request('enroll', 'post', f'/api/courses/courses/{course_id}/enroll/')
+            self.request('tracking', 'get', f'/api/courses/course-tracking/{course_id}/')
+            module_id = step['module_ids'][0]
+            for beat in range(1, self.heartbeats + 1):
+                self.request(
+                    'video_heartbeat', 'post', f'/api/content/modules/{module_id}/update_video_progress/',
+                    data={'video_progress': round(100 * beat / self.heartbeats), 'video_last_position': beat * 15},
+                )
+            self.request(
+                'submit_assessment', 'post', f'/api/assessment/submissions/{step["submission_id"]}/submit_assessment/',
+                json={'answers': [
+                    {'question_id': question_id, 'selected_options': ['A']} for question_id in step['question_ids']
+                ]},
+            )
+            self.request('add_to_cart', 'post', '/api/store/cart/items/', json={'course_id': step['cart_course_id']})
+            self.request('checkout', 'post', '/api/store/checkout/session/')
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, -(-pct * len(ordered) // 100) - 1))]
+
+
+def run(base_url, plans, heartbeats=5, timeout=30):
+    """Drive every plan concurrently; returns ``{'duration', 'steps': {step: stats}}``"""
+    recorder = Recorder()
+    users = [VirtualUser(base_url, plan, recorder, heartbeats, timeout) for plan in plans]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, len(users))) as pool:
+        for future in [pool.submit(user.run) for user in users]:
+            future.result()
+    duration = time.perf_counter() - start
+
+    steps = {}
+    for step in STEPS:
+        samples = recorder.samples[step]
+        if not samples:
+            continue
+        steps[step] = {
+            'count': len(samples),
+            'errors': recorder.errors[step],
+            'statuses': {str(status): count for status, count in sorted(recorder.statuses[step].items(), key=str)},
+            'rps': round(len(samples) / duration, 2),
+            **{f'p{pct}': round(percentile(samples, pct) * 1000, 2) for pct in PERCENTILES},
+        }
+    return {'duration': round(duration, 2), 'users': len(users), 'steps': steps}
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """``[(step, message)]`` of the steps that regressed against ``baseline``"""
+    regressions = []
+    for step, stats in results['steps'].items():
+        before = baseline.get('steps', {}).get(step)
+        if not before:
+            continue
+        if before['p95'] and stats['p95'] > before['p95'] * (1 + tolerance):
+            regressions.append((step, f'p95 {before["p95"]}ms -> {stats["p95"]}ms'))
+        if before['rps'] and stats['rps'] < before['rps'] * (1 - tolerance):
+            regressions.append((step, f'{before["rps"]} -> {stats["rps"]} req/s'))
+        if stats['errors'] > before['errors']:
+            regressions.append((step, f'errors {before["errors"]} -> {stats["errors"]}'))
+    return regressions
+
+
+def format_table(results, baseline=None):
+    lines = [f'{"step":<18} {"count":>6} {"err":>5} {"req/s":>8} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}']
+    for step, stats in results['steps'].items():
+        line = (
+            f'{step:<18} {stats["count"]:>6} {stats["errors"]:>5} {stats["rps"]:>8} '
+            f'{stats["p50"]:>9} {stats["p95"]:>9} {stats["p99"]:>9}'
+        )
+        before = (baseline or {}).get('steps', {}).get(step)
+        if before and before['p95']:
+            line += f'  p95 {(stats["p95"] - before["p95"]) / before["p95"]:+.0%}'
+        lines.append(line)
+    lines.append(f'{results["users"]} virtual users, {results["duration"]}s')
+    return '\n'.join(lines)
+
+
+def save(results, path):
+    with open(path, 'w') as fh:
+        json.dump(results, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+
+
+def load(path):
+    with open(path) as fh:
+        return json.load(fh)
@@ -0,0 +1,271 @@
+"""
+Per-endpoint request telemetry.
+
+``ProfilingMiddleware`` measures, for every request, the wall time, the
+number of database queries and their total time, and the response size,
+keyed by the resolved URL name and HTTP method. Observations go into
+in-memory histograms: cumulative ones since process start, and rolling ones
+split into time slices of which only the last ``WINDOW_SECONDS`` are kept
+(``Registry.snapshot()``).
+
+``render_prometheus()`` exposes the cumulative histograms in the Prometheus
+text format (served by the admin-only ``/api/metrics/`` endpoint).
+Prometheus expects histogram series to only grow, and derives windows
+itself with ``rate()``. Metrics live in the memory of each worker process;
+scrape every worker or aggregate upstream.
+
+Slow-request sampling: while the metrics have been scraped recently
+(``TRACE_WHEN_SCRAPED_WITHIN``), the SQL of every request is captured and
+the ``SLOW_REQUESTS`` slowest requests seen while tracing are kept with
+their full query trace (``/api/metrics/slow-requests/``). When nobody is scraping, no
+SQL text is collected at all and the per-query cost is one timer call.
+"""
+import bisect
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+# Histogram upper bounds per metric
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# metric name -> (help text, buckets)
+METRICS = {
+    'http_request_duration_seconds': ('Request wall time', LATENCY_BUCKETS),
+    'http_request_db_queries': ('Database queries per request', QUERY_BUCKETS),
+    'http_request_db_duration_seconds': ('Database time per request', LATENCY_BUCKETS),
+    'http_response_size_bytes': ('Response body size', SIZE_BUCKETS),
+}
+METRIC_PREFIX = 'lms_'
+
+
+def _config(name, default):
+    return getattr(settings, 'PROFILING', {}).get(name, default)
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other):
+        for i, value in enumerate(other.counts):
+            self.counts[i] += value
+        self.sum += other.sum
+        self.count += other.count
+
+    def cumulative(self):
+        return list(itertools.accumulate(self.counts))
+
+
+class Registry:
+    """Thread-safe cumulative and rolling histograms plus the slowest request traces"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}  # {(endpoint, method): {metric: Histogram}} since process start
+        self._slices = deque()  # (slice_start, {(endpoint, method): {metric: Histogram}})
+        self._slow = []  # min-heap of (wall_time, seq, trace)
+        self._seq = itertools.count()
+        self.last_scrape = 0.0
+
+    def _slice_seconds(self):
+        return max(1, int(_config('SLICE_SECONDS', 60)))
+
+    def _current_slice(self, now):
+        start = now - now % self._slice_seconds()
+        if not self._slices or self._slices[-1][0] != start:
+            self._slices.append((start, {}))
+            horizon = now - int(_config('WINDOW_SECONDS', 300))
+            while self._slices and self._slices[0][0] + self._slice_seconds() <= horizon:
+                self._slices.popleft()
+        return self._slices[-1][1]
+
+    def observe(self, endpoint, method, values, trace=None, now=None):
+        now = now or time.time()
+        with self._lock:
+            for series in (
+                self._current_slice(now).setdefault((endpoint, method), {}),
+                self._totals.setdefault((endpoint, method), {}),
+            ):
+                for metric, value in values.items():
+                    if value is None:
+                        continue
+                    if metric not in series:
+                        series[metric] = Histogram(METRICS[metric][1])
+                    series[metric].observe(value)
+            if trace is not None:
+                self._keep_slow(values['http_request_duration_seconds'], trace)
+
+    def _keep_slow(self, wall_time, trace):
+        limit = int(_config('SLOW_REQUESTS', 20))
+        entry = (wall_time, next(self._seq), trace)
+        if len(self._slow) < limit:
+            heapq.heappush(self._slow, entry)
+        elif limit and wall_time > self._slow[0][0]:
+            heapq.heapreplace(self._slow, entry)
+
+    def snapshot(self, now=None):
+        """``{(endpoint, method): {metric: Histogram}}`` merged over the window"""
+        now = now or time.time()
+        horizon = now - int(_config('WINDOW_SECONDS', 300))
+        merged = {}
+        with self._lock:
+            for start, slice_series in self._slices:
+                if start + self._slice_seconds() <= horizon:
+                    continue
+                for key, histograms in slice_series.items():
+                    target = merged.setdefault(key, {})
+                    for metric, histogram in histograms.items():
+                        if metric not in target:
+                            target[metric] = Histogram(histogram.buckets)
+                        target[metric].merge(histogram)
+        return merged
+
+    def totals(self):
+        """``{(endpoint, method): {metric: Histogram}}`` since process start"""
+        merged = {}
+        with self._lock:
+            for key, histograms in self._totals.items():
+                target = merged[key] = {}
+                for metric, histogram in histograms.items():
+                    target[metric] = Histogram(histogram.buckets)
+                    target[metric].merge(histogram)
+        return merged
+
+    def slow_requests(self):
+        with self._lock:
+            return [trace for _, _, trace in sorted(self._slow, reverse=True)]
+
+    def tracing(self, now=None):
+        """SQL traces are only collected while someone reads the metrics"""
+        if int(_config('SLOW_REQUESTS', 20)) <= 0:
+            return False
+        window = int(_config('TRACE_WHEN_SCRAPED_WITHIN', 600))
+        return (now or time.time()) - self.last_scrape < window
+
+    def mark_scraped(self):
+        self.last_scrape = time.time()
+
+    def reset(self):
+        with self._lock:
+            self._slices.clear()
+            self._totals.clear()
+            self._slow.clear()
+            self.last_scrape = 0.0
+
+
+registry = Registry()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound):
+    return repr(float(bound)) if isinstance(bound, float) else str(bound)
+
+
+def render_prometheus():
+    """The cumulative histograms in the Prometheus text exposition format"""
+    registry.mark_scraped()
+    totals = registry.totals()
+    lines = []
+    for metric, (help_text, buckets) in METRICS.items():
+        name = METRIC_PREFIX + metric
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for (endpoint, method), histograms in sorted(totals.items()):
+            histogram = histograms.get(metric)
+            if histogram is None:
+                continue
+            labels = f'endpoint="{_escape(endpoint)}",method="{_escape(method)}"'
+            for bound, count in zip(list(buckets) + ['+Inf'], histogram.cumulative()):
+                lines.append(f'{name}_bucket{{{labels},le="{_format_bound(bound)}"}} {count}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+    return '\n'.join(lines) + '\n'
+
+
+class _QueryCollector:
+    """``execute_wrapper`` counting and timing queries (and keeping SQL if tracing)"""
+
+    def __init__(self, capture_sql):
+        self.capture_sql = capture_sql
+        self.count = 0
+        self.duration = 0.0
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if self.capture_sql:
+                self.queries.append({'sql': sql, 'duration': round(elapsed, 6)})
+
+
+def endpoint_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or match.route or 'unnamed'
+
+
+class ProfilingMiddleware:
+    """Records per-endpoint wall time, DB queries/time and response size"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not _config('ENABLED', True):
+            return self.get_response(request)
+
+        collector = _QueryCollector(capture_sql=registry.tracing())
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        wall_time = time.perf_counter() - start
+
+        size = None if response.streaming else len(response.content)
+        endpoint = endpoint_name(request)
+        trace = None
+        if collector.capture_sql:
+            trace = {
+                'endpoint': endpoint,
+                'method': request.method,
+                'path': request.get_full_path(),
+                'status': response.status_code,
+                'duration': round(wall_time, 6),
+                'db_duration': round(collector.duration, 6),
+                'queries': collector.queries,
+            }
+        registry.observe(endpoint, request.method, {
+            'http_request_duration_seconds': wall_time,
+            'http_request_db_queries': collector.count,
+            'http_request_db_duration_seconds': collector.duration,
+            'http_response_size_bytes': size,
+        }, trace=trace)
+        return response
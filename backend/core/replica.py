@@ -0,0 +1,150 @@
+"""
+Read-replica routing for designated read-only endpoints.
+
+Nothing reads from the replica by default. Heavy read-only endpoints
+(dashboards, stats, catalog listings) opt in with ``@read_from_replica``
+(function views, placed below ``@api_view``) or ``ReplicaReadMixin``
+(class-based views; ``replica_actions`` limits it to some viewset
+actions). While such a view runs, ``ReplicaRouter`` sends its reads to the
+replica alias; writes always go to ``default``, and the first write pins
+the rest of the request to ``default`` as well.
+
+Read-your-writes: replication lags, so after a user sends a write request
+(any non-safe method) ``ReplicaPinningMiddleware`` pins them to ``default``
+for ``READ_YOUR_WRITES_SECONDS`` -- by user id in the cache and with a
+cookie for anonymous clients.
+
+The replica is only used when its alias (``DATABASE_REPLICA['ALIAS']``) is
+configured in ``DATABASES`` (``DATABASE_REPLICA_URL``); tests mirror it to
+``default``.
+"""
+import contextvars
+import functools
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+PIN_COOKIE = 'db_pinned'
+PIN_CACHE_KEY = 'db:pinned:{user_id}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# {'replica': bool} of the running replica-enabled view, None elsewhere
+_state = contextvars.ContextVar('replica_state', default=None)
+
+
+def _config(name, default):
+    return getattr(settings, 'DATABASE_REPLICA', {}).get(name, default)
+
+
+def replica_alias():
+    """The replica alias when one is configured, else None"""
+    alias = _config('ALIAS', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+def read_your_writes_seconds():
+    return int(_config('READ_YOUR_WRITES_SECONDS', 5))
+
+
+def is_pinned(request):
+    """Whether the request's client wrote recently and must read from ``default``"""
+    if PIN_COOKIE in request.COOKIES:
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and cache.get(PIN_CACHE_KEY.format(user_id=user.pk)))
+
+
+def pin(request, response):
+    seconds = read_your_writes_seconds()
+    user = getattr(request, 'user', None)
+    if user and user.is_authenticated:
+        cache.set(PIN_CACHE_KEY.format(user_id=user.pk), True, seconds)
+    response.set_cookie(PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+
+
+def _activate(request):
+    """Route reads to the replica from now on; returns a reset token or None"""
+    if replica_alias() is None or is_pinned(request):
+        return None
+    return _state.set({'replica': True})
+
+
+def _deactivate(token):
+    if token is not None:
+        _state.reset(token)
+
+
+@contextmanager
+def replica_reads(request):
+    token = _activate(request)
+    try:
+        yield
+    finally:
+        _deactivate(token)
+
+
+def reading_from_replica():
+    state = _state.get()
+    return bool(state and state['replica'])
+
+
+def read_from_replica(view):
+    """Function-view decorator; put it below ``@api_view`` so the user is authenticated"""
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with replica_reads(request):
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaReadMixin:
+    """Serve safe requests of a DRF view from the replica.
+
+    ``replica_actions`` restricts it to the given viewset actions (all safe
+    requests when None).
+    """
+    replica_actions = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._replica_token = None
+        action = getattr(self, 'action', None)
+        if request.method in SAFE_METHODS and (self.replica_actions is None or action in self.replica_actions):
+            self._replica_token = _activate(request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        _deactivate(getattr(self, '_replica_token', None))
+        self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if reading_from_replica():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # Later reads of this request must see the write
+            state['replica'] = False
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as default
+        return True
+
+
+class ReplicaPinningMiddleware:
+    """Pins clients that sent a write request to ``default`` for a few seconds"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and replica_alias() is not None:
+            pin(request, response)
+        return response
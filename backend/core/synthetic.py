@@ -0,0 +1,580 @@
+"""
+Synthetic dataset generation.
+
+``seed()`` bulk-inserts a batch of related rows -- courses with modules and
+lessons, enrollments, reviews, meetings with participants, articles,
+banners and a course collection, plus the student's activity on them
+(``_seed_activity()``) -- around a fixed set of role users
+(``create_role_users()``). Calling it again with a different ``start``
+appends another batch, which is how the query-budget tests grow the
+dataset from a small to a large scale with the same users and ids.
+
+Rows are written with ``bulk_create``, so model ``save()`` side effects do
+not run; ``refresh_aggregates()`` recomputes the denormalized counters
+afterwards.
+
+``generate()`` (the ``generate_load_data`` management command) builds a
+much larger, production-shaped dataset for benchmarks and load tests.
+"""
+import io
+import itertools
+import random
+import uuid
+import zlib
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+ROLES = ('anonymous', 'student', 'instructor', 'admin')
+
+MODULES_PER_COURSE = 2
+LESSONS_PER_MODULE = 2
+
+
+def create_role_users(prefix='synthetic'):
+    """``{role: user}`` for every role in ``ROLES`` (``None`` for anonymous)"""
+    from users.models import Instructor
+
+    User = get_user_model()
+    student = User.objects.create_user(username=f'{prefix}-student', password='x')
+    instructor = User.objects.create_user(username=f'{prefix}-instructor', password='x')
+    instructor.profile.status = 'Instructor'
+    instructor.profile.save()
+    Instructor.objects.create(profile=instructor.profile)
+    admin = User.objects.create_superuser(f'{prefix}-admin', f'{prefix}-admin@example.com', 'x')
+    return {'anonymous': None, 'student': student, 'instructor': instructor, 'admin': admin}
+
+
+def seed(scale, users, start=0, batch_size=1000):
+    """Add ``scale`` courses (and as many meetings, articles...) to the dataset.
+
+    ``start`` offsets generated names and slugs so batches never collide.
+    Returns ``{model label: [ids]}`` of the created rows.
+    """
+    from articles.models import Article
+    from content.models import Lesson, Module
+    from courses.models import Category, Course, Enrollment, Tag
+    from extras.models import Banner, CourseCollection
+    from meetings.models import Meeting, Participant
+    from reviews.models import CourseReview
+
+    student, teacher = users['student'], users['instructor']
+    numbers = range(start, start + scale)
+    now = timezone.now()
+
+    category, _ = Category.objects.get_or_create(name='Synthetic', defaults={'slug': 'synthetic'})
+    tag, _ = Tag.objects.get_or_create(name='synthetic', defaults={'slug': 'synthetic'})
+
+    courses = Course.objects.bulk_create([
+        Course(
+            title=f'Course {n}', slug=f'course-{n}', description='Description',
+            short_description='Short description', category=category,
+            status='published', is_featured=n % 2 == 0, published_at=now,
+        )
+        for n in numbers
+    ], batch_size=batch_size)
+    Course.instructors.through.objects.bulk_create([
+        Course.instructors.through(course_id=course.pk, instructor_id=teacher.profile.instructor.pk)
+        for course in courses
+    ], batch_size=batch_size)
+    Course.tags.through.objects.bulk_create([
+        Course.tags.through(course_id=course.pk, tag_id=tag.pk) for course in courses
+    ], batch_size=batch_size)
+
+    modules = Module.objects.bulk_create([
+        Module(name=f'Module {course.pk}-{order}', course=course, order=order)
+        for course in courses for order in range(1, MODULES_PER_COURSE + 1)
+    ], batch_size=batch_size)
+    lessons = Lesson.objects.bulk_create([
+        Lesson(
+            title=f'Lesson {module.pk}-{order}', slug=f'lesson-{module.pk}-{order}',
+            module=module, order=order, duration_minutes=10,
+        )
+        for module in modules for order in range(1, LESSONS_PER_MODULE + 1)
+    ], batch_size=batch_size)
+
+    Enrollment.objects.bulk_create([
+        Enrollment(student=student, course=course, status='active') for course in courses
+    ], batch_size=batch_size)
+    reviews = CourseReview.objects.bulk_create([
+        CourseReview(course=course, user=student, rating=5, review_text='Great') for course in courses
+    ], batch_size=batch_size)
+
+    meetings = Meeting.objects.bulk_create([
+        Meeting(
+            title=f'Meeting {n}', description='Description', meeting_type='LIVE',
+            creator=teacher, start_time=now + timedelta(days=1, minutes=n),
+        )
+        for n in numbers
+    ], batch_size=batch_size)
+    Participant.objects.bulk_create([
+        Participant(meeting=meeting, user=student) for meeting in meetings
+    ], batch_size=batch_size)
+
+    articles = Article.objects.bulk_create([
+        Article(
+            title=f'Article {n}', slug=f'article-{n}', content='content', author=teacher,
+            status='published', published_at=now, featured=n % 2 == 0,
+        )
+        for n in numbers
+    ], batch_size=batch_size)
+
+    Banner.objects.bulk_create([
+        Banner(title=f'Banner {n}', banner_type=('main', 'header', 'promo')[n % 3], display_order=n)
+        for n in numbers
+    ], batch_size=batch_size)
+
+    collection, _ = CourseCollection.objects.get_or_create(
+        slug='synthetic', defaults={'name': 'Synthetic collection'}
+    )
+    collection.courses.add(*courses)
+
+    _seed_activity(users, numbers, courses, modules, lessons, reviews, articles, batch_size)
+
+    return {
+        'courses.Course': [course.pk for course in courses],
+        'content.Module': [module.pk for module in modules],
+        'meetings.Meeting': [meeting.pk for meeting in meetings],
+        'articles.Article': [article.pk for article in articles],
+    }
+
+
+def _seed_activity(users, numbers, courses, modules, lessons, reviews, articles, batch_size):
+    """One row per course/article of everything the student and instructor do
+    around them: comments, ratings, bookmarks, assessments with a submission,
+    flashcards, resources, progress, uploads, notifications and orders"""
+    from articles.models import ArticleComment, BookCategory
+    from articles.models_interaction import ArticleRating, Bookmark
+    from assessment.models import (
+        Assessment, AssessmentQuestions, Flashcard, QuestionBank,
+        StudentAnswer, StudentFlashcardProgress, StudentSubmission,
+    )
+    from content.models import LessonResource, ModuleProgress, UploadSession
+    from notifications.models import Notification
+    from reviews.models import Comment, ReviewReply
+    from store.models import Cart, CartItem, Order, OrderItem
+    from store.models_payment import PaymentMethod, Transaction
+
+    student, teacher = users['student'], users['instructor']
+    now = timezone.now()
+    first_lessons = lessons[::MODULES_PER_COURSE * LESSONS_PER_MODULE]
+
+    BookCategory.objects.bulk_create([
+        BookCategory(name=f'Book category {n}') for n in numbers
+    ], batch_size=batch_size)
+    ArticleComment.objects.bulk_create([
+        ArticleComment(article=article, user=student, content='Comment', is_approved=True) for article in articles
+    ], batch_size=batch_size)
+    ArticleRating.objects.bulk_create([
+        ArticleRating(article=article, user=student, rating=4) for article in articles
+    ], batch_size=batch_size)
+    Bookmark.objects.bulk_create([
+        Bookmark(article=article, user=student) for article in articles
+    ], batch_size=batch_size)
+
+    assessments = Assessment.objects.bulk_create([
+        Assessment(
+            title=f'Quiz {course.pk}', type='quiz', status='published',
+            start_date=now, course=course, created_by=teacher,
+        )
+        for course in courses
+    ], batch_size=batch_size)
+    questions = QuestionBank.objects.bulk_create([
+        QuestionBank(
+            question_text='Question', question_type='true_false', correct_answer='true',
+            lesson=lesson, created_by=teacher,
+        )
+        for lesson in first_lessons
+    ], batch_size=batch_size)
+    AssessmentQuestions.objects.bulk_create([
+        AssessmentQuestions(assessment=assessment, question=question)
+        for assessment, question in zip(assessments, questions)
+    ], batch_size=batch_size)
+    submissions = StudentSubmission.objects.bulk_create([
+        StudentSubmission(student=student, assessment=assessment) for assessment in assessments
+    ], batch_size=batch_size)
+    StudentAnswer.objects.bulk_create([
+        StudentAnswer(submission=submission, question=question)
+        for submission, question in zip(submissions, questions)
+    ], batch_size=batch_size)
+    flashcards = Flashcard.objects.bulk_create([
+        Flashcard(front_text='Front', back_text='Back', lesson=lesson, created_by=teacher)
+        for lesson in first_lessons
+    ], batch_size=batch_size)
+    StudentFlashcardProgress.objects.bulk_create([
+        StudentFlashcardProgress(student=student, flashcard=flashcard) for flashcard in flashcards
+    ], batch_size=batch_size)
+
+    LessonResource.objects.bulk_create([
+        LessonResource(title=f'Resource {lesson.pk}', lesson=lesson, url='https://example.com/resource')
+        for lesson in first_lessons
+    ], batch_size=batch_size)
+    ModuleProgress.objects.bulk_create([
+        ModuleProgress(user=student, module=module) for module in modules
+    ], batch_size=batch_size)
+    UploadSession.objects.bulk_create([
+        UploadSession(
+            user=teacher, target='module_video', module=module, filename='video.mp4',
+            size=1024, expires_at=now + timedelta(days=1),
+        )
+        for module in modules[::MODULES_PER_COURSE]
+    ], batch_size=batch_size)
+
+    Notification.objects.bulk_create([
+        Notification(recipient=student, sender=teacher, title=f'Notification {n}', message='Message')
+        for n in numbers
+    ], batch_size=batch_size)
+    Comment.objects.bulk_create([
+        Comment(user=student, course=course, content='Comment') for course in courses
+    ], batch_size=batch_size)
+    ReviewReply.objects.bulk_create([
+        ReviewReply(review=review, user=teacher, reply_text='Thanks') for review in reviews
+    ], batch_size=batch_size)
+
+    cart, _ = Cart.objects.get_or_create(user=student)
+    CartItem.objects.bulk_create([CartItem(cart=cart, course=course) for course in courses], batch_size=batch_size)
+    payment_method, _ = PaymentMethod.objects.get_or_create(
+        user=student, is_default=True, defaults={'billing_name': student.username}
+    )
+    orders = Order.objects.bulk_create([
+        Order(
+            user=student, order_number=f'SYN-{n}', status='completed', subtotal=Decimal('10.00'),
+            total=Decimal('10.00'), billing_email='student@example.com', billing_name='Student',
+            billing_address='Address',
+        )
+        for n in numbers
+    ], batch_size=batch_size)
+    OrderItem.objects.bulk_create([
+        OrderItem(order=order, course=course, price=Decimal('10.00')) for order, course in zip(orders, courses)
+    ], batch_size=batch_size)
+    Transaction.objects.bulk_create([
+        Transaction(
+            user=student, order=order, transaction_type='purchase', amount=Decimal('10.00'),
+            status='completed', payment_method=payment_method,
+        )
+        for order in orders
+    ], batch_size=batch_size)
+
+
+def refresh_aggregates():
+    """Recompute the denormalized counters bypassed by bulk inserts"""
+    from courses.models import Course, Enrollment
+
+    call_command('recompute_course_stats', stdout=io.StringIO())
+    enrollments = (
+        Enrollment.objects.filter(course=OuterRef('pk'))
+        .order_by().values('course').annotate(count=Count('pk')).values('count')
+    )
+    Course.objects.update(
+        total_enrollments=Coalesce(Subquery(enrollments, output_field=IntegerField()), Value(0))
+    )
+    call_command('recompute_popularity', stdout=io.StringIO())
+
+
+# Production-shaped dataset ----------------------------------------------
+#
+# ``generate()`` builds a large dataset for benchmarks and load tests. The
+# shape follows production: a small share of instructors, course popularity
+# skewed towards a few hits, module progress only for enrolled students and
+# mostly-read notifications. Everything derives from one ``random.Random``
+# seed and the ``prefix`` used in usernames and slugs, so the same
+# arguments always produce the same rows and no uniqueness probes are needed.
+
+DEFAULT_COUNTS = {
+    'users': 10000,
+    'courses': 500,
+    'lessons': 20000,
+    'enrollments': 40000,
+    'progress': 200000,
+    'submissions': 20000,
+    'reviews': 10000,
+    'orders': 10000,
+    'meetings': 1000,
+    'articles': 500,
+    'notifications': 1000000,
+}
+
+INSTRUCTOR_SHARE = 0.02
+LESSONS_PER_GENERATED_MODULE = 5
+PARTICIPANTS_PER_MEETING = 20
+QUESTIONS_PER_ASSESSMENT = 5
+# Zipf exponent of course popularity (enrollments of the n-th course ~ 1/n**skew)
+COURSE_POPULARITY_SKEW = 0.8
+
+
+def _bulk(model, rows, batch_size):
+    """Insert an iterable of unsaved instances in batches; returns the count"""
+    rows = iter(rows)
+    total = 0
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return total
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        total += len(batch)
+
+
+def generate(counts=None, seed=0, prefix='load', password='loadtest', batch_size=2000, log=None):
+    """Generate a production-shaped dataset; returns ``{name: rows created}``.
+
+    ``counts`` overrides entries of ``DEFAULT_COUNTS``. ``log`` is called with
+    a progress line after every step.
+    """
+    from django.contrib.auth.hashers import make_password
+
+    from articles.models import Article
+    from assessment.models import Assessment, AssessmentQuestions, QuestionBank, StudentSubmission
+    from content.models import Lesson, Module, ModuleProgress, UserProgress
+    from courses.models import Category, Course, Enrollment
+    from meetings.models import Meeting, Participant
+    from notifications.models import Notification
+    from reviews.models import CourseReview
+    from store.models import Order, OrderItem
+    from users.models import Instructor, Profile
+
+    counts = dict(DEFAULT_COUNTS, **(counts or {}))
+    rng = random.Random(seed)
+    now = timezone.now()
+    log = log or (lambda message: None)
+    created = {}
+
+    def step(name, model, rows):
+        with transaction.atomic():
+            created[name] = _bulk(model, rows, batch_size)
+        log(f'{name}: {created[name]}')
+
+    # Users, profiles and instructors
+    User = get_user_model()
+    password_hash = make_password(password)
+    step('users', User, (
+        User(
+            username=f'{prefix}-user-{n}', email=f'{prefix}-user-{n}@example.com',
+            password=password_hash, first_name='Load', last_name=f'User {n}',
+        )
+        for n in range(counts['users'])
+    ))
+    user_ids = list(
+        User.objects.filter(username__startswith=f'{prefix}-user-').order_by('pk').values_list('pk', flat=True)
+    )
+    instructor_count = max(1, int(len(user_ids) * INSTRUCTOR_SHARE))
+    teacher_ids, student_ids = user_ids[:instructor_count], user_ids[instructor_count:] or user_ids
+    teachers = set(teacher_ids)
+    step('profiles', Profile, (
+        Profile(
+            id=uuid.uuid5(uuid.NAMESPACE_URL, f'{prefix}-user-{index}'), user_id=user_id,
+            name=f'Load User {index}', email=f'{prefix}-user-{index}@example.com',
+            status='Instructor' if user_id in teachers else 'Student',
+        )
+        for index, user_id in enumerate(user_ids)
+    ))
+    step('instructors', Instructor, (
+        Instructor(profile_id=profile_id)
+        for profile_id in Profile.objects.filter(user_id__in=teacher_ids).values_list('pk', flat=True)
+    ))
+    instructor_ids = list(
+        Instructor.objects.filter(profile__user_id__in=teacher_ids).order_by('pk').values_list('pk', flat=True)
+    )
+
+    # Catalogue: categories, courses, modules, lessons
+    categories = Category.objects.bulk_create([
+        Category(name=f'{prefix.title()} category {n}', slug=f'{prefix}-category-{n}') for n in range(10)
+    ])
+    step('courses', Course, (
+        Course(
+            title=f'Course {n}', slug=f'{prefix}-course-{n}', description='Description',
+            short_description='Short description', category=rng.choice(categories),
+            level=rng.choice(('beginner', 'intermediate', 'advanced')),
+            price=Decimal(rng.choice((0, 49, 99, 199, 299))),
+            status='published' if rng.random() < 0.9 else 'draft',
+            is_featured=rng.random() < 0.05, published_at=now - timedelta(days=rng.randint(0, 720)),
+        )
+        for n in range(counts['courses'])
+    ))
+    course_ids = list(
+        Course.objects.filter(slug__startswith=f'{prefix}-course-').order_by('pk').values_list('pk', flat=True)
+    )
+    step('course_instructors', Course.instructors.through, (
+        Course.instructors.through(course_id=course_id, instructor_id=rng.choice(instructor_ids))
+        for course_id in course_ids
+    ))
+
+    modules_per_course = max(1, counts['lessons'] // max(1, len(course_ids)) // LESSONS_PER_GENERATED_MODULE)
+    step('modules', Module, (
+        Module(name=f'Module {course_id}-{order}', course_id=course_id, order=order, status='published')
+        for course_id in course_ids for order in range(1, modules_per_course + 1)
+    ))
+    modules_by_course = {}
+    for module_id, course_id in Module.objects.filter(
+        course_id__in=course_ids
+    ).order_by('course_id', 'order').values_list('pk', 'course_id'):
+        modules_by_course.setdefault(course_id, []).append(module_id)
+    module_ids = [module_id for ids in modules_by_course.values() for module_id in ids]
+    step('lessons', Lesson, (
+        Lesson(
+            title=f'Lesson {module_ids[n % len(module_ids)]}-{n // len(module_ids) + 1}',
+            slug=f'lesson-{n // len(module_ids) + 1}', module_id=module_ids[n % len(module_ids)],
+            order=n // len(module_ids) + 1, duration_minutes=rng.randint(3, 45),
+        )
+        for n in range(counts['lessons'])
+    ) if module_ids else ())
+
+    # Enrollments skewed towards popular courses, with course/module progress
+    popularity = list(itertools.accumulate(
+        1 / (rank + 1) ** COURSE_POPULARITY_SKEW for rank in range(len(course_ids))
+    ))
+    pairs = set()
+    target = min(counts['enrollments'], len(student_ids) * len(course_ids))
+    while len(pairs) < target:
+        pairs.add((rng.choice(student_ids), rng.choices(course_ids, cum_weights=popularity)[0]))
+    enrollments = sorted(pairs)
+    step('enrollments', Enrollment, (
+        Enrollment(
+            student_id=student_id, course_id=course_id,
+            status='completed' if rng.random() < 0.15 else 'active',
+            progress=rng.randint(0, 100),
+        )
+        for student_id, course_id in enrollments
+    ))
+    step('course_progress', UserProgress, (
+        UserProgress(
+            user_id=student_id, course_id=course_id,
+            status=rng.choice(UserProgress.CompletionStatus.values),
+            overall_progress=rng.randint(0, 100), time_spent_minutes=rng.randint(0, 600),
+        )
+        for student_id, course_id in enrollments
+    ))
+
+    def module_progress():
+        # Modules reached per enrollment, topped up until the target is met
+        per_enrollment = counts['progress'] / max(1, len(enrollments))
+        reached = [
+            min(modules_per_course, max(1, round(rng.gauss(per_enrollment, per_enrollment / 2))))
+            for _ in enrollments
+        ]
+        capacity = modules_per_course * len(reached) - sum(reached)
+        deficit = min(counts['progress'] - sum(reached), capacity)
+        index = 0
+        while deficit > 0:
+            if reached[index] < modules_per_course:
+                reached[index] += 1
+                deficit -= 1
+            index = (index + 1) % len(reached)
+
+        remaining = counts['progress']
+        for (student_id, course_id), count in zip(enrollments, reached):
+            for module_id in modules_by_course.get(course_id, [])[:count]:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+                completed = rng.random() < 0.6
+                yield ModuleProgress(
+                    user_id=student_id, module_id=module_id,
+                    status='completed' if completed else 'in_progress', is_completed=completed,
+                    video_watched=completed, video_progress=100 if completed else rng.randint(0, 99),
+                )
+    step('module_progress', ModuleProgress, module_progress())
+
+    # Assessments and submissions
+    step('assessments', Assessment, (
+        Assessment(
+            title=f'Quiz {course_id}', type='quiz', status='published', start_date=now - timedelta(days=30),
+            course_id=course_id, created_by_id=rng.choice(teacher_ids),
+        )
+        for course_id in course_ids
+    ))
+    assessment_by_course = dict(
+        Assessment.objects.filter(course_id__in=course_ids).values_list('course_id', 'pk')
+    )
+    questions = [
+        (assessment_id, QuestionBank(
+            question_text=f'Question {n}', question_type='mcq', options=['A', 'B', 'C', 'D'],
+            correct_answer=rng.choice('ABCD'), created_by_id=rng.choice(teacher_ids),
+        ))
+        for assessment_id in assessment_by_course.values() for n in range(QUESTIONS_PER_ASSESSMENT)
+    ]
+    step('questions', QuestionBank, (question for _, question in questions))
+    step('assessment_questions', AssessmentQuestions, (
+        AssessmentQuestions(assessment_id=assessment_id, question_id=question.pk, order=index)
+        for index, (assessment_id, question) in enumerate(questions)
+    ))
+    step('submissions', StudentSubmission, (
+        StudentSubmission(
+            student_id=student_id, assessment_id=assessment_by_course[course_id],
+            status=rng.choice(('submitted', 'graded')), submitted_at=now - timedelta(days=rng.randint(0, 60)),
+            total_score=Decimal(rng.randint(0, 100)), percentage=Decimal(rng.randint(0, 100)),
+            is_passed=rng.random() < 0.7,
+        )
+        for student_id, course_id in rng.sample(enrollments, min(counts['submissions'], len(enrollments)))
+    ))
+
+    # Reviews and orders (always for enrollments, like in production)
+    step('reviews', CourseReview, (
+        CourseReview(
+            course_id=course_id, user_id=student_id, is_approved=True,
+            rating=rng.choices((1, 2, 3, 4, 5), weights=(1, 1, 3, 8, 12))[0], review_text='Review',
+        )
+        for student_id, course_id in rng.sample(enrollments, min(counts['reviews'], len(enrollments)))
+    ))
+    prices = dict(Course.objects.filter(pk__in=course_ids).values_list('pk', 'price'))
+    ordered = rng.sample(enrollments, min(counts['orders'], len(enrollments)))
+    order_numbers = [f'LD{zlib.crc32(prefix.encode()):08X}{n:010d}' for n in range(len(ordered))]
+    step('orders', Order, (
+        Order(
+            user_id=student_id, order_number=order_numbers[n], status='completed',
+            payment_method='credit_card', subtotal=prices[course_id], total=prices[course_id],
+            billing_email=f'{prefix}-user@example.com', billing_name='Load User', billing_address='Address',
+        )
+        for n, (student_id, course_id) in enumerate(ordered)
+    ))
+    order_ids = Order.objects.filter(
+        order_number__in=order_numbers
+    ).order_by('order_number').values_list('pk', flat=True)
+    step('order_items', OrderItem, (
+        OrderItem(order_id=order_id, course_id=course_id, price=prices[course_id])
+        for order_id, (_, course_id) in zip(order_ids, ordered)
+    ))
+
+    # Meetings with participants
+    step('meetings', Meeting, (
+        Meeting(
+            title=f'Meeting {n}', description='Description', meeting_type=rng.choice(('ZOOM', 'NORMAL', 'LIVE')),
+            creator_id=rng.choice(teacher_ids), start_time=now + timedelta(hours=rng.randint(-720, 720)),
+        )
+        for n in range(counts['meetings'])
+    ))
+    meeting_ids = Meeting.objects.filter(
+        creator_id__in=teacher_ids
+    ).order_by('pk').values_list('pk', flat=True)
+    step('participants', Participant, (
+        Participant(meeting_id=meeting_id, user_id=user_id)
+        for meeting_id in meeting_ids
+        for user_id in rng.sample(student_ids, min(PARTICIPANTS_PER_MEETING, len(student_ids)))
+    ))
+
+    step('articles', Article, (
+        Article(
+            title=f'Article {n}', slug=f'{prefix}-article-{n}', content='content',
+            author_id=rng.choice(teacher_ids), status='published',
+            published_at=now - timedelta(days=rng.randint(0, 720)), featured=rng.random() < 0.05,
+        )
+        for n in range(counts['articles'])
+    ))
+
+    step('notifications', Notification, (
+        Notification(
+            recipient_id=rng.choice(user_ids), title='Notification', message='Message',
+            notification_type=rng.choice(('course_enrollment', 'course_update', 'meeting_reminder', 'general')),
+            is_read=rng.random() < 0.7,
+        )
+        for _ in range(counts['notifications'])
+    ))
+
+    refresh_aggregates()
+    log('aggregates refreshed')
+    return created
@@ -0,0 +1,93 @@
+"""
+Admin changelists of users, courses, notifications and meetings must render
+with the same number of queries whatever the number of rows, and their
+count columns must be sortable.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from courses.models import Category, Course, Enrollment, Tag
+from meetings.models import Meeting, Notification as MeetingNotification, Participant
+from notifications.models import Notification, NotificationLog
+from users.models import Instructor, Organization, Student
+
+User = get_user_model()
+
+CHANGELISTS = [
+    'auth_user', 'users_profile', 'users_organization', 'users_instructor', 'users_student',
+    'courses_category', 'courses_tag', 'courses_course', 'courses_enrollment',
+    'notifications_notification', 'notifications_notificationlog',
+    'meetings_meeting', 'meetings_participant', 'meetings_notification',
+]
+
+
+class AdminChangelistQueryTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('root', 'root@example.com', 'x')
+        self.client.force_login(self.admin)
+        self.rows = 0
+
+    def _add_rows(self, count):
+        """``count`` more rows of every changelisted model, each with related rows to count"""
+        now = timezone.now()
+        for _ in range(count):
+            n = self.rows = self.rows + 1
+            organization = Organization.objects.create(location=f'City {n}')
+            teacher = User.objects.create_user(f'teacher{n}', password='x')
+            teacher.profile.status = 'Instructor'
+            teacher.profile.save()
+            instructor = Instructor.objects.create(profile=teacher.profile, organization=organization)
+            student = User.objects.create_user(f'student{n}', password='x')
+            Student.objects.create(profile=student.profile)
+
+            category = Category.objects.create(name=f'Category {n}', slug=f'category-{n}')
+            tag = Tag.objects.create(name=f'Tag {n}')
+            course = Course.objects.create(title=f'Course {n}', description='d', category=category)
+            course.instructors.add(instructor)
+            course.tags.add(tag)
+            Enrollment.objects.create(course=course, student=student, status='active')
+
+            notification = Notification.objects.create(recipient=student, sender=teacher, title='Hi', message='m')
+            NotificationLog.objects.create(notification=notification, delivery_method='email', status='delivered')
+
+            meeting = Meeting.objects.create(
+                title=f'Meeting {n}', description='d', meeting_type='NORMAL',
+                start_time=now + timedelta(days=1), creator=teacher,
+            )
+            Participant.objects.create(meeting=meeting, user=student)
+            reminder = MeetingNotification.objects.create(meeting=meeting, message='m', scheduled_time=now)
+            reminder.recipients.add(student, teacher)
+
+    def _queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200, url)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self._add_rows(2)
+        small = {name: self._queries(reverse(f'admin:{name}_changelist')) for name in CHANGELISTS}
+        self._add_rows(8)
+        large = {name: self._queries(reverse(f'admin:{name}_changelist')) for name in CHANGELISTS}
+        self.assertEqual(large, small)
+
+    def test_count_columns_sort_by_their_annotation(self):
+        self._add_rows(2)
+        course = Course.objects.get(title='Course 2')
+        for n in range(3):
+            Enrollment.objects.create(course=course, student=User.objects.create_user(f'extra{n}', password='x'))
+
+        # enrollment_count_display is the 8th column of CourseAdmin.list_display
+        response = self.client.get(reverse('admin:courses_course_changelist') + '?o=-8', HTTP_HOST='localhost')
+        courses = list(response.context['cl'].result_list)
+        self.assertEqual(courses[0], course)
+        self.assertEqual(courses[0].enrollment_count, 4)
+
+        response = self.client.get(reverse('admin:users_instructor_changelist') + '?o=-5', HTTP_HOST='localhost')
+        self.assertEqual([i.students_total for i in response.context['cl'].result_list], [4, 1])
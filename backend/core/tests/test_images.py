@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from PIL import Image
+
+from core import images
+from courses.models import Course
+from courses.serializers import CourseBasicSerializer
+
+
+def image_file(name, size=(2400, 1200), image_format='JPEG', mode='RGB'):
+    buffer = BytesIO()
+    Image.new(mode, size, 'red').save(buffer, image_format)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, IMAGE_DERIVATIVES={'ASYNC': False})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        images._ready.clear()
+        images._missing.clear()
+
+    def _course(self, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Course.objects.create(title='Course', description='d', image=image)
+
+    def _size(self, name):
+        with Image.open(os.path.join(self.media_root, name)) as image:
+            return image.size
+
+    def test_upload_generates_variants_next_to_the_original(self):
+        course = self._course(image_file('cover.jpg'))
+        root = os.path.splitext(course.image.name)[0]
+
+        self.assertEqual(self._size(f'{root}__thumb.webp'), (200, 100))
+        self.assertEqual(self._size(f'{root}__card.jpg'), (640, 320))
+        self.assertEqual(self._size(f'{root}__hero.webp'), (1920, 960))
+
+    def test_serializer_exposes_variant_urls_once_generated(self):
+        course = Course.objects.create(title='Course', description='d', image=image_file('cover.png', image_format='PNG', mode='RGBA'))
+        request = RequestFactory().get('/', HTTP_HOST='localhost')
+        self.assertIsNone(CourseBasicSerializer(course, context={'request': request}).data['image_variants'])
+
+        images.generate(course.image.name, images.IMAGE_FIELDS['courses.Course']['image'])
+
+        variants = CourseBasicSerializer(course, context={'request': request}).data['image_variants']
+        self.assertEqual(set(variants), {'thumb', 'card', 'hero'})
+        self.assertTrue(variants['card']['webp'].startswith('http://localhost/'))
+        self.assertTrue(variants['card']['fallback'].endswith('__card.png'))
+
+    def test_missing_variants_are_not_rechecked_on_every_call(self):
+        variants = images.IMAGE_FIELDS['courses.Course']['image']
+
+        def marker_checks():
+            return sum(1 for call in exists.call_args_list if call.args[0].endswith('__hero.webp'))
+
+        with mock.patch.object(images.default_storage, 'exists', wraps=images.default_storage.exists) as exists:
+            # the save signal checks once, later reads use the remembered miss
+            course = Course.objects.create(title='Course', description='d', image=image_file('cover.jpg'))
+            self.assertFalse(images.is_ready(course.image.name, variants))
+            self.assertFalse(images.is_ready(course.image.name, variants))
+            self.assertEqual(marker_checks(), 1)
+
+            with mock.patch.object(images.time, 'monotonic', return_value=images.time.monotonic() + 61):
+                self.assertFalse(images.is_ready(course.image.name, variants))
+            self.assertEqual(marker_checks(), 2)
+
+        images.generate(course.image.name, variants)
+        self.assertTrue(images.is_ready(course.image.name, variants))
+
+    def test_small_images_are_not_upscaled(self):
+        course = self._course(image_file('small.jpg', size=(120, 80)))
+        root = os.path.splitext(course.image.name)[0]
+        self.assertEqual(self._size(f'{root}__hero.webp'), (120, 80))
+
+    def test_backfill_command_skips_images_with_variants(self):
+        Course.objects.create(title='Course', description='d', image=image_file('cover.jpg'))
+
+        out = StringIO()
+        call_command('generate_image_derivatives', '--model', 'courses.Course', stdout=out)
+        self.assertIn('courses.Course.image: 1 generated, 0 up to date, 0 failed', out.getvalue())
+
+        out = StringIO()
+        call_command('generate_image_derivatives', '--model', 'courses.Course', stdout=out)
+        self.assertIn('courses.Course.image: 0 generated, 1 up to date, 0 failed', out.getvalue())
@@ -0,0 +1,46 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from core import loadtest
+
+
+class LoadTestStatsTests(SimpleTestCase):
+    def test_nearest_rank_percentiles(self):
+        values = list(range(1, 101))
+        self.assertEqual(loadtest.percentile(values, 50), 50)
+        self.assertEqual(loadtest.percentile(values, 95), 95)
+        self.assertEqual(loadtest.percentile(values, 99), 99)
+        self.assertEqual(loadtest.percentile([7], 99), 7)
+        self.assertIsNone(loadtest.percentile([], 50))
+
+    def test_compare_flags_latency_throughput_and_error_regressions(self):
+        def results(p95, rps, errors=0):
+            return {'steps': {'enroll': {'p95': p95, 'rps': rps, 'errors': errors}}}
+
+        baseline = results(100, 50)
+        self.assertEqual(loadtest.compare(results(115, 45), baseline), [])
+        self.assertEqual(
+            [step for step, _ in loadtest.compare(results(130, 30, errors=2), baseline)],
+            ['enroll', 'enroll', 'enroll'],
+        )
+
+
+class LoadTestJourneyTests(LiveServerTestCase):
+    def test_journey_runs_against_live_server_without_errors(self):
+        call_command(
+            'generate_load_data', '--users', '20', '--courses', '6', '--lessons', '60', '--enrollments', '10',
+            '--progress', '10', '--submissions', '5', '--reviews', '5', '--orders', '2', '--meetings', '1',
+            '--articles', '1', '--notifications', '10', stdout=StringIO(),
+        )
+        plans = loadtest.prepare_plans(users=1, iterations=2)
+        self.assertEqual(len(plans), 1)
+
+        results = loadtest.run(self.live_server_url, plans, heartbeats=2)
+
+        self.assertEqual(set(results['steps']), set(loadtest.STEPS))
+        for step, stats in results['steps'].items():
+            self.assertEqual(stats['errors'], 0, f'{step}: {stats["statuses"]}')
+        self.assertEqual(results['steps']['video_heartbeat']['count'], 4)
+        self.assertLessEqual(results['steps']['enroll']['p50'], results['steps']['enroll']['p99'])
@@ -0,0 +1,64 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import profiling
+
+User = get_user_model()
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        profiling.registry.reset()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+
+    def test_requests_are_aggregated_per_endpoint(self):
+        self.client.get(reverse('home'))
+        self.client.get(reverse('home'))
+
+        histograms = profiling.registry.snapshot()[('home', 'GET')]
+        self.assertEqual(histograms['http_request_duration_seconds'].count, 2)
+        self.assertGreater(histograms['http_request_db_queries'].sum, 0)
+        self.assertGreater(histograms['http_response_size_bytes'].sum, 0)
+
+    def test_metrics_endpoint_is_admin_only_prometheus_text(self):
+        self.client.get(reverse('home'))
+        self.assertIn(self.client.get(reverse('metrics')).status_code, (401, 403))
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('# TYPE lms_http_request_duration_seconds histogram', body)
+        self.assertIn('lms_http_request_db_queries_count{endpoint="home",method="GET"} 1', body)
+        self.assertIn('le="+Inf"', body)
+
+    def test_exported_histograms_do_not_drop_when_the_window_rolls(self):
+        start = time.time()
+        profiling.registry.observe('home', 'GET', {'http_request_db_queries': 3}, now=start - 3600)
+        profiling.registry.observe('home', 'GET', {'http_request_db_queries': 1}, now=start)
+
+        self.assertEqual(profiling.registry.snapshot(start)[('home', 'GET')]['http_request_db_queries'].count, 1)
+        body = profiling.render_prometheus()
+        self.assertIn('lms_http_request_db_queries_count{endpoint="home",method="GET"} 2', body)
+        self.assertIn('lms_http_request_db_queries_sum{endpoint="home",method="GET"} 4', body)
+
+    def test_sql_traces_only_captured_after_a_scrape(self):
+        self.client.get(reverse('home'))
+        self.assertEqual(profiling.registry.slow_requests(), [])
+
+        self.client.force_authenticate(self.admin)
+        self.client.get(reverse('metrics'))
+        cache.clear()
+        self.client.get(reverse('home'), {'sections': 'stats'})
+        traces = self.client.get(reverse('metrics-slow-requests')).data['results']
+        home_trace = next(trace for trace in traces if trace['endpoint'] == 'home')
+        self.assertTrue(home_trace['queries'])
+        self.assertIn('sql', home_trace['queries'][0])
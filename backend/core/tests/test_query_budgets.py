@@ -0,0 +1,299 @@
+"""
+Query budgets for every GET API route.
+
+The same synthetic dataset (``core.synthetic``) is seeded at a small and a
+large scale and every GET route under ``api/`` is requested as each role.
+The test fails when
+
+* an endpoint answers with a server error, or with another status than the
+  one recorded for the role under ``statuses`` in ``query_budgets.json``
+  (so budgets never silently measure an error path);
+* an endpoint runs more queries than its budget;
+* an endpoint's query count grows with the data size (an N+1) and it is not
+  listed under ``known_n_plus_one``;
+* a route has no budget yet;
+* a 200 response was counted at no queries, or at the whole query log
+  (it was not measured), and the route is not listed in ``QUERYLESS_ROUTES``;
+* a route cannot be requested with the seeded data and is not listed in
+  ``UNSUPPORTED_ROUTES``.
+
+Known N+1 endpoints are budgeted at their large-scale count so they cannot
+get worse; fixing one means removing it from the list. After an intended
+change, regenerate the file with::
+
+    UPDATE_QUERY_BUDGETS=1 python manage.py test core.tests.test_query_budgets
+"""
+import json
+import os
+import re
+from pathlib import Path
+
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.db import connection, reset_queries, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import Resolver404, get_resolver, resolve
+from django.urls.resolvers import URLResolver
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework.test import APIClient
+
+from core import synthetic
+
+BUDGET_FILE = Path(__file__).with_name('query_budgets.json')
+
+SMALL_SCALE = 5
+LARGE_SCALE = 50
+
+API_PREFIX = 'api/'
+METHOD = 'get'
+
+# Query strings of routes that reject a bare GET
+QUERY_PARAMS = {
+    'api/articles/search/': {'q': 'Article'},
+    'api/auth/check-email/': {'email': 'synthetic-student@example.com'},
+    'api/users/auth/check-email/': {'email': 'synthetic-student@example.com'},
+    'api/extras/banners/by_type/': {'type': 'main'},
+    'api/meetings/search/': {'q': 'Meeting'},
+}
+
+# Models of detail routes whose view only builds its queryset per request
+ROUTE_MODELS = {
+    'api/notifications/<pk>/': 'notifications.Notification',
+}
+
+# Routes the test cannot request, and why
+UNSUPPORTED_ROUTES = {
+    'api/content/bunny/video/<video_id>/': 'fetches the video from the Bunny CDN API',
+}
+
+# Routes that answer without reading the database, and why
+QUERYLESS_ROUTES = {
+    'api/content/bunny/embed/<video_id>/': 'builds the embed URL from settings',
+    'api/content/bunny/private-embed/<video_id>/': 'signs the embed URL from settings',
+    'api/content/bunny/private/<video_id>/': 'signs the video URL from settings',
+    'api/metrics/': 'renders the in-process profiling window',
+    'api/metrics/slow-requests/': 'renders the in-process profiling window',
+    'api/store/payment/moyasar/callback/': 'echoes the payment query parameters',
+    'api/users/auth/verify-email/confirm/<uidb64>/<token>/': 'echoes the link for the frontend to POST',
+}
+
+
+def _template(pattern):
+    """``<name>`` placeholder template of a route or router regex, or None"""
+    text = str(pattern).lstrip('^').rstrip('$')
+    text = re.sub(r'\(\?P<(\w+)>[^)]*\)', r'<\1>', text)
+    text = re.sub(r'<\w+:(\w+)>', r'<\1>', text)
+    if re.search(r'[\\()\[\]?*+|]', text):
+        return None
+    return text
+
+
+def api_routes():
+    """``[(template, callback)]`` of every API route answering GET"""
+    routes = []
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            part = _template(pattern.pattern)
+            if part is None:
+                continue
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns, prefix + part)
+            elif (prefix + part).startswith(API_PREFIX) and _answers_get(pattern.callback):
+                routes.append((prefix + part, pattern.callback))
+
+    walk(get_resolver().url_patterns, '')
+    return sorted(set(routes), key=lambda route: route[0])
+
+
+def _answers_get(callback):
+    actions = getattr(callback, 'actions', None)
+    if actions is not None:
+        return METHOD in actions
+    cls = getattr(callback, 'cls', None) or getattr(callback, 'view_class', None)
+    if cls is not None:
+        return hasattr(cls, METHOD)
+    return True
+
+
+def _is_api_root(callback):
+    """Whether ``callback`` is a router's browsable API root, which only lists URLs"""
+    return getattr(getattr(callback, 'cls', None), '__name__', None) == 'APIRootView'
+
+
+def _view_model(template, callback):
+    if template in ROUTE_MODELS:
+        return apps.get_model(ROUTE_MODELS[template])
+    cls = getattr(callback, 'cls', None)
+    queryset = getattr(cls, 'queryset', None)
+    if queryset is not None:
+        return queryset.model
+    meta = getattr(getattr(cls, 'serializer_class', None), 'Meta', None)
+    return getattr(meta, 'model', None)
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = synthetic.create_role_users()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.raise_request_exception = False
+
+    def _kwarg_values(self):
+        from articles.models import Article
+        from content.models import Lesson, Module
+        from courses.models import Course
+        from meetings.models import Meeting
+        from reviews.models import CourseReview
+
+        def first(model):
+            return model.objects.order_by('pk').values_list('pk', flat=True).first()
+
+        student = self.users['student']
+        return {
+            'course_id': first(Course),
+            'meeting_id': first(Meeting),
+            'module_id': first(Module),
+            'lesson_id': first(Lesson),
+            'article_pk': first(Article),
+            'review_id': first(CourseReview),
+            'user_id': student.pk,
+            'profile_id': student.profile.pk,
+            'video_id': 'synthetic-video',
+            'uidb64': urlsafe_base64_encode(force_bytes(student.pk)),
+            'token': default_token_generator.make_token(student),
+        }
+
+    def _url(self, template, callback, values):
+        def value(match):
+            name = match.group(1)
+            if name in values:
+                return str(values[name])
+            model = _view_model(template, callback)
+            if model is None:
+                raise LookupError(name)
+            obj = model.objects.order_by('pk').first()
+            if obj is None:
+                raise LookupError(name)
+            if name in ('pk', 'id'):
+                return str(obj.pk)
+            if name == 'slug' and getattr(obj, 'slug', None):
+                return obj.slug
+            raise LookupError(name)
+
+        try:
+            url = '/' + re.sub(r'<(\w+)>', value, template)
+            resolve(url)
+        except (LookupError, Resolver404):
+            return None
+        if template in QUERY_PARAMS:
+            url += '?' + urlencode(QUERY_PARAMS[template])
+        return url
+
+    def _request(self, url, user):
+        """(status code, query count) of a GET as ``user``"""
+        cache.clear()
+        if user is not None:
+            # As authentication would: a fresh instance, nothing related cached
+            user = type(user).objects.get(pk=user.pk)
+        # CaptureQueriesContext diffs the length of queries_log, a deque capped
+        # at queries_limit: once full, every later capture would count 0
+        reset_queries()
+        self.client.force_authenticate(user)
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            # GET handlers with side effects must not skew later measurements
+            transaction.set_rollback(True)
+        return response.status_code, len(queries)
+
+    def _measure(self, routes):
+        """``({template: {role: queries}}, {template: {role: status}}, [unbuildable templates])``"""
+        values = self._kwarg_values()
+        counts, statuses, unbuildable = {}, {}, []
+        for template, callback in routes:
+            if template in UNSUPPORTED_ROUTES:
+                continue
+            url = self._url(template, callback, values)
+            if url is None:
+                unbuildable.append(template)
+                continue
+            counts[template], statuses[template] = {}, {}
+            for role, user in self.users.items():
+                statuses[template][role], counts[template][role] = self._request(url, user)
+        return counts, statuses, unbuildable
+
+    def test_query_counts_stay_within_budget_and_do_not_grow(self):
+        routes = api_routes()
+        synthetic.seed(SMALL_SCALE, self.users)
+        synthetic.refresh_aggregates()
+        small, small_statuses, _unbuildable = self._measure(routes)
+
+        synthetic.seed(LARGE_SCALE - SMALL_SCALE, self.users, start=SMALL_SCALE)
+        synthetic.refresh_aggregates()
+        large, statuses, unbuildable = self._measure(routes)
+
+        problems = [f'{template}: cannot build a URL from the seeded data' for template in unbuildable]
+        problems += [
+            f'{template}: listed in {name} but no longer routed'
+            for name, listed in (('UNSUPPORTED_ROUTES', UNSUPPORTED_ROUTES), ('QUERYLESS_ROUTES', QUERYLESS_ROUTES))
+            for template in sorted(set(listed) - {template for template, _callback in routes})
+        ]
+        server_errors = {
+            (template, role, code)
+            for measured in (small_statuses, statuses)
+            for template, codes in measured.items() for role, code in codes.items() if code >= 500
+        }
+        problems += [f'{template} as {role}: server error {code}' for template, role, code in sorted(server_errors)]
+        # A 200 reads something; a count of 0 (or of the whole log) means it was not measured
+        queryless = set(QUERYLESS_ROUTES) | {template for template, callback in routes if _is_api_root(callback)}
+        unmeasured = {
+            (template, role, queries)
+            for measured, codes in ((small, small_statuses), (large, statuses))
+            for template, counts in measured.items() for role, queries in counts.items()
+            if codes[template][role] == 200 and template not in queryless
+            and not 0 < queries < connection.queries_limit
+        }
+        problems += [f'{template} as {role}: 200 with {queries} queries counted' for template, role, queries in sorted(unmeasured)]
+
+        growing = sorted(
+            template for template in large
+            if any(large[template][role] > small.get(template, {}).get(role, 0) for role in large[template])
+        )
+
+        if os.environ.get('UPDATE_QUERY_BUDGETS'):
+            self.assertFalse(problems, '\n' + '\n'.join(problems))
+            BUDGET_FILE.write_text(json.dumps(
+                {'budgets': large, 'known_n_plus_one': growing, 'statuses': statuses}, indent=2, sort_keys=True
+            ) + '\n')
+            return
+
+        checked_in = json.loads(BUDGET_FILE.read_text())
+        budgets, known = checked_in['budgets'], set(checked_in['known_n_plus_one'])
+        expected_statuses = checked_in['statuses']
+        for template, counts in large.items():
+            if template not in budgets:
+                problems.append(f'{template}: no budget (regenerate {BUDGET_FILE.name})')
+                continue
+            for role, code in statuses[template].items():
+                expected = expected_statuses.get(template, {}).get(role)
+                if code != expected:
+                    problems.append(f'{template} as {role}: status {code}, expected {expected}')
+            for role, count in counts.items():
+                budget = budgets[template].get(role)
+                if budget is not None and count > budget:
+                    problems.append(f'{template} as {role}: {count} queries, budget {budget}')
+        for template in growing:
+            if template not in known:
+                counts = ', '.join(
+                    f'{role} {small[template][role]}->{large[template][role]}' for role in large[template]
+                )
+                problems.append(f'{template}: query count grows with data size ({counts})')
+        self.assertFalse(problems, '\n' + '\n'.join(problems))
@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import replica
+from courses.models import Course
+
+User = get_user_model()
+
+
+def replica_reads_seen(test):
+    """Run ``test`` and return the aliases ``ReplicaRouter.db_for_read`` returned.
+
+    The replica alias is pointed at ``default`` so queries still work; a
+    replica read shows up as ``'default'``, a normal one as ``None``.
+    """
+    seen = []
+    original = replica.ReplicaRouter.db_for_read
+
+    def recording(self, model, **hints):
+        seen.append(original(self, model, **hints))
+        return seen[-1]
+
+    with mock.patch.object(replica, 'replica_alias', return_value='default'), \
+            mock.patch.object(replica.ReplicaRouter, 'db_for_read', recording):
+        test()
+    return seen
+
+
+class ReplicaRouterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = replica.ReplicaRouter()
+        self.request = RequestFactory().get('/')
+        self.request.user = User.objects.create_user('reader', password='x')
+
+    def test_no_replica_configured_reads_default(self):
+        with mock.patch.object(replica, 'replica_alias', return_value=None), replica.replica_reads(self.request):
+            self.assertIsNone(self.router.db_for_read(Course))
+
+    def test_reads_go_to_replica_only_inside_a_replica_view(self):
+        with mock.patch.object(replica, 'replica_alias', return_value='replica'):
+            self.assertIsNone(self.router.db_for_read(Course))
+            with replica.replica_reads(self.request):
+                self.assertEqual(self.router.db_for_read(Course), 'replica')
+                # A write pins the rest of the request to default
+                self.assertEqual(self.router.db_for_write(Course), 'default')
+                self.assertIsNone(self.router.db_for_read(Course))
+            self.assertIsNone(self.router.db_for_read(Course))
+
+    def test_pinned_clients_read_default(self):
+        with mock.patch.object(replica, 'replica_alias', return_value='replica'):
+            cache.set(replica.PIN_CACHE_KEY.format(user_id=self.request.user.pk), True)
+            with replica.replica_reads(self.request):
+                self.assertIsNone(self.router.db_for_read(Course))
+
+            anonymous = RequestFactory().get('/', HTTP_COOKIE=f'{replica.PIN_COOKIE}=1')
+            with replica.replica_reads(anonymous):
+                self.assertIsNone(self.router.db_for_read(Course))
+
+
+@override_settings(DATABASE_REPLICA={'ALIAS': 'replica', 'READ_YOUR_WRITES_SECONDS': 5})
+class ReplicaEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user('student', email='student@example.com', password='x')
+        self.client.force_authenticate(self.user)
+
+    def test_designated_endpoints_read_from_replica(self):
+        seen = replica_reads_seen(lambda: self.client.get(reverse('courses_api:general_stats')))
+        self.assertIn('default', seen)
+
+        seen = replica_reads_seen(lambda: self.client.get(reverse('courses_api:course-list')))
+        self.assertIn('default', seen)
+
+    def test_other_endpoints_read_default(self):
+        course = Course.objects.create(title='Course', description='d', status='published')
+        seen = replica_reads_seen(lambda: self.client.get(reverse('courses_api:course-detail', args=[course.pk])))
+        self.assertNotIn('default', seen)
+
+    def test_write_request_pins_client_to_default(self):
+        def write_then_read():
+            response = self.client.post('/api/store/cart/items/', {})
+            self.assertIn(replica.PIN_COOKIE, response.cookies)
+            self.client.cookies.clear()  # the cache pin alone must be enough
+            self.client.get(reverse('courses_api:general_stats'))
+
+        seen = replica_reads_seen(write_then_read)
+        self.assertNotIn('default', seen)
+        self.assertTrue(cache.get(replica.PIN_CACHE_KEY.format(user_id=self.user.pk)))
@@ -22,6 +22,7 @@ from rest_framework_simplejwt.views import TokenRefreshView
 
 # Import our custom admin site
 from extras.admin import custom_admin_site
+from extras.views import HomeView
 from . import views
 
 if settings.DEBUG:
@@ -45,6 +46,9 @@ urlpatterns = [
     # path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
     
     # API Routes
+    path('api/home/', HomeView.as_view(), name='home'),  # Homepage aggregate
+    path('api/metrics/', views.metrics, name='metrics'),  # Prometheus scrape target (admin only)
+    path('api/metrics/slow-requests/', views.slow_requests, name='metrics-slow-requests'),
     path('api/assessment/', include('assessment.urls')),
     path('api/auth/', include('authentication.urls')),
     path('api/users/', include('users.urls')),
@@ -1,6 +1,9 @@
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
 from django.db.models import Count, Avg, Sum, Q
 from django.utils import timezone
 from datetime import timedelta
@@ -13,6 +16,8 @@ from store.models import Order
 from store.models_payment import Transaction
 from reviews.models import CourseReview
 
+from . import profiling
+
 
 @login_required
 def student_dashboard_stats(request):
@@ -382,3 +387,21 @@ def recent_announcements(request):
         return JsonResponse(announcements_data, safe=False)
     
     return JsonResponse([], safe=False)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    """Rolling per-endpoint telemetry in the Prometheus text format"""
+    return HttpResponse(
+        profiling.render_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def slow_requests(request):
+    """Slowest sampled requests with their full SQL traces"""
+    profiling.registry.mark_scraped()
+    return Response({'results': profiling.registry.slow_requests()})
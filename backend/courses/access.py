@@ -0,0 +1,115 @@
+"""
+Course access resolution (enrolled student, course instructor or admin).
+
+A user's access map -- admin flag plus the ids of the courses they are
+enrolled in and instruct -- is computed with three small queries, kept in
+the shared cache for ``ACCESS_CACHE_TIMEOUT`` seconds and memoized on the
+request through ``ViewerContext``. The receivers at the bottom of
+``courses.models`` drop a user's entry when their enrollments, instructed
+courses, profile status or staff flag change.
+
+Views either use ``HasCourseAccess`` as a DRF permission or call
+``get_course_access(request)`` directly when they need a specific check
+(e.g. enrollment only) with their own error payload.
+"""
+from django.core.cache import cache
+from rest_framework.permissions import BasePermission
+
+from .viewer_context import ACTIVE_ENROLLMENT_STATUSES, get_viewer_context
+
+CACHE_KEY = 'courses:access:{user_id}'
+ACCESS_CACHE_TIMEOUT = 60
+
+
+class CourseAccess:
+    """Access map of one user"""
+
+    def __init__(self, is_admin=False, enrolled=(), instructing=()):
+        self.is_admin = is_admin
+        self.enrolled = frozenset(enrolled)
+        self.instructing = frozenset(instructing)
+
+    def is_enrolled(self, course):
+        return _course_id(course) in self.enrolled
+
+    def is_instructor(self, course):
+        return _course_id(course) in self.instructing
+
+    def is_instructor_or_admin(self, course):
+        return self.is_admin or self.is_instructor(course)
+
+    def can_access(self, course):
+        """Enrolled students, the course's instructors and admins"""
+        return self.is_enrolled(course) or self.is_instructor_or_admin(course)
+
+
+ANONYMOUS = CourseAccess()
+
+
+def _course_id(course):
+    return int(getattr(course, 'pk', course))
+
+
+def load_course_access(user):
+    """Access map of ``user`` from the cache, computing it on a miss"""
+    if not (user and user.is_authenticated):
+        return ANONYMOUS
+
+    key = CACHE_KEY.format(user_id=user.pk)
+    access = cache.get(key)
+    if access is None:
+        access = _compute(user)
+        cache.set(key, access, ACCESS_CACHE_TIMEOUT)
+    return access
+
+
+def _compute(user):
+    from users.models import Profile
+    from .models import Course, Enrollment
+
+    status = Profile.objects.filter(user=user).values_list('status', flat=True).first()
+    enrolled = Enrollment.objects.filter(
+        student=user, status__in=ACTIVE_ENROLLMENT_STATUSES
+    ).values_list('course_id', flat=True)
+    instructing = Course.instructors.through.objects.filter(
+        instructor__profile__user=user
+    ).values_list('course_id', flat=True)
+    return CourseAccess(
+        is_admin=user.is_staff or status == 'Admin',
+        enrolled=enrolled,
+        instructing=instructing,
+    )
+
+
+def get_course_access(request):
+    """The request user's access map, resolved at most once per request"""
+    return get_viewer_context(request).course_access
+
+
+def invalidate(*user_ids):
+    cache.delete_many([CACHE_KEY.format(user_id=user_id) for user_id in user_ids if user_id])
+
+
+def _request_course_id(view):
+    return view.kwargs.get('course_id')
+
+
+class HasCourseAccess(BasePermission):
+    """DRF permission: enrolled students, course instructors and admins.
+
+    Checks the ``course_id`` URL kwarg when the view has one, and the object
+    (a course, or anything with a ``course``) in ``has_object_permission``.
+    """
+    message = 'ليس لديك صلاحية للوصول إلى هذا الكورس'
+
+    def has_permission(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return False
+        course_id = _request_course_id(view)
+        if course_id is None or not str(course_id).isdigit():
+            return True
+        return get_course_access(request).can_access(course_id)
+
+    def has_object_permission(self, request, view, obj):
+        course = getattr(obj, 'course', obj)
+        return get_course_access(request).can_access(course)
@@ -2,8 +2,9 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.contrib.admin import SimpleListFilter
-from django.db.models import Count, Avg
+from django.db.models import OuterRef
 
+from core.aggregates import count_subquery
 from .models import Category, Tags, Course, Enrollment
 
 # Unregister any models that might be registered by default or other apps
@@ -67,12 +68,19 @@ class CategoryAdmin(admin.ModelAdmin):
     is_default_display.admin_order_field = 'is_default'
     
     def course_count(self, obj):
-        count = obj.courses.count()
+        count = obj.courses_total
         if count > 0:
             url = reverse('admin:courses_course_changelist') + f'?category__id__exact={obj.id}'
             return format_html('<a href="{}">{} دورة</a>', url, count)
         return '0 دورة'
     course_count.short_description = 'عدد الدورات'
+    course_count.admin_order_field = 'courses_total'
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return queryset.annotate(
+            courses_total=count_subquery(Course.objects.filter(category=OuterRef('pk')), 'category')
+        )
     
     def has_delete_permission(self, request, obj=None):
         """Prevent deletion of default categories"""
@@ -120,8 +128,15 @@ class TagsAdmin(admin.ModelAdmin):
     search_fields = ('name',)
     
     def course_count(self, obj):
-        return obj.courses.count()
+        return obj.courses_total
     course_count.short_description = 'عدد الدورات'
+    course_count.admin_order_field = 'courses_total'
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return queryset.annotate(
+            courses_total=count_subquery(Course.tags.through.objects.filter(tag=OuterRef('pk')), 'tag')
+        )
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
@@ -193,26 +208,25 @@ class CourseAdmin(admin.ModelAdmin):
     get_course_type.admin_order_field = 'is_complete_course'
     
     def enrollment_count_display(self, obj):
-        return obj.students.count()
+        return obj.enrollment_count
     enrollment_count_display.short_description = 'Enrollments'
+    enrollment_count_display.admin_order_field = 'enrollment_count'
     
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
         return queryset.select_related('category', 'organization') \
-            .prefetch_related('tags', 'instructors', 'instructors__profile') \
+            .prefetch_related('instructors__profile') \
             .annotate(
-                enrollment_count=Count('students', distinct=True),
-                avg_rating=Avg('reviews__rating')
+                enrollment_count=count_subquery(Enrollment.objects.filter(course=OuterRef('pk')), 'course')
             )
     
     def total_enrollments(self, obj):
-        return obj.students.count()
+        return obj.enrollment_count
     total_enrollments.short_description = 'Total Enrollments'
     
     def average_rating(self, obj):
-        if hasattr(obj, 'avg_rating'):
-            return f"{obj.avg_rating:.1f}/5.0" if obj.avg_rating is not None else 'N/A'
-        return 'N/A'
+        # Denormalized from approved reviews (Course.update_rating_statistics)
+        return f"{obj.average_rating:.1f}/5.0" if obj.ratings_count else 'N/A'
     average_rating.short_description = 'Average Rating'
 
 @admin.register(Enrollment)
@@ -11,10 +11,12 @@ from users.models import User, Profile, Instructor, Student
 from content.models import Module, Lesson
 # from assignments.models import Assignment, AssignmentSubmission  # Module deleted
 from meetings.models import Meeting
+from core.replica import read_from_replica
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def teacher_dashboard_stats(request):
     """إحصائيات لوحة تحكم المعلم"""
     try:
@@ -299,6 +301,7 @@ def teacher_announcements(request):
 # Student Dashboard APIs
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def student_dashboard_stats(request):
     """إحصائيات لوحة تحكم الطالب"""
     try:
@@ -358,9 +361,9 @@ def student_dashboard_stats(request):
         # )
         submissions = []  # Temporary empty list
         avg_grade = 0
-        if submissions.exists():
+        if submissions:
             total_score = sum(submission.total_score or 0 for submission in submissions)
-            avg_grade = total_score / submissions.count()
+            avg_grade = total_score / len(submissions)
         
         # النقاط الإجمالية - حساب حقيقي
         total_points = sum(submission.total_score or 0 for submission in submissions)
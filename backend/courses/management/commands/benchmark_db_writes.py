@@ -0,0 +1,181 @@
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, connections, transaction
+
+from core import database
+from core.loadtest import percentile
+
+TABLE = 'benchmark_heartbeat'
+
+# Mode name -> pragmas of a scratch SQLite database
+SQLITE_MODES = {
+    'sqlite-default': {},
+    'sqlite-tuned': database.TUNED_SQLITE_PRAGMAS,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare write concurrency of the database modes with a video-heartbeat-like workload: '
+        'many threads each reading and updating their own progress row in short transactions'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=16,
+            help='Number of concurrent writers',
+        )
+        parser.add_argument(
+            '--writes',
+            type=int,
+            default=200,
+            help='Transactions per writer',
+        )
+        parser.add_argument(
+            '--mode',
+            action='append',
+            dest='modes',
+            choices=list(SQLITE_MODES) + ['configured'],
+            help=(
+                'Mode to benchmark (can be repeated; default: both SQLite modes on scratch files, plus '
+                'the configured database when it is not SQLite)'
+            ),
+        )
+        parser.add_argument(
+            '--immediate',
+            action='store_true',
+            help=(
+                'Start scratch SQLite transactions with BEGIN IMMEDIATE instead of Django\'s deferred BEGIN, '
+                'so writers queue on the busy timeout instead of failing on lock upgrade'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        modes = options['modes'] or list(SQLITE_MODES) + (['configured'] if connection.vendor != 'sqlite' else [])
+        threads, writes = options['threads'], options['writes']
+        self.stdout.write(
+            f'{"mode":<16} {"tx/s":>9} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"failed":>7}'
+        )
+        for mode in modes:
+            if mode == 'configured':
+                result = self._run(DjangoWorker, threads, writes)
+            else:
+                with tempfile.TemporaryDirectory() as directory:
+                    path = Path(directory) / 'benchmark.sqlite3'
+                    result = self._run(
+                        lambda worker_id: SQLiteWorker(worker_id, path, SQLITE_MODES[mode], options['immediate']),
+                        threads,
+                        writes,
+                    )
+            self.stdout.write(
+                f'{mode:<16} {result["tps"]:>9} {result["p50"]:>9} {result["p95"]:>9} '
+                f'{result["p99"]:>9} {result["failed"]:>7}'
+            )
+
+    def _run(self, worker_factory, threads, writes):
+        setup = worker_factory(0)
+        setup.execute(f'DROP TABLE IF EXISTS {TABLE}')
+        setup.execute(f'CREATE TABLE {TABLE} (id integer PRIMARY KEY, progress real, updated_at double precision)')
+        for worker_id in range(threads):
+            setup.execute(f'INSERT INTO {TABLE} (id, progress, updated_at) VALUES (%s, 0, 0)', [worker_id])
+        setup.close()
+
+        barrier = threading.Barrier(threads)
+
+        def work(worker_id):
+            worker = worker_factory(worker_id)
+            latencies, failed = [], 0
+            barrier.wait()
+            try:
+                for write in range(writes):
+                    start = time.perf_counter()
+                    try:
+                        worker.heartbeat(worker_id, write)
+                    except worker.errors:
+                        failed += 1
+                        continue
+                    latencies.append(time.perf_counter() - start)
+            finally:
+                worker.close()
+            return latencies, failed
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            outcomes = list(pool.map(work, range(threads)))
+        elapsed = time.perf_counter() - start
+
+        cleanup = worker_factory(0)
+        cleanup.execute(f'DROP TABLE {TABLE}')
+        cleanup.close()
+
+        latencies = [latency for worker_latencies, _ in outcomes for latency in worker_latencies]
+        if not latencies:
+            raise CommandError('Every write failed')
+        return {
+            'tps': round(len(latencies) / elapsed, 1),
+            'failed': sum(failed for _, failed in outcomes),
+            **{f'p{pct}': round(percentile(latencies, pct) * 1000, 2) for pct in (50, 95, 99)},
+        }
+
+
+class SQLiteWorker:
+    """A connection to a scratch SQLite file, used the way Django uses SQLite
+    (autocommit, deferred ``BEGIN`` for atomic blocks, 5s default timeout)"""
+    errors = (sqlite3.OperationalError,)
+
+    def __init__(self, worker_id, path, pragmas, immediate=False):
+        self.begin = 'BEGIN IMMEDIATE' if immediate else 'BEGIN'
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        database.apply_pragmas(self.connection.cursor(), pragmas)
+
+    def execute(self, sql, params=()):
+        self.connection.execute(sql.replace('%s', '?'), params)
+
+    def heartbeat(self, row_id, write):
+        cursor = self.connection.cursor()
+        cursor.execute(self.begin)
+        try:
+            cursor.execute(f'SELECT progress FROM {TABLE} WHERE id = ?', [row_id])
+            cursor.fetchone()
+            cursor.execute(
+                f'UPDATE {TABLE} SET progress = ?, updated_at = ? WHERE id = ?', [write % 100, time.time(), row_id]
+            )
+            cursor.execute('COMMIT')
+        except sqlite3.OperationalError:
+            cursor.execute('ROLLBACK')
+            raise
+
+    def close(self):
+        self.connection.close()
+
+
+class DjangoWorker:
+    """The configured database through Django (one connection per thread)"""
+
+    errors = (DatabaseError,)
+
+    def __init__(self, worker_id):
+        pass
+
+    def execute(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def heartbeat(self, row_id, write):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'SELECT progress FROM {TABLE} WHERE id = %s', [row_id])
+            cursor.fetchone()
+            cursor.execute(
+                f'UPDATE {TABLE} SET progress = %s, updated_at = %s WHERE id = %s', [write % 100, time.time(), row_id]
+            )
+
+    def close(self):
+        connections.close_all()
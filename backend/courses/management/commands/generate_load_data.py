@@ -0,0 +1,75 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core import synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-generate a large, production-shaped dataset (users, courses, lessons, enrollments, '
+        'progress, submissions, reviews, orders, meetings, articles, notifications) for benchmarks'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=1.0,
+            help='Multiply every row count by this factor (e.g. 0.01 for a quick run)',
+        )
+        for name, default in synthetic.DEFAULT_COUNTS.items():
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                help=f'Number of {name.replace("_", " ")} rows (default {default} x scale)',
+            )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed; the same arguments always generate the same data',
+        )
+        parser.add_argument(
+            '--prefix',
+            default='load',
+            help='Prefix of generated usernames and slugs; use another one to add a second dataset',
+        )
+        parser.add_argument(
+            '--password',
+            default='loadtest',
+            help='Password of every generated user',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Number of rows inserted per bulk insert',
+        )
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if get_user_model().objects.filter(username__startswith=f'{prefix}-user-').exists():
+            raise CommandError(f'A dataset with prefix "{prefix}" already exists; pass another --prefix')
+
+        counts = {
+            name: options[name] if options[name] is not None else max(1, int(default * options['scale']))
+            for name, default in synthetic.DEFAULT_COUNTS.items()
+        }
+        started = time.monotonic()
+
+        def log(message):
+            self.stdout.write(f'[{time.monotonic() - started:7.1f}s] {message}')
+
+        created = synthetic.generate(
+            counts,
+            seed=options['seed'],
+            prefix=prefix,
+            password=options['password'],
+            batch_size=options['batch_size'],
+            log=log,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {sum(created.values())} rows in {time.monotonic() - started:.1f}s'
+        ))
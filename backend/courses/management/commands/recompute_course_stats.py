@@ -0,0 +1,109 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from courses.models import Course
+from content.models import Module
+
+
+class Command(BaseCommand):
+    help = (
+        'Backfill/recompute denormalized course and module duration, module and lesson counters '
+        'and course rating aggregates'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course',
+            type=int,
+            action='append',
+            dest='course_ids',
+            help='Only recompute the given course id (can be repeated)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of rows written per bulk update',
+        )
+
+    def handle(self, *args, **options):
+        course_ids = options.get('course_ids')
+        batch_size = options['batch_size']
+
+        modules = Module.objects.all()
+        courses = Course.objects.all()
+        if course_ids:
+            modules = modules.filter(course_id__in=course_ids)
+            courses = courses.filter(pk__in=course_ids)
+
+        with transaction.atomic():
+            # Module durations first: course totals are derived from them
+            modules = modules.annotate(
+                computed_duration=Coalesce(Sum('lessons__duration_minutes'), Value(0))
+            ).only('id', 'total_duration_minutes')
+            stale_modules = []
+            for module in modules.iterator(chunk_size=batch_size):
+                if module.total_duration_minutes != module.computed_duration:
+                    module.total_duration_minutes = module.computed_duration
+                    stale_modules.append(module)
+            Module.objects.bulk_update(stale_modules, ['total_duration_minutes'], batch_size=batch_size)
+
+            courses = courses.annotate(
+                computed_modules=Count('modules', distinct=True),
+                computed_lessons=Count('modules__lessons', distinct=True),
+                computed_duration=Coalesce(Sum('modules__lessons__duration_minutes'), Value(0)),
+            ).only('id', 'total_modules', 'total_lessons', 'total_duration_minutes')
+            stale_courses = []
+            for course in courses.iterator(chunk_size=batch_size):
+                if (
+                    course.total_modules != course.computed_modules
+                    or course.total_lessons != course.computed_lessons
+                    or course.total_duration_minutes != course.computed_duration
+                ):
+                    course.total_modules = course.computed_modules
+                    course.total_lessons = course.computed_lessons
+                    course.total_duration_minutes = course.computed_duration
+                    stale_courses.append(course)
+            Course.objects.bulk_update(
+                stale_courses,
+                ['total_modules', 'total_lessons', 'total_duration_minutes'],
+                batch_size=batch_size,
+            )
+
+            # Rating aggregates use a separate query so the reviews join
+            # doesn't multiply the lesson sums above
+            approved = Q(reviews__is_approved=True)
+            rating_fields = ['ratings_count', 'ratings_sum', 'average_rating'] + [
+                f'rating_{star}_count' for star in range(1, 6)
+            ]
+            rated_courses = Course.objects.filter(pk__in=course_ids) if course_ids else Course.objects.all()
+            rated_courses = rated_courses.annotate(
+                computed_ratings_count=Count('reviews', filter=approved),
+                computed_ratings_sum=Coalesce(Sum('reviews__rating', filter=approved), Value(0)),
+                **{
+                    f'computed_rating_{star}_count': Count('reviews', filter=approved & Q(reviews__rating=star))
+                    for star in range(1, 6)
+                }
+            ).only('id', *rating_fields)
+            stale_ratings = []
+            for course in rated_courses.iterator(chunk_size=batch_size):
+                changed = False
+                for field in rating_fields:
+                    if field == 'average_rating':
+                        continue
+                    value = getattr(course, f'computed_{field}')
+                    if getattr(course, field) != value:
+                        setattr(course, field, value)
+                        changed = True
+                average = course.ratings_sum / course.ratings_count if course.ratings_count else 0
+                if changed or abs(course.average_rating - average) > 1e-9:
+                    course.average_rating = average
+                    stale_ratings.append(course)
+            Course.objects.bulk_update(stale_ratings, rating_fields, batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Updated {len(stale_modules)} modules, {len(stale_courses)} course content counters '
+            f'and {len(stale_ratings)} course rating aggregates'
+        ))
@@ -0,0 +1,102 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import loadtest
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive the learner journey (catalog, detail, enroll, tracking, video heartbeats, assessment, '
+        'checkout) against a running server and report per-step latency percentiles and throughput'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            default='http://127.0.0.1:8000',
+            help='Server under test',
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=20,
+            help='Number of concurrent virtual users',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=3,
+            help='Journeys (each on a different course) per virtual user',
+        )
+        parser.add_argument(
+            '--heartbeats',
+            type=int,
+            default=5,
+            help='Video progress heartbeats per journey',
+        )
+        parser.add_argument(
+            '--prefix',
+            default='load',
+            help='Prefix of the dataset created by generate_load_data',
+        )
+        parser.add_argument(
+            '--password',
+            default='loadtest',
+            help='Password of the generated users',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed used to pick the courses of each virtual user',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the results as JSON to this file',
+        )
+        parser.add_argument(
+            '--save-baseline',
+            metavar='PATH',
+            help='Save the results as the baseline to compare later runs against',
+        )
+        parser.add_argument(
+            '--baseline',
+            metavar='PATH',
+            help='Compare against this baseline and fail on regressions',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=loadtest.DEFAULT_TOLERANCE,
+            help='Allowed relative p95 increase / throughput decrease before a step counts as regressed',
+        )
+
+    def handle(self, *args, **options):
+        plans = loadtest.prepare_plans(
+            options['users'],
+            options['iterations'],
+            prefix=options['prefix'],
+            password=options['password'],
+            seed=options['seed'],
+        )
+        if not plans:
+            raise CommandError(
+                f'No usable users in the "{options["prefix"]}" dataset; run generate_load_data first'
+            )
+
+        results = loadtest.run(options['base_url'], plans, heartbeats=options['heartbeats'])
+        baseline = loadtest.load(options['baseline']) if options['baseline'] else None
+        self.stdout.write(loadtest.format_table(results, baseline))
+
+        if options['output']:
+            loadtest.save(results, options['output'])
+        if options['save_baseline']:
+            loadtest.save(results, options['save_baseline'])
+            self.stdout.write(self.style.SUCCESS(f'Baseline saved to {options["save_baseline"]}'))
+
+        if baseline is not None:
+            regressions = loadtest.compare(results, baseline, options['tolerance'])
+            if regressions:
+                raise CommandError('Regressions against the baseline:\n' + '\n'.join(
+                    f'  {step}: {message}' for step, message in regressions
+                ))
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
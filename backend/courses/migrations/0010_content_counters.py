@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:21
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_content_counters(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    Module = apps.get_model('content', 'Module')
+
+    for module in Module.objects.annotate(duration=Sum('lessons__duration_minutes')):
+        if module.duration:
+            Module.objects.filter(pk=module.pk).update(total_duration_minutes=module.duration)
+
+    courses = Course.objects.annotate(
+        modules_count=Count('modules', distinct=True),
+        lessons_count=Count('modules__lessons', distinct=True),
+        duration=Sum('modules__lessons__duration_minutes'),
+    )
+    for course in courses:
+        Course.objects.filter(pk=course.pk).update(
+            total_modules=course.modules_count,
+            total_lessons=course.lessons_count,
+            total_duration_minutes=course.duration or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_merge_20250920_0032'),
+        ('content', '0007_content_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='total_duration_minutes',
+            field=models.PositiveIntegerField(default=0, verbose_name='Total Duration (minutes)'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='total_lessons',
+            field=models.PositiveIntegerField(default=0, verbose_name='Total Lessons'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='total_modules',
+            field=models.PositiveIntegerField(default=0, verbose_name='Total Modules'),
+        ),
+        migrations.RunPython(backfill_content_counters, migrations.RunPython.noop),
+    ]
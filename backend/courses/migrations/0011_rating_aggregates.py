@@ -0,0 +1,71 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:25
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_rating_aggregates(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+
+    approved = Q(reviews__is_approved=True)
+    courses = Course.objects.annotate(
+        approved_count=Count('reviews', filter=approved),
+        approved_sum=Sum('reviews__rating', filter=approved),
+        **{f'stars_{star}': Count('reviews', filter=approved & Q(reviews__rating=star)) for star in range(1, 6)}
+    )
+    for course in courses:
+        if not course.approved_count:
+            continue
+        Course.objects.filter(pk=course.pk).update(
+            ratings_count=course.approved_count,
+            ratings_sum=course.approved_sum,
+            average_rating=course.approved_sum / course.approved_count,
+            **{f'rating_{star}_count': getattr(course, f'stars_{star}') for star in range(1, 6)}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0010_content_counters'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='1 Star Ratings'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='2 Star Ratings'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='3 Star Ratings'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='4 Star Ratings'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='5 Star Ratings'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='ratings_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Ratings Count'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='ratings_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Ratings Sum'),
+        ),
+        migrations.RunPython(backfill_rating_aggregates, migrations.RunPython.noop),
+    ]
@@ -5,9 +5,10 @@ from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
-from django.db.models import Count, Avg, Sum, Q
+from django.db.models import Count, Avg, Sum, Q, F, ExpressionWrapper
+from django.db.models.functions import Coalesce, NullIf
 
 User = get_user_model()
 
@@ -267,6 +268,16 @@ class Course(models.Model):
         verbose_name=_('Average Rating')
     )
     total_enrollments = models.PositiveIntegerField(default=0, verbose_name=_('Total Enrollments'))
+    total_duration_minutes = models.PositiveIntegerField(default=0, verbose_name=_('Total Duration (minutes)'))
+    total_modules = models.PositiveIntegerField(default=0, verbose_name=_('Total Modules'))
+    total_lessons = models.PositiveIntegerField(default=0, verbose_name=_('Total Lessons'))
+    ratings_count = models.PositiveIntegerField(default=0, verbose_name=_('Ratings Count'))
+    ratings_sum = models.PositiveIntegerField(default=0, verbose_name=_('Ratings Sum'))
+    rating_1_count = models.PositiveIntegerField(default=0, verbose_name=_('1 Star Ratings'))
+    rating_2_count = models.PositiveIntegerField(default=0, verbose_name=_('2 Star Ratings'))
+    rating_3_count = models.PositiveIntegerField(default=0, verbose_name=_('3 Star Ratings'))
+    rating_4_count = models.PositiveIntegerField(default=0, verbose_name=_('4 Star Ratings'))
+    rating_5_count = models.PositiveIntegerField(default=0, verbose_name=_('5 Star Ratings'))
     
     # SEO Fields
     meta_title = models.CharField(
@@ -334,17 +345,11 @@ class Course(models.Model):
         return self.is_complete_course
     
     def update_statistics(self):
-        """Update denormalized statistics"""
-        from reviews.models import CourseReview
-        
-        # Update average rating
-        rating_data = CourseReview.objects.filter(
-            course=self,
-            is_approved=True
-        ).aggregate(avg_rating=Avg('rating'))
-        
-        self.average_rating = rating_data['avg_rating'] or 0
+        """Update denormalized enrollment statistics.
         
+        Rating aggregates are maintained incrementally by the review write
+        paths (see apply_rating_change), so no review query runs here.
+        """
         # Update total enrollments
         self.total_enrollments = self.enrollments.filter(
             status__in=['active', 'completed']
@@ -352,11 +357,94 @@ class Course(models.Model):
         
         # Update directly in database to avoid triggering signals
         Course.objects.filter(pk=self.pk).update(
-            average_rating=self.average_rating,
             total_enrollments=self.total_enrollments,
             updated_at=timezone.now()
         )
     
+    @classmethod
+    def apply_rating_change(cls, course_id, old_rating=None, new_rating=None):
+        """Incrementally move one approved rating in/out of the stored aggregates.
+        
+        ``old_rating`` is the star value being removed (None if the review did
+        not count before), ``new_rating`` the one being added. Runs as a single
+        UPDATE with F() expressions so concurrent reviews don't lose updates.
+        """
+        if old_rating == new_rating:
+            return
+        
+        count_delta = (new_rating is not None) - (old_rating is not None)
+        sum_delta = (new_rating or 0) - (old_rating or 0)
+        new_count = F('ratings_count') + count_delta
+        new_sum = F('ratings_sum') + sum_delta
+        
+        updates = {
+            'ratings_count': new_count,
+            'ratings_sum': new_sum,
+            # SQL evaluates every SET expression against the old row values
+            'average_rating': Coalesce(
+                ExpressionWrapper(new_sum * 1.0, output_field=models.FloatField()) / NullIf(new_count, 0),
+                0.0,
+                output_field=models.FloatField()
+            ),
+        }
+        if old_rating is not None:
+            field = f'rating_{old_rating}_count'
+            updates[field] = F(field) - 1
+        if new_rating is not None:
+            field = f'rating_{new_rating}_count'
+            updates[field] = F(field) + 1
+        
+        cls.objects.filter(pk=course_id).update(**updates)
+    
+    def update_rating_statistics(self):
+        """Recompute rating aggregates from the review table (repair/backfill)"""
+        from reviews.models import CourseReview
+        
+        stats = CourseReview.objects.filter(course=self, is_approved=True).aggregate(
+            count=Count('id'),
+            total=Sum('rating'),
+            **{f'stars_{star}': Count('id', filter=Q(rating=star)) for star in range(1, 6)}
+        )
+        self.ratings_count = stats['count']
+        self.ratings_sum = stats['total'] or 0
+        self.average_rating = self.ratings_sum / self.ratings_count if self.ratings_count else 0
+        for star in range(1, 6):
+            setattr(self, f'rating_{star}_count', stats[f'stars_{star}'])
+        
+        Course.objects.filter(pk=self.pk).update(
+            ratings_count=self.ratings_count,
+            ratings_sum=self.ratings_sum,
+            average_rating=self.average_rating,
+            **{f'rating_{star}_count': stats[f'stars_{star}'] for star in range(1, 6)}
+        )
+    
+    @property
+    def rating_distribution(self):
+        """Stored 1-5 star histogram as {star: count}"""
+        return {star: getattr(self, f'rating_{star}_count') for star in range(1, 6)}
+    
+    @classmethod
+    def update_content_statistics(cls, course_id):
+        """Recompute denormalized module/lesson counters and total duration.
+        
+        Takes the course id rather than an instance so it can run from
+        delete signals while the course itself is being cascade-deleted.
+        """
+        from content.models import Module, Lesson
+        
+        module_stats = Module.objects.filter(course_id=course_id).aggregate(
+            modules=Count('id'),
+            duration=Sum('total_duration_minutes')
+        )
+        total_lessons = Lesson.objects.filter(module__course_id=course_id).count()
+        
+        # Update directly in database to avoid triggering signals
+        cls.objects.filter(pk=course_id).update(
+            total_modules=module_stats['modules'] or 0,
+            total_duration_minutes=module_stats['duration'] or 0,
+            total_lessons=total_lessons
+        )
+    
     def is_enrolled(self, user):
         """Check if a user is enrolled in this course"""
         if not user.is_authenticated:
@@ -574,3 +662,42 @@ def update_course_slug(sender, instance, created, **kwargs):
         # Update the instance in memory
         instance.slug = slug
 
+
+# Course access cache (courses.access) --------------------------------------
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def invalidate_enrollment_access(sender, instance, **kwargs):
+    from .access import invalidate
+    invalidate(instance.student_id)
+
+
+@receiver(m2m_changed, sender=Course.instructors.through)
+def invalidate_instructor_access(sender, instance, action, reverse, pk_set, **kwargs):
+    """Instructors added to/removed from a course (from either side)"""
+    from users.models import Instructor
+    from .access import invalidate
+
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        instructor_ids = [instance.pk]
+    elif action == 'pre_clear':
+        instructor_ids = list(instance.instructors.values_list('pk', flat=True))
+    else:
+        instructor_ids = pk_set or []
+    invalidate(*Instructor.objects.filter(pk__in=instructor_ids).values_list('profile__user_id', flat=True))
+
+
+@receiver(post_save, sender=User)
+def invalidate_staff_access(sender, instance, created, **kwargs):
+    if not created:
+        from .access import invalidate
+        invalidate(instance.pk)
+
+
+@receiver(post_save, sender='users.Profile')
+def invalidate_profile_access(sender, instance, created, **kwargs):
+    if not created:
+        from .access import invalidate
+        invalidate(instance.user_id)
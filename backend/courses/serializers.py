@@ -1,16 +1,35 @@
 from rest_framework import serializers
+from core.images import ImageVariantsField, variant_urls
 from .models import Course, Category, Tag, Enrollment
+from .viewer_context import get_viewer_context
 from users.models import Instructor
 from django.db.models import Count
 from django.utils.text import slugify
 
 
+def format_duration(total_minutes):
+    """Format a duration in minutes as a short Arabic hours/minutes string"""
+    if not total_minutes:
+        return "غير محدد"
+    
+    hours = total_minutes // 60
+    minutes = total_minutes % 60
+    
+    if hours > 0 and minutes > 0:
+        return f"{hours}س {minutes}د"
+    elif hours > 0:
+        return f"{hours}س"
+    else:
+        return f"{minutes}د"
+
+
 class CategorySerializer(serializers.ModelSerializer):
     courses_count = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
     
     class Meta:
         model = Category
-        fields = ['id', 'name', 'description', 'image', 'courses_count']
+        fields = ['id', 'name', 'description', 'image', 'image_variants', 'courses_count']
         read_only_fields = ['id']
     
     def get_courses_count(self, obj):
@@ -31,17 +50,22 @@ class CourseBasicSerializer(serializers.ModelSerializer):
     enrolled_count = serializers.SerializerMethodField()
     rating = serializers.SerializerMethodField()
     image_url = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
     duration = serializers.SerializerMethodField()
     
     class Meta:
         model = Course
         fields = [
-            'id', 'title', 'subtitle', 'description', 'short_description', 'image', 'image_url', 'price',
+            'id', 'title', 'subtitle', 'description', 'short_description', 'image', 'image_url', 'image_variants', 'price',
             'discount_price', 'category', 'category_name', 'instructors', 'tags',
             'level', 'status', 'is_complete_course', 'created_at', 'rating', 'enrolled_count',
-            'is_free', 'is_featured', 'is_certified', 'total_enrollments', 'average_rating', 'duration'
+            'is_free', 'is_featured', 'is_certified', 'total_enrollments', 'average_rating', 'duration',
+            'total_duration_minutes', 'total_modules', 'total_lessons'
+        ]
+        read_only_fields = [
+            'id', 'created_at', 'rating', 'total_enrollments', 'average_rating', 'duration',
+            'total_duration_minutes', 'total_modules', 'total_lessons'
         ]
-        read_only_fields = ['id', 'created_at', 'rating', 'total_enrollments', 'average_rating', 'duration']
     
     def get_instructors(self, obj):
         instructors = []
@@ -53,7 +77,8 @@ class CourseBasicSerializer(serializers.ModelSerializer):
                             'id': instructor.id,
                             'name': instructor.profile.name or '',
                             'bio': instructor.profile.shortBio or '',  # Changed from bio to shortBio
-                            'profile_pic': instructor.profile.image_profile.url if instructor.profile.image_profile else None  # Changed from profile_pic to image_profile
+                            'profile_pic': instructor.profile.image_profile.url if instructor.profile.image_profile else None,  # Changed from profile_pic to image_profile
+                            'profile_pic_variants': variant_urls(instructor.profile.image_profile),
                         })
                     else:
                         # If instructor doesn't have a profile, still include basic info
@@ -61,7 +86,8 @@ class CourseBasicSerializer(serializers.ModelSerializer):
                             'id': instructor.id,
                             'name': str(instructor),
                             'bio': '',
-                            'profile_pic': None
+                            'profile_pic': None,
+                            'profile_pic_variants': None,
                         })
                 except Exception as e:
                     # Log the error but continue with other instructors
@@ -96,30 +122,8 @@ class CourseBasicSerializer(serializers.ModelSerializer):
         return None
     
     def get_duration(self, obj):
-        """Calculate total duration of all lessons in the course"""
-        try:
-            total_minutes = 0
-            for module in obj.modules.all():
-                for lesson in module.lessons.all():
-                    total_minutes += lesson.duration_minutes or 0
-            
-            if total_minutes == 0:
-                return "غير محدد"
-            
-            hours = total_minutes // 60
-            minutes = total_minutes % 60
-            
-            if hours > 0 and minutes > 0:
-                return f"{hours}س {minutes}د"
-            elif hours > 0:
-                return f"{hours}س"
-            else:
-                return f"{minutes}د"
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error calculating duration for course {obj.id}: {str(e)}")
-            return "غير محدد"
+        """Format the denormalized total duration of all lessons in the course"""
+        return format_duration(obj.total_duration_minutes)
 
 
 class CourseInstructorSerializer(serializers.Serializer):
@@ -127,6 +131,7 @@ class CourseInstructorSerializer(serializers.Serializer):
     name = serializers.CharField()
     bio = serializers.CharField(allow_null=True)
     profile_pic = serializers.URLField(allow_null=True)
+    profile_pic_variants = serializers.DictField(allow_null=True)
 
 class CourseDetailSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
@@ -134,17 +139,22 @@ class CourseDetailSerializer(serializers.ModelSerializer):
     tags = serializers.SerializerMethodField()
     is_enrolled = serializers.SerializerMethodField()
     duration = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
     
     class Meta:
         model = Course
         fields = [
-            'id', 'title', 'subtitle', 'description', 'short_description', 'image', 'promotional_video',
+            'id', 'title', 'subtitle', 'description', 'short_description', 'image', 'image_variants', 'promotional_video',
             'price', 'discount_price', 'category', 'instructors', 'tags', 'level', 'status', 
             'is_complete_course', 'created_at', 'updated_at', 'is_enrolled', 'is_free', 
             'is_featured', 'is_certified', 'total_enrollments', 'average_rating', 'language',
-            'syllabus_pdf', 'materials_pdf', 'duration'
+            'syllabus_pdf', 'materials_pdf', 'duration',
+            'total_duration_minutes', 'total_modules', 'total_lessons'
+        ]
+        read_only_fields = [
+            'id', 'created_at', 'updated_at', 'total_enrollments', 'average_rating', 'duration',
+            'total_duration_minutes', 'total_modules', 'total_lessons'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'total_enrollments', 'average_rating', 'duration']
     
     def get_instructors(self, obj):
         instructors = []
@@ -156,7 +166,8 @@ class CourseDetailSerializer(serializers.ModelSerializer):
                             'id': instructor.id,
                             'name': instructor.profile.name or '',
                             'bio': instructor.profile.shortBio or '',  # Changed from bio to shortBio
-                            'profile_pic': instructor.profile.image_profile.url if instructor.profile.image_profile else None  # Changed from profile_pic to image_profile
+                            'profile_pic': instructor.profile.image_profile.url if instructor.profile.image_profile else None,  # Changed from profile_pic to image_profile
+                            'profile_pic_variants': variant_urls(instructor.profile.image_profile),
                         })
                     else:
                         # If instructor doesn't have a profile, still include basic info
@@ -164,7 +175,8 @@ class CourseDetailSerializer(serializers.ModelSerializer):
                             'id': instructor.id,
                             'name': str(instructor),
                             'bio': '',
-                            'profile_pic': None
+                            'profile_pic': None,
+                            'profile_pic_variants': None,
                         })
                 except Exception as e:
                     # Log the error but continue with other instructors
@@ -191,7 +203,7 @@ class CourseDetailSerializer(serializers.ModelSerializer):
         try:
             request = self.context.get('request')
             if request and hasattr(request, 'user') and request.user.is_authenticated:
-                return obj.enrollments.filter(student=request.user, status__in=['active', 'completed']).exists()
+                return get_viewer_context(request).is_enrolled(obj)
             return False
         except Exception as e:
             import logging
@@ -200,30 +212,8 @@ class CourseDetailSerializer(serializers.ModelSerializer):
             return False
     
     def get_duration(self, obj):
-        """Calculate total duration of all lessons in the course"""
-        try:
-            total_minutes = 0
-            for module in obj.modules.all():
-                for lesson in module.lessons.all():
-                    total_minutes += lesson.duration_minutes or 0
-            
-            if total_minutes == 0:
-                return "غير محدد"
-            
-            hours = total_minutes // 60
-            minutes = total_minutes % 60
-            
-            if hours > 0 and minutes > 0:
-                return f"{hours}س {minutes}د"
-            elif hours > 0:
-                return f"{hours}س"
-            else:
-                return f"{minutes}د"
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error calculating duration for course {obj.id}: {str(e)}")
-            return "غير محدد"
+        """Format the denormalized total duration of all lessons in the course"""
+        return format_duration(obj.total_duration_minutes)
 
 
 class CourseCreateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,254 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, RequestFactory
+from django.urls import reverse
+
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from content.models import Module, Lesson, ModuleProgress
+from notifications.models import Notification
+from store.models import Cart, CartItem, Wishlist
+from store.views import CartItemCreateView, WishlistAddView
+from users.models import Instructor
+from .access import get_course_access
+from .models import Course, Enrollment
+from .serializers import CourseDetailSerializer
+from .viewer_context import get_viewer_context
+
+User = get_user_model()
+
+
+class CourseContentCountersTest(TestCase):
+    """Test cases for the denormalized course duration and content counters"""
+
+    def setUp(self):
+        self.course = Course.objects.create(title='Counters Course', description='Description')
+        self.module = Module.objects.create(name='Module 1', course=self.course, order=1)
+
+    def _create_lesson(self, module, order, duration):
+        return Lesson.objects.create(
+            title=f'Lesson {module.pk}-{order}',
+            module=module,
+            order=order,
+            duration_minutes=duration,
+        )
+
+    def test_lesson_create_updates_counters(self):
+        self._create_lesson(self.module, 1, 30)
+        self._create_lesson(self.module, 2, 45)
+
+        self.course.refresh_from_db()
+        self.module.refresh_from_db()
+        self.assertEqual(self.module.total_duration_minutes, 75)
+        self.assertEqual(self.course.total_modules, 1)
+        self.assertEqual(self.course.total_lessons, 2)
+        self.assertEqual(self.course.total_duration_minutes, 75)
+
+    def test_lesson_update_move_and_delete(self):
+        other_module = Module.objects.create(name='Module 2', course=self.course, order=2)
+        lesson = self._create_lesson(self.module, 1, 30)
+
+        lesson.duration_minutes = 50
+        lesson.save()
+        self.module.refresh_from_db()
+        self.assertEqual(self.module.total_duration_minutes, 50)
+
+        lesson.module = other_module
+        lesson.save()
+        self.module.refresh_from_db()
+        other_module.refresh_from_db()
+        self.assertEqual(self.module.total_duration_minutes, 0)
+        self.assertEqual(other_module.total_duration_minutes, 50)
+
+        lesson.delete()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.total_lessons, 0)
+        self.assertEqual(self.course.total_duration_minutes, 0)
+        self.assertEqual(self.course.total_modules, 2)
+
+    def test_module_delete_updates_course(self):
+        self._create_lesson(self.module, 1, 20)
+        self.module.delete()
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.total_modules, 0)
+        self.assertEqual(self.course.total_lessons, 0)
+        self.assertEqual(self.course.total_duration_minutes, 0)
+
+    def test_recompute_command_repairs_drift(self):
+        self._create_lesson(self.module, 1, 40)
+        Course.objects.filter(pk=self.course.pk).update(
+            total_modules=0, total_lessons=0, total_duration_minutes=0
+        )
+        Module.objects.filter(pk=self.module.pk).update(total_duration_minutes=0)
+
+        call_command('recompute_course_stats', stdout=StringIO())
+
+        self.course.refresh_from_db()
+        self.module.refresh_from_db()
+        self.assertEqual(self.module.total_duration_minutes, 40)
+        self.assertEqual(self.course.total_modules, 1)
+        self.assertEqual(self.course.total_lessons, 1)
+        self.assertEqual(self.course.total_duration_minutes, 40)
+
+
+class ViewerContextTest(TestCase):
+    """Test cases for the request-scoped viewer membership lookups"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='viewer', password='testpass123')
+        self.courses = [
+            Course.objects.create(title=f'Course {i}', description='Description', status='published')
+            for i in range(6)
+        ]
+        Enrollment.objects.create(student=self.user, course=self.courses[0], status='active')
+        Enrollment.objects.create(student=self.user, course=self.courses[1], status='dropped')
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, course=self.courses[2])
+        wishlist = Wishlist.objects.create(user=self.user)
+        wishlist.courses.add(self.courses[3])
+
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+
+    def test_membership_sets(self):
+        viewer = get_viewer_context(self.request)
+        self.assertIs(viewer, get_viewer_context(self.request))
+        self.assertTrue(viewer.is_enrolled(self.courses[0]))
+        self.assertFalse(viewer.is_enrolled(self.courses[1]))
+        self.assertTrue(viewer.has_enrollment(self.courses[1]))
+        self.assertTrue(viewer.is_in_cart(self.courses[2]))
+        self.assertTrue(viewer.is_in_wishlist(self.courses[3].pk))
+        self.assertFalse(viewer.is_in_wishlist(self.courses[4]))
+
+    def test_is_enrolled_costs_one_query_for_many_courses(self):
+        with self.assertNumQueries(1):
+            enrolled = [
+                get_viewer_context(self.request).is_enrolled(course)
+                for course in self.courses
+            ]
+        self.assertEqual(enrolled, [True, False, False, False, False, False])
+
+    def test_detail_serializer_uses_viewer_context(self):
+        data = CourseDetailSerializer(
+            self.courses[:2], many=True, context={'request': self.request}
+        ).data
+        self.assertEqual([item['is_enrolled'] for item in data], [True, False])
+
+    def test_store_mutations_invalidate_the_loaded_sets(self):
+        request = APIRequestFactory().post('/', {'course': self.courses[4].pk}, format='json')
+        request.user = self.user
+        force_authenticate(request, self.user)
+        viewer = get_viewer_context(request)
+        self.assertFalse(viewer.is_in_wishlist(self.courses[4]))
+
+        response = WishlistAddView.as_view()(request)
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(get_viewer_context(request).is_in_wishlist(self.courses[4]))
+
+        request = APIRequestFactory().post('/', {'course_id': self.courses[5].pk}, format='json')
+        request.user = self.user
+        force_authenticate(request, self.user)
+        self.assertFalse(get_viewer_context(request).is_in_cart(self.courses[5]))
+        response = CartItemCreateView.as_view()(request)
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(get_viewer_context(request).is_in_cart(self.courses[5]))
+
+
+class CourseAccessTest(TestCase):
+    """Test cases for the cached course access resolver"""
+
+    def setUp(self):
+        cache.clear()
+        self.course = Course.objects.create(title='Access Course', description='Description', status='published')
+        self.student = User.objects.create_user(username='student', password='testpass123')
+        self.teacher = User.objects.create_user(username='teacher', password='testpass123')
+        self.teacher.profile.status = 'Instructor'
+        self.teacher.profile.save()
+        self.instructor = Instructor.objects.create(profile=self.teacher.profile)
+        self.client = APIClient()
+
+    def _request(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        return request
+
+    def test_access_map_is_cached_and_invalidated(self):
+        self.assertFalse(get_course_access(self._request(self.student)).can_access(self.course))
+
+        Enrollment.objects.create(student=self.student, course=self.course, status='active')
+        self.course.instructors.add(self.instructor)
+
+        student_access = get_course_access(self._request(self.student))
+        self.assertTrue(student_access.is_enrolled(self.course))
+        self.assertFalse(student_access.is_instructor_or_admin(self.course))
+        teacher_access = get_course_access(self._request(self.teacher))
+        self.assertTrue(teacher_access.is_instructor(self.course.pk))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(get_course_access(self._request(self.student)).can_access(self.course))
+
+        self.course.instructors.clear()
+        self.assertFalse(get_course_access(self._request(self.teacher)).can_access(self.course))
+
+    def test_content_endpoints_use_permission(self):
+        url = reverse('course-modules-with-lessons', args=[self.course.pk])
+        self.client.force_authenticate(self.student)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        Enrollment.objects.create(student=self.student, course=self.course, status='active')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.client.force_authenticate(self.teacher)
+        self.course.instructors.add(self.instructor)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_module_detail_requires_course_access(self):
+        module = Module.objects.create(course=self.course, name='Module', order=1)
+        url = reverse('module-detail', args=[module.pk])
+        self.client.force_authenticate(self.student)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        Enrollment.objects.create(student=self.student, course=self.course, status='active')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class GenerateLoadDataTest(TestCase):
+    counts = ['--users', '60', '--courses', '5', '--lessons', '100', '--enrollments', '80', '--progress', '200',
+              '--submissions', '20', '--reviews', '20', '--orders', '10', '--meetings', '3', '--articles', '3',
+              '--notifications', '100']
+
+    def test_generates_requested_rows_with_consistent_counters(self):
+        call_command('generate_load_data', *self.counts, stdout=StringIO())
+
+        self.assertEqual(User.objects.filter(username__startswith='load-user-').count(), 60)
+        self.assertEqual(Course.objects.filter(slug__startswith='load-course-').count(), 5)
+        self.assertEqual(Lesson.objects.count(), 100)
+        self.assertEqual(Enrollment.objects.count(), 80)
+        self.assertEqual(ModuleProgress.objects.count(), 200)
+        self.assertEqual(Notification.objects.count(), 100)
+        self.assertFalse(User.objects.filter(profile__isnull=True).exists())
+        for course in Course.objects.all():
+            self.assertEqual(course.total_lessons, Lesson.objects.filter(module__course=course).count())
+            self.assertEqual(course.total_enrollments, course.enrollments.count())
+
+    def test_same_seed_generates_same_data(self):
+        def snapshot(prefix):
+            call_command('generate_load_data', *self.counts, '--prefix', prefix, stdout=StringIO())
+            return sorted(
+                (username.removeprefix(prefix), slug.removeprefix(prefix))
+                for username, slug in Enrollment.objects.filter(
+                    student__username__startswith=prefix
+                ).values_list('student__username', 'course__slug')
+            )
+
+        self.assertEqual(snapshot('first'), snapshot('second'))
+
+    def test_refuses_to_reuse_a_prefix(self):
+        call_command('generate_load_data', *self.counts, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('generate_load_data', *self.counts, stdout=StringIO())
@@ -0,0 +1,106 @@
+"""
+Request-scoped membership lookups for the current user.
+
+Serializers rendering many courses need to know, per course, whether the
+viewer is enrolled or has it in their cart/wishlist. Instead of one
+``exists()`` query per course, the viewer's course ids are loaded once per
+request as sets and reused by every serializer sharing that request.
+"""
+from django.utils.functional import cached_property
+
+
+ACTIVE_ENROLLMENT_STATUSES = ('active', 'completed')
+
+
+class ViewerContext:
+    """Lazily loaded sets of course ids the current user is related to"""
+
+    def __init__(self, user):
+        self.user = user
+        self.is_authenticated = bool(user and user.is_authenticated)
+
+    @cached_property
+    def _enrollment_statuses(self):
+        if not self.is_authenticated:
+            return {}
+        from .models import Enrollment
+        return dict(
+            Enrollment.objects.filter(student=self.user).values_list('course_id', 'status')
+        )
+
+    @cached_property
+    def enrolled_course_ids(self):
+        """Courses with an active or completed enrollment"""
+        return {
+            course_id for course_id, status in self._enrollment_statuses.items()
+            if status in ACTIVE_ENROLLMENT_STATUSES
+        }
+
+    @property
+    def any_enrollment_course_ids(self):
+        """Courses with an enrollment of any status (pending, dropped, ...)"""
+        return set(self._enrollment_statuses)
+
+    @cached_property
+    def cart_course_ids(self):
+        if not self.is_authenticated:
+            return set()
+        from store.models import CartItem
+        return set(
+            CartItem.objects.filter(cart__user=self.user).values_list('course_id', flat=True)
+        )
+
+    @cached_property
+    def wishlist_course_ids(self):
+        if not self.is_authenticated:
+            return set()
+        from store.models import Wishlist
+        return set(
+            Wishlist.courses.through.objects.filter(
+                wishlist__user=self.user
+            ).values_list('course_id', flat=True)
+        )
+
+    @cached_property
+    def course_access(self):
+        """Enrolled/instructing/admin access map (see courses.access)"""
+        from .access import load_course_access
+        return load_course_access(self.user)
+
+    def is_enrolled(self, course):
+        return _course_id(course) in self.enrolled_course_ids
+
+    def has_enrollment(self, course):
+        return _course_id(course) in self._enrollment_statuses
+
+    def is_in_cart(self, course):
+        return _course_id(course) in self.cart_course_ids
+
+    def is_in_wishlist(self, course):
+        return _course_id(course) in self.wishlist_course_ids
+
+    def invalidate(self):
+        """Drop loaded sets, e.g. after the request itself changed memberships"""
+        for name in ('_enrollment_statuses', 'enrolled_course_ids', 'cart_course_ids',
+                     'wishlist_course_ids', 'course_access'):
+            self.__dict__.pop(name, None)
+
+
+def _course_id(course):
+    return getattr(course, 'pk', course)
+
+
+def get_viewer_context(request):
+    """Return the ViewerContext for a request, creating it on first use.
+
+    The context is stored on the underlying Django ``HttpRequest`` so DRF's
+    ``Request`` wrapper and nested serializers all share the same instance.
+    """
+    if request is None:
+        return ViewerContext(None)
+    http_request = getattr(request, '_request', request)
+    context = getattr(http_request, '_viewer_context', None)
+    if context is None or context.user is not request.user:
+        context = ViewerContext(request.user)
+        http_request._viewer_context = context
+    return context
@@ -17,8 +17,10 @@ from datetime import timedelta, datetime
 from django.core.paginator import Paginator
 import logging
 
+from .access import get_course_access
 from .models import Course, Category, Tag, Enrollment
 from users.models import Instructor, Profile, User
+from core.replica import ReplicaReadMixin, read_from_replica
 from .serializers import (
     CategorySerializer, TagsSerializer, CourseBasicSerializer, 
     CourseDetailSerializer, CourseCreateSerializer, CourseUpdateSerializer,
@@ -45,8 +47,9 @@ class TagsViewSet(ReadOnlyModelViewSet):
     permission_classes = [AllowAny]
 
 
-class CourseViewSet(ModelViewSet):
+class CourseViewSet(ReplicaReadMixin, ModelViewSet):
     """إدارة الدورات"""
+    replica_actions = ('list',)
     queryset = Course.objects.select_related('category').prefetch_related('instructors', 'instructors__profile', 'tags', 'reviews')
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -317,23 +320,7 @@ class CourseViewSet(ModelViewSet):
         course = self.get_object()
         
         # Check if user is enrolled or is the teacher/admin
-        user = request.user
-        is_enrolled = course.enrollments.filter(student=user, status__in=['active', 'completed']).exists()
-        is_instructor_or_admin = False
-        
-        try:
-            profile = user.profile
-            if profile.status == 'Admin' or user.is_staff:
-                # Admin can access any course
-                is_instructor_or_admin = True
-            elif profile.status == 'Instructor':
-                instructor = profile.get_instructor_object()
-                if instructor and course.instructors.filter(id=instructor.id).exists():
-                    is_instructor_or_admin = True
-        except Profile.DoesNotExist:
-            pass
-        
-        if not is_enrolled and not is_instructor_or_admin:
+        if not get_course_access(request).can_access(course):
             return Response({
                 'error': 'يجب أن تكون مسجلاً في الدورة للوصول لهذا المحتوى'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -368,7 +355,7 @@ class CourseViewSet(ModelViewSet):
             'results': serializer.data
         }, status=status.HTTP_200_OK)
 
-    @action(detail=True, methods=['get'])
+    @action(detail=False, methods=['get'])
     def my_courses(self, request):
         """دوراتي المسجل بها"""
         user = request.user
@@ -376,7 +363,7 @@ class CourseViewSet(ModelViewSet):
             enrollments__student=user,
             enrollments__status__in=['active', 'completed'],
             status='published'
-        ).select_related('instructors', 'category').prefetch_related('tags')
+        ).select_related('category').prefetch_related('instructors__profile', 'tags')
         
         serializer = CourseBasicSerializer(enrolled_courses, many=True, context={'request': request})
         return Response({
@@ -389,6 +376,7 @@ class CourseViewSet(ModelViewSet):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@read_from_replica
 def course_search(request):
     """البحث في الدورات"""
     serializer = SearchSerializer(data=request.GET)
@@ -402,14 +390,14 @@ def course_search(request):
     data = serializer.validated_data
     
     # Start with published courses
-    queryset = Course.objects.filter(status='published').select_related('instructors', 'category').prefetch_related('tags')
+    queryset = Course.objects.filter(status='published').select_related('category').prefetch_related('instructors__profile', 'tags')
     
     # Apply filters
     if data.get('query'):
         queryset = queryset.filter(
-            Q(name__icontains=data['query']) |
+            Q(title__icontains=data['query']) |
             Q(description__icontains=data['query']) |
-            Q(small_description__icontains=data['query'])
+            Q(short_description__icontains=data['query'])
         )
     
     if data.get('category'):
@@ -432,7 +420,9 @@ def course_search(request):
     
     # Apply sorting
     sort_by = data.get('sort_by', '-created_at')
-    queryset = queryset.order_by(sort_by)
+    # name/rating are the API's names for title/average_rating
+    sort_field = {'name': 'title', 'rating': 'average_rating'}.get(sort_by.lstrip('-'), sort_by.lstrip('-'))
+    queryset = queryset.order_by(('-' if sort_by.startswith('-') else '') + sort_field)
     
     # Paginate results
     from rest_framework.pagination import PageNumberPagination
@@ -447,6 +437,7 @@ def course_search(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@read_from_replica
 def featured_courses(request):
     """الدورات المميزة"""
     courses = Course.objects.filter(
@@ -462,13 +453,14 @@ def featured_courses(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@read_from_replica
 def popular_courses(request):
     """الدورات الأكثر شعبية"""
     courses = Course.objects.filter(
         status='published'
     ).annotate(
         enrollment_count=Count('enrollments')
-    ).order_by('-enrollment_count').select_related('instructors', 'category').prefetch_related('tags')[:8]
+    ).order_by('-enrollment_count').select_related('category').prefetch_related('instructors__profile', 'tags')[:8]
     
     serializer = CourseBasicSerializer(courses, many=True, context={'request': request})
     return Response({
@@ -478,11 +470,12 @@ def popular_courses(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@read_from_replica
 def recent_courses(request):
     """أحدث الدورات"""
     courses = Course.objects.filter(
         status='published'
-    ).order_by('-created_at').select_related('instructors', 'category').prefetch_related('tags')[:8]
+    ).order_by('-created_at').select_related('category').prefetch_related('instructors__profile', 'tags')[:8]
     
     serializer = CourseBasicSerializer(courses, many=True, context={'request': request})
     return Response({
@@ -495,6 +488,7 @@ def recent_courses(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def dashboard_stats(request):
     """إحصائيات لوحة التحكم للمعلمين والمديرين"""
     user = request.user
@@ -545,6 +539,7 @@ def dashboard_stats(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@read_from_replica
 def general_stats(request):
     """إحصائيات عامة للموقع"""
     stats = {
@@ -559,6 +554,7 @@ def general_stats(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@read_from_replica
 def public_courses(request):
     """Get all published courses for public access"""
     try:
@@ -5,3 +5,7 @@ class ExtrasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'extras'
     verbose_name = 'الإضافات'
+
+    def ready(self):
+        """Import signals when the app is ready"""
+        import extras.signals  # noqa: F401
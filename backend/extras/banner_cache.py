@@ -0,0 +1,113 @@
+"""
+Time-window-aware snapshot of the currently active banners.
+
+Which banners are active only changes when a banner is edited or when a
+``start_date``/``end_date`` boundary passes. The snapshot holds the active
+banners grouped by type and is valid until the next upcoming boundary, so
+banner endpoints are served from memory without evaluating the date
+window in SQL on every request.
+
+Two layers are used: a per-process copy and a shared-cache copy (for the
+other workers). Saving or deleting a banner bumps a shared version number
+(see ``extras.signals``), which makes every process drop its local copy on
+its next read.
+"""
+import threading
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+VERSION_KEY = 'banners:snapshot:version'
+SNAPSHOT_KEY = 'banners:snapshot:{version}'
+
+# Shared-cache lifetime of a snapshot that has no upcoming boundary
+MAX_TIMEOUT = 60 * 60 * 24
+
+_local = {}
+_lock = threading.Lock()
+
+
+def _build(now):
+    from .models import Banner
+
+    by_type = {}
+    boundaries = []
+    for banner in Banner.objects.filter(is_active=True).order_by('display_order', '-created_at'):
+        if banner.start_date and banner.start_date > now:
+            boundaries.append(banner.start_date)
+            continue
+        if banner.end_date:
+            if banner.end_date < now:
+                continue
+            # First instant at which end_date__gte=now no longer matches
+            boundaries.append(banner.end_date + timedelta(microseconds=1))
+        by_type.setdefault(banner.banner_type, []).append(banner)
+    return {'by_type': by_type, 'valid_until': min(boundaries) if boundaries else None}
+
+
+def _version():
+    """Current snapshot version; seeded from the clock so that a flushed or
+    evicted key never matches a version some process still holds locally"""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _snapshot(now=None):
+    now = now or timezone.now()
+    version = _version()
+
+    snapshot = _local.get('snapshot')
+    if _valid(snapshot, version, now):
+        return snapshot
+
+    with _lock:
+        snapshot = cache.get(SNAPSHOT_KEY.format(version=version))
+        if not _valid(snapshot, version, now):
+            snapshot = dict(_build(now), version=version)
+            timeout = MAX_TIMEOUT
+            if snapshot['valid_until']:
+                timeout = max(1, min(MAX_TIMEOUT, int((snapshot['valid_until'] - now).total_seconds()) + 1))
+            cache.set(SNAPSHOT_KEY.format(version=version), snapshot, timeout)
+        _local['snapshot'] = snapshot
+    return snapshot
+
+
+def _valid(snapshot, version, now):
+    return (
+        snapshot is not None
+        and snapshot['version'] == version
+        and (snapshot['valid_until'] is None or now < snapshot['valid_until'])
+    )
+
+
+def active_banners(banner_type=None, now=None):
+    """Active banners ordered by display order (optionally of one type)"""
+    by_type = _snapshot(now)['by_type']
+    if banner_type is not None:
+        return list(by_type.get(banner_type, []))
+    return sorted(
+        (banner for banners in by_type.values() for banner in banners),
+        key=lambda banner: (banner.display_order, -banner.created_at.timestamp()),
+    )
+
+
+def seconds_until_change(now=None):
+    """Seconds until the active set changes by itself, or None if it never does"""
+    now = now or timezone.now()
+    valid_until = _snapshot(now)['valid_until']
+    if valid_until is None:
+        return None
+    return max(0, (valid_until - now).total_seconds())
+
+
+def invalidate():
+    _local.pop('snapshot', None)
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
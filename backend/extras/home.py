@@ -0,0 +1,249 @@
+"""
+Homepage aggregate (``/api/home/``) built from independently cached fragments.
+
+Each section of the landing page (banners, collections, course and article
+feeds, site stats) is a *fragment*: a builder function plus a TTL. Built
+fragments are stored in the shared cache as ``{'data', 'etag', 'fresh_until'}``
+and kept for ``STALE_TTL`` seconds past their TTL so that, once stale, one
+request rebuilds the fragment while concurrent requests keep serving the
+stale copy (stale-while-revalidate).
+
+Every fragment key carries a generation number. The receivers in
+``extras.signals`` bump the generation of the fragments a model feeds when
+it is saved or deleted, so edits show up immediately without knowing every
+cached key. Image URLs are absolute, so keys are also scoped by origin.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+KEY_PREFIX = 'home'
+
+# Fragment name -> default TTL in seconds (overridable via HOME_CACHE['TTL'])
+DEFAULT_TTLS = {
+    'banners': 300,
+    'collections': 600,
+    'featured_courses': 600,
+    'recent_courses': 300,
+    'stats': 900,
+    'articles': 300,
+}
+
+# Model label -> fragments to invalidate when an instance changes
+DEPENDENCIES = {
+    'extras.Banner': ['banners'],
+    'extras.CourseCollection': ['collections'],
+    'courses.Course': ['collections', 'featured_courses', 'recent_courses', 'stats'],
+    'articles.Article': ['articles'],
+}
+
+# Seconds a rebuild may take before another request is allowed to try
+REBUILD_LOCK_TIMEOUT = 30
+
+
+def _config(name, default):
+    return getattr(settings, 'HOME_CACHE', {}).get(name, default)
+
+
+def fragment_ttl(name):
+    return int(_config('TTL', {}).get(name, DEFAULT_TTLS[name]))
+
+
+def stale_ttl():
+    return int(_config('STALE_TTL', 600))
+
+
+# Fragment builders -------------------------------------------------------
+
+def build_banners(request):
+    from .banner_cache import active_banners
+    from .serializers import BannerSerializer
+
+    banners = active_banners()
+    context = {'request': request}
+    return {
+        'active': BannerSerializer(banners, many=True, context=context).data,
+        'promotional': BannerSerializer(
+            [b for b in banners if b.banner_type == 'promo'], many=True, context=context
+        ).data,
+        'header': BannerSerializer(
+            [b for b in banners if b.banner_type == 'header'], many=True, context=context
+        ).data,
+    }
+
+
+def build_collections(request):
+    from .models import CourseCollection
+    from .serializers import CourseCollectionDetailSerializer
+
+    collections = CourseCollection.objects.filter(
+        courses__status='published',
+        courses__is_active=True
+    ).distinct().prefetch_related(
+        'courses__category',
+        'courses__instructors',
+        'courses__instructors__profile',
+        'courses__tags'
+    ).order_by('display_order', 'name')
+    return CourseCollectionDetailSerializer(collections, many=True, context={'request': request}).data
+
+
+def _course_feed(request, queryset):
+    from courses.serializers import CourseBasicSerializer
+
+    courses = queryset.select_related('category').prefetch_related(
+        'instructors', 'instructors__profile', 'tags'
+    )[:8]
+    return CourseBasicSerializer(courses, many=True, context={'request': request}).data
+
+
+def build_featured_courses(request):
+    from courses.models import Course
+
+    return _course_feed(request, Course.objects.filter(status='published', is_featured=True))
+
+
+def build_recent_courses(request):
+    from courses.models import Course
+
+    return _course_feed(request, Course.objects.filter(status='published').order_by('-created_at'))
+
+
+def build_stats(request):
+    from django.contrib.auth.models import User
+
+    from courses.models import Course, Enrollment
+    from users.models import Instructor
+
+    return {
+        'total_courses': Course.objects.filter(status='published').count(),
+        'total_students': User.objects.filter(profile__status='Student').count(),
+        'total_instructors': Instructor.objects.count(),
+        'total_enrollments': Enrollment.objects.count(),
+    }
+
+
+def build_articles(request):
+    from articles.models import Article
+    from articles.serializers import ArticleSerializer
+
+    published = Article.objects.filter(status='published').select_related(
+        'author', 'author__profile'
+    ).prefetch_related('tags')
+    context = {'request': request}
+    return {
+        'featured': ArticleSerializer(published.filter(featured=True), many=True, context=context).data,
+        'recent': ArticleSerializer(published.order_by('-created_at')[:10], many=True, context=context).data,
+        'popular': ArticleSerializer(
+            published.order_by('-popularity_score', '-views_count')[:10], many=True, context=context
+        ).data,
+    }
+
+
+def _banners_ttl(ttl):
+    """Never keep banners past the next start/end boundary of the banner snapshot"""
+    from .banner_cache import seconds_until_change
+
+    remaining = seconds_until_change()
+    return ttl if remaining is None else max(1, min(ttl, int(remaining) + 1))
+
+
+# Fragment name -> callable capping its TTL
+TTL_LIMITS = {
+    'banners': _banners_ttl,
+}
+
+BUILDERS = {
+    'banners': build_banners,
+    'collections': build_collections,
+    'featured_courses': build_featured_courses,
+    'recent_courses': build_recent_courses,
+    'stats': build_stats,
+    'articles': build_articles,
+}
+
+
+# Cache plumbing ----------------------------------------------------------
+
+def _generation_key(name):
+    return f'{KEY_PREFIX}:gen:{name}'
+
+
+def _fragment_key(name, generation, origin):
+    return f'{KEY_PREFIX}:{name}:{generation}:{origin}'
+
+
+def _origin(request):
+    return hashlib.md5(request.build_absolute_uri('/').encode()).hexdigest()[:12]
+
+
+def _etag(data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True, ensure_ascii=False)
+    return hashlib.md5(payload.encode()).hexdigest()
+
+
+def invalidate(*names):
+    """Start a new generation for the given fragments (all when none given)"""
+    for name in names or BUILDERS:
+        key = _generation_key(name)
+        if not cache.add(key, 1, timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, timeout=None)
+
+
+def invalidate_for_model(model):
+    names = DEPENDENCIES.get(model._meta.label)
+    if names:
+        invalidate(*names)
+
+
+def _build(name, request, key):
+    data = json.loads(json.dumps(BUILDERS[name](request), cls=DjangoJSONEncoder))
+    ttl = fragment_ttl(name)
+    if name in TTL_LIMITS:
+        ttl = TTL_LIMITS[name](ttl)
+    entry = {
+        'data': data,
+        'etag': _etag(data),
+        'fresh_until': time.time() + ttl,
+    }
+    cache.set(key, entry, timeout=ttl + stale_ttl())
+    return entry
+
+
+def get_fragments(request, names=None):
+    """``{name: entry}`` for the requested fragments, rebuilding only what is needed"""
+    names = list(names or BUILDERS)
+    origin = _origin(request)
+    generations = cache.get_many([_generation_key(name) for name in names])
+    keys = {
+        name: _fragment_key(name, generations.get(_generation_key(name), 0), origin)
+        for name in names
+    }
+    cached = cache.get_many(list(keys.values()))
+
+    now = time.time()
+    entries = {}
+    for name, key in keys.items():
+        entry = cached.get(key)
+        if entry is None:
+            entry = _build(name, request, key)
+        elif entry['fresh_until'] <= now and cache.add(f'{key}:lock', 1, timeout=REBUILD_LOCK_TIMEOUT):
+            # Stale: this request revalidates, everyone else keeps the stale copy
+            try:
+                entry = _build(name, request, key)
+            finally:
+                cache.delete(f'{key}:lock')
+        entries[name] = entry
+    return entries
+
+
+def combined_etag(entries):
+    joined = ':'.join(f'{name}={entries[name]["etag"]}' for name in sorted(entries))
+    return '"%s"' % hashlib.md5(joined.encode()).hexdigest()
@@ -67,14 +67,9 @@ class Banner(models.Model):
     
     @classmethod
     def get_active_banners_by_type(cls, banner_type):
-        """Get active banners by type"""
-        return cls.objects.filter(
-            banner_type=banner_type,
-            is_active=True,
-            start_date__lte=timezone.now()
-        ).filter(
-            models.Q(end_date__isnull=True) | models.Q(end_date__gte=timezone.now())
-        ).order_by('display_order', '-created_at')
+        """Get active banners by type (a list served from the banner snapshot)"""
+        from .banner_cache import active_banners
+        return active_banners(banner_type)
     
     @classmethod
     def get_header_banners(cls):
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core.images import ImageVariantsField
 from .models import Banner, CourseCollection
 from courses.serializers import CourseBasicSerializer
 
@@ -6,12 +7,13 @@ from courses.serializers import CourseBasicSerializer
 class BannerSerializer(serializers.ModelSerializer):
     """Serializer for Banner model"""
     image_url = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
     is_active = serializers.BooleanField(read_only=True)
     
     class Meta:
         model = Banner
         fields = [
-            'id', 'title', 'description', 'image', 'image_url', 'url',
+            'id', 'title', 'description', 'image', 'image_url', 'image_variants', 'url',
             'is_active', 'banner_type', 'display_order',
             'start_date', 'end_date', 'button_text', 'button_url',
             'background_color', 'text_color', 'created_at', 'updated_at'
@@ -27,11 +29,12 @@ class BannerSerializer(serializers.ModelSerializer):
 class BannerByTypeSerializer(serializers.ModelSerializer):
     """Simplified serializer for banners by type"""
     image_url = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
     
     class Meta:
         model = Banner
         fields = [
-            'id', 'title', 'description', 'image_url', 'url',
+            'id', 'title', 'description', 'image_url', 'image_variants', 'url',
             'banner_type', 'display_order', 'button_text', 'button_url',
             'background_color', 'text_color'
         ]
@@ -0,0 +1,33 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from articles.models import Article
+from courses.models import Course
+
+from . import banner_cache, home
+from .models import Banner, CourseCollection
+
+
+@receiver(post_save, sender=Banner)
+@receiver(post_delete, sender=Banner)
+@receiver(post_save, sender=CourseCollection)
+@receiver(post_delete, sender=CourseCollection)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_home_fragments(sender, **kwargs):
+    """Drop the homepage fragments fed by the saved/deleted model"""
+    home.invalidate_for_model(sender)
+
+
+@receiver(post_save, sender=Banner)
+@receiver(post_delete, sender=Banner)
+def invalidate_banner_snapshot(sender, **kwargs):
+    banner_cache.invalidate()
+
+
+@receiver(m2m_changed, sender=CourseCollection.courses.through)
+def collection_courses_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        home.invalidate('collections')
@@ -0,0 +1,144 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from articles.models import Article
+from courses.models import Course
+from extras import banner_cache, home
+from extras.models import Banner, CourseCollection
+
+User = get_user_model()
+
+
+class HomeAggregateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('home')
+        author = User.objects.create_user(username='author', password='x')
+        self.course = Course.objects.create(
+            title='Course', description='Description', status='published', is_featured=True
+        )
+        self.collection = CourseCollection.objects.create(name='Collection', slug='collection')
+        self.collection.courses.add(self.course)
+        Banner.objects.create(title='Promo', banner_type='promo')
+        Article.objects.create(title='Article', content='content', author=author, status='published')
+
+    def test_aggregate_is_served_from_cache(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), set(home.BUILDERS))
+        self.assertEqual(len(response.data['banners']['promotional']), 1)
+        self.assertEqual(response.data['collections'][0]['courses'][0]['id'], self.course.pk)
+        self.assertEqual(response.data['stats']['total_courses'], 1)
+        self.assertIn('stale-while-revalidate', response['Cache-Control'])
+
+        with CaptureQueriesContext(connection) as queries:
+            again = self.client.get(self.url)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(again['ETag'], response['ETag'])
+
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_model_changes_invalidate_only_dependent_fragments(self):
+        self.client.get(self.url)
+        Banner.objects.create(title='Header', banner_type='header')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'sections': 'banners,stats'})
+        self.assertEqual(len(queries), 1)  # banners rebuilt, stats still cached
+        self.assertEqual(set(response.data), {'banners', 'stats'})
+        self.assertEqual(len(response.data['banners']['header']), 1)
+
+        self.course.title = 'Renamed'
+        self.course.save()
+        response = self.client.get(self.url, {'sections': 'collections'})
+        self.assertEqual(response.data['collections'][0]['courses'][0]['title'], 'Renamed')
+
+    def test_bulk_updates_invalidate_fragments(self):
+        admin_user = User.objects.create_superuser('root', 'root@example.com', 'x')
+        self.client.get(self.url)
+
+        self.client.force_authenticate(admin_user)
+        response = self.client.post(
+            reverse('bulk-update-course-status', args=['unfeature']), {'course_ids': [self.course.pk]}, format='json'
+        )
+        self.assertEqual(response.data['updated_count'], 1)
+        self.assertEqual(self.client.get(self.url).data['featured_courses'], [])
+
+        self.client.force_login(admin_user)
+        changelist = reverse('admin:articles_article_changelist')
+        article = Article.objects.get()
+        self.client.post(changelist, {'action': 'make_featured', '_selected_action': [article.pk]})
+        self.assertEqual(len(self.client.get(self.url).data['articles']['featured']), 1)
+        self.client.post(changelist, {'action': 'unpublish_articles', '_selected_action': [article.pk]})
+        self.assertEqual(self.client.get(self.url).data['articles']['recent'], [])
+
+    def test_stale_fragment_is_served_while_another_request_rebuilds(self):
+        self.client.get(self.url)
+        request = RequestFactory().get(self.url)
+        generation = cache.get(home._generation_key('stats'), 0)
+        key = home._fragment_key('stats', generation, home._origin(request))
+        later = time.time() + home.fragment_ttl('stats') + 1
+
+        with mock.patch('extras.home.time.time', return_value=later):
+            # Another request holds the rebuild lock: serve the stale copy
+            cache.add(f'{key}:lock', 1)
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(self.url, {'sections': 'stats'})
+            self.assertEqual(len(queries), 0)
+
+            cache.delete(f'{key}:lock')
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(self.url, {'sections': 'stats'})
+            self.assertGreater(len(queries), 0)
+        self.assertGreater(cache.get(key)['fresh_until'], later)
+
+
+class BannerSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        banner_cache._local.clear()
+        self.client = APIClient()
+        now = timezone.now()
+        self.current = Banner.objects.create(title='Current', banner_type='header', end_date=now + timedelta(hours=1))
+        self.upcoming = Banner.objects.create(title='Upcoming', banner_type='header', start_date=now + timedelta(minutes=30))
+        Banner.objects.create(title='Expired', banner_type='header', end_date=now - timedelta(minutes=1))
+        Banner.objects.create(title='Disabled', banner_type='header', is_active=False)
+
+    def _titles(self, **kwargs):
+        return [banner.title for banner in banner_cache.active_banners('header', **kwargs)]
+
+    def test_snapshot_follows_time_window_boundaries(self):
+        now = timezone.now()
+        self.assertEqual(self._titles(now=now), ['Current'])
+        self.assertAlmostEqual(banner_cache.seconds_until_change(now=now), 30 * 60, delta=5)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self._titles(now=now + timedelta(minutes=29)), ['Current'])
+        self.assertEqual(len(queries), 0)
+
+        self.assertEqual(set(self._titles(now=now + timedelta(minutes=31))), {'Current', 'Upcoming'})
+        self.assertEqual(self._titles(now=now + timedelta(hours=2)), ['Upcoming'])
+
+    def test_banner_endpoints_use_snapshot_and_see_edits(self):
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'x'))
+        url = reverse('banner-header')
+        self.assertEqual([b['title'] for b in self.client.get(url).data], ['Current'])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertEqual(len(queries), 0)
+
+        self.current.is_active = False
+        self.current.save()
+        self.assertEqual(self.client.get(url).data, [])
@@ -1,6 +1,7 @@
 from rest_framework import viewsets, status, filters, generics
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny, IsAdminUser
 from django.utils import timezone
 from django.db.models import Q, Count
@@ -10,9 +11,13 @@ from django.contrib.auth.decorators import user_passes_test
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 
 from courses.models import Course
 
+from . import banner_cache, home
 from .models import Banner, CourseCollection
 from .serializers import (
     BannerSerializer,
@@ -65,14 +70,8 @@ class BannerViewSet(viewsets.ModelViewSet):
         Get all active banners that should be displayed now.
         Returns paginated results if page size is specified, otherwise returns all results.
         """
-        now = timezone.now()
-        queryset = self.get_queryset().filter(
-            is_active=True,
-            start_date__lte=now,
-        ).filter(Q(end_date__isnull=True) | Q(end_date__gte=now))
-        
-        # Order by display_order and then by creation date
-        queryset = queryset.order_by('display_order', '-created_at')
+        # Served from the banner snapshot (already ordered by display order)
+        queryset = banner_cache.active_banners()
         
         # Check if pagination is requested
         page_size = self.request.query_params.get('page_size')
@@ -92,15 +91,7 @@ class BannerViewSet(viewsets.ModelViewSet):
         """
         Get all active promotional banners for displaying between course collections.
         """
-        now = timezone.now()
-        queryset = self.get_queryset().filter(
-            is_active=True,
-            banner_type='promo',
-            start_date__lte=now,
-        ).filter(Q(end_date__isnull=True) | Q(end_date__gte=now))
-        
-        # Order by display_order and then by creation date
-        queryset = queryset.order_by('display_order', '-created_at')
+        queryset = banner_cache.active_banners('promo')
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
@@ -125,15 +116,7 @@ class BannerViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        now = timezone.now()
-        queryset = self.get_queryset().filter(
-            banner_type=banner_type,
-            is_active=True,
-            start_date__lte=now,
-        ).filter(Q(end_date__isnull=True) | Q(end_date__gte=now))
-        
-        # Order by display_order and then by creation date
-        queryset = queryset.order_by('display_order', '-created_at')
+        queryset = banner_cache.active_banners(banner_type)
         
         # Use simplified serializer for public API
         serializer = BannerByTypeSerializer(queryset, many=True, context={'request': request})
@@ -144,14 +127,7 @@ class BannerViewSet(viewsets.ModelViewSet):
         """
         Get header banners specifically
         """
-        now = timezone.now()
-        queryset = self.get_queryset().filter(
-            banner_type='header',
-            is_active=True,
-            start_date__lte=now,
-        ).filter(Q(end_date__isnull=True) | Q(end_date__gte=now))
-        
-        queryset = queryset.order_by('display_order', '-created_at')
+        queryset = banner_cache.active_banners('header')
         serializer = BannerByTypeSerializer(queryset, many=True, context={'request': request})
         return Response(serializer.data)
     
@@ -160,14 +136,7 @@ class BannerViewSet(viewsets.ModelViewSet):
         """
         Get about us banners specifically
         """
-        now = timezone.now()
-        queryset = self.get_queryset().filter(
-            banner_type='about_us',
-            is_active=True,
-            start_date__lte=now,
-        ).filter(Q(end_date__isnull=True) | Q(end_date__gte=now))
-        
-        queryset = queryset.order_by('display_order', '-created_at')
+        queryset = banner_cache.active_banners('about_us')
         serializer = BannerByTypeSerializer(queryset, many=True, context={'request': request})
         return Response(serializer.data)
     
@@ -176,14 +145,7 @@ class BannerViewSet(viewsets.ModelViewSet):
         """
         Get why choose us banners specifically
         """
-        now = timezone.now()
-        queryset = self.get_queryset().filter(
-            banner_type='why_choose_us',
-            is_active=True,
-            start_date__lte=now,
-        ).filter(Q(end_date__isnull=True) | Q(end_date__gte=now))
-        
-        queryset = queryset.order_by('display_order', '-created_at')
+        queryset = banner_cache.active_banners('why_choose_us')
         serializer = BannerByTypeSerializer(queryset, many=True, context={'request': request})
         return Response(serializer.data)
 
@@ -231,6 +193,35 @@ class CourseCollectionViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
+class HomeView(APIView):
+    """
+    Homepage aggregate: banners, collections, course/article feeds and site
+    stats in one response, composed from cached fragments (see extras.home).
+    The payload is the same for every visitor, so no authentication runs.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        sections = request.query_params.get('sections')
+        names = [name for name in sections.split(',') if name in home.BUILDERS] if sections else None
+        entries = home.get_fragments(request, names)
+        etag = home.combined_etag(entries)
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({name: entry['data'] for name, entry in entries.items()})
+        response['ETag'] = etag
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=settings.HOME_CACHE.get('MAX_AGE', 60),
+            stale_while_revalidate=settings.HOME_CACHE.get('STALE_TTL', 600),
+        )
+        return response
+
+
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def toggle_course_featured_status(request, course_id, action):
@@ -285,6 +276,8 @@ def bulk_update_course_status(request, action):
             status=status.HTTP_400_BAD_REQUEST
         )
     
+    # queryset.update() sends no post_save, so the homepage receivers never see it
+    home.invalidate_for_model(Course)
     return Response({'success': True, 'message': message, 'updated_count': updated})
 
 
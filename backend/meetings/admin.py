@@ -3,9 +3,10 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.contrib.admin import SimpleListFilter
-from django.db.models import Count, Avg
+from django.db.models import OuterRef
 from django.utils import timezone
 from datetime import timedelta
+from core.aggregates import count_subquery
 from .models import Meeting, Participant, Notification, MeetingChat
 
 
@@ -142,12 +143,14 @@ class MeetingAdmin(admin.ModelAdmin):
     status_display.short_description = 'الحالة'
     
     def participants_count(self, obj):
-        count = obj.participants.count()
+        # Annotated by Meeting.objects.with_listing_stats()
+        count = obj.participants_count
         if count > 0:
             url = reverse('admin:meetings_participant_changelist') + f'?meeting__id__exact={obj.id}'
             return format_html('<a href="{}">{} مشارك</a>', url, count)
         return '0 مشارك'
     participants_count.short_description = 'المشاركين'
+    participants_count.admin_order_field = 'participants_count'
     
     def attendance_rate_display(self, obj):
         try:
@@ -174,7 +177,7 @@ class MeetingAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        return queryset.select_related('creator').prefetch_related('participants')
+        return queryset.with_listing_stats()
     
     actions = ['start_live_meetings', 'end_live_meetings', 'send_reminders']
     
@@ -311,9 +314,9 @@ class NotificationAdmin(admin.ModelAdmin):
     meeting_title.short_description = 'الاجتماع'
     
     def recipients_count(self, obj):
-        count = obj.recipients.count()
-        return f'{count} مستلم'
+        return f'{obj.recipients_total} مستلم'
     recipients_count.short_description = 'عدد المستلمين'
+    recipients_count.admin_order_field = 'recipients_total'
     
     def sent_status(self, obj):
         if obj.sent:
@@ -326,7 +329,10 @@ class NotificationAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        return queryset.select_related('meeting').prefetch_related('recipients')
+        recipients = Notification.recipients.through.objects.filter(notification=OuterRef('pk'))
+        return queryset.select_related('meeting').annotate(
+            recipients_total=count_subquery(recipients, 'notification')
+        )
     
     actions = ['send_notifications']
     
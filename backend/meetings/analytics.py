@@ -0,0 +1,126 @@
+"""
+Meeting attendance analytics.
+
+All attendance buckets come from a single conditional-aggregate query over
+``Participant``. Once a meeting has ended its numbers no longer change in
+normal operation, so they are cached per meeting; any participant write for
+that meeting drops the cached entry (see the receivers in ``models.py``).
+
+The detailed attendance report can be streamed as CSV or JSON lines so that
+large webinars are never materialized as one in-memory list.
+"""
+import csv
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Q
+from django.utils import timezone
+
+CACHE_KEY = 'meetings:analytics:{meeting_id}'
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# Report field name -> Participant lookup
+REPORT_FIELDS = {
+    'id': 'id',
+    'user_id': 'user_id',
+    'username': 'user__username',
+    'first_name': 'user__first_name',
+    'last_name': 'user__last_name',
+    'email': 'user__email',
+    'attendance_status': 'attendance_status',
+    'is_attending': 'is_attending',
+    'joined_at': 'joined_at',
+    'left_at': 'left_at',
+    'attendance_time': 'attendance_time',
+    'exit_time': 'exit_time',
+    'attendance_duration': 'attendance_duration',
+}
+
+
+def attendance_rate(attended, total):
+    return round(attended / total * 100, 2) if total else 0
+
+
+def has_ended(meeting):
+    return bool(meeting.live_ended_at) or meeting.end_time < timezone.now()
+
+
+def compute_attendance_stats(meeting_id):
+    """Every attendance bucket of one meeting in a single aggregate query"""
+    from .models import Participant
+
+    stats = Participant.objects.filter(meeting_id=meeting_id).aggregate(
+        total=Count('id'),
+        present=Count('id', filter=Q(attendance_status='present')),
+        absent=Count('id', filter=Q(attendance_status='absent')),
+        late=Count('id', filter=Q(attendance_status='late')),
+        not_marked=Count('id', filter=Q(attendance_status='registered')),
+        attending=Count('id', filter=Q(is_attending=True)),
+        live=Count('id', filter=Q(
+            is_attending=True, attendance_time__isnull=False, exit_time__isnull=True
+        )),
+    )
+    stats['attendance_rate'] = attendance_rate(stats['present'] + stats['late'], stats['total'])
+    return stats
+
+
+def get_attendance_stats(meeting):
+    """Attendance buckets for a meeting, served from the cache once it has ended"""
+    if not has_ended(meeting):
+        return compute_attendance_stats(meeting.pk)
+
+    key = CACHE_KEY.format(meeting_id=meeting.pk)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_attendance_stats(meeting.pk)
+        cache.set(key, stats, CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate(meeting_id):
+    cache.delete(CACHE_KEY.format(meeting_id=meeting_id))
+
+
+def iter_report_rows(meeting, chunk_size=1000):
+    """Participant report rows as dicts, fetched in chunks with a server-side cursor"""
+    from .models import Participant
+
+    rows = (
+        Participant.objects.filter(meeting=meeting)
+        .order_by('id')
+        .values_list(*REPORT_FIELDS.values())
+    )
+    names = list(REPORT_FIELDS)
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield dict(zip(names, row))
+
+
+class _Echo:
+    """File-like object whose write() returns the line for csv.writer"""
+    def write(self, value):
+        return value
+
+
+def stream_report_csv(meeting):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(list(REPORT_FIELDS))
+    for row in iter_report_rows(meeting):
+        yield writer.writerow([_csv_value(value) for value in row.values()])
+
+
+def stream_report_jsonl(meeting):
+    yield json.dumps(
+        {'meeting_id': meeting.pk, 'statistics': get_attendance_stats(meeting)},
+        cls=DjangoJSONEncoder, ensure_ascii=False,
+    ) + '\n'
+    for row in iter_report_rows(meeting):
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
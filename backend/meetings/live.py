@@ -0,0 +1,225 @@
+"""
+Live-meeting join/leave with atomic capacity enforcement.
+
+``Meeting.live_attendees_count`` is the number of participants currently
+marked as attending. A join reserves a seat with one conditional UPDATE
+(``... SET live_attendees_count = live_attendees_count + 1 WHERE
+live_attendees_count < max_participants``), so concurrent joins can never
+push the meeting over capacity, and records attendance with one UPDATE on
+the participant row. Both run in the same transaction: if no seat is
+available the attendance update is rolled back.
+
+When a meeting ends, ``finalize_attendance()`` closes every open attendance
+and marks no-shows absent with set-based UPDATEs. ``end_live`` schedules it
+with ``schedule_finalization()`` so the request returns immediately. That job
+lives in process memory and is lost on a restart, so the
+``finalize_ended_meetings`` management command (run periodically, e.g. from
+cron) sweeps ended meetings that were left unfinalized.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, models, transaction
+from django.db.models import Count, Exists, ExpressionWrapper, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import analytics
+
+logger = logging.getLogger(__name__)
+
+JOINED = 'joined'
+ALREADY_JOINED = 'already_joined'
+FULL = 'full'
+NOT_REGISTERED = 'not_registered'
+
+# Joining later than this after the start time marks the attendee as late
+LATE_AFTER = timedelta(minutes=15)
+
+
+def join(meeting, user, now=None, track_lateness=True):
+    """Mark ``user`` as attending ``meeting`` if a seat is free.
+
+    Returns ``(result, participant_id, attendance_status)`` where ``result``
+    is one of ``JOINED``, ``ALREADY_JOINED``, ``FULL`` or ``NOT_REGISTERED``.
+    """
+    from .models import Meeting, Participant
+
+    now = now or timezone.now()
+    attendance_status = 'present'
+    if track_lateness and now > meeting.start_time + LATE_AFTER:
+        attendance_status = 'late'
+
+    with transaction.atomic():
+        joined = Participant.objects.filter(
+            meeting_id=meeting.pk, user=user, is_attending=False
+        ).update(
+            is_attending=True,
+            attendance_time=now,
+            attendance_status=attendance_status,
+            exit_time=None,
+            attendance_duration=None,
+        )
+        if joined:
+            seat = Meeting.objects.filter(
+                pk=meeting.pk, live_attendees_count__lt=F('max_participants')
+            ).update(live_attendees_count=F('live_attendees_count') + 1)
+            if not seat:
+                transaction.set_rollback(True)
+                return FULL, None, None
+
+        participant = Participant.objects.filter(
+            meeting_id=meeting.pk, user=user
+        ).values_list('pk', 'attendance_status').first()
+
+    if joined:
+        analytics.invalidate(meeting.pk)
+
+    if participant is None:
+        return NOT_REGISTERED, None, None
+    return (JOINED if joined else ALREADY_JOINED), participant[0], participant[1]
+
+
+def leave(meeting, user, now=None):
+    """Mark ``user`` as having left.
+
+    Returns ``(left, attendance_duration)``; ``left`` is False when the user
+    was not attending.
+    """
+    from .models import Meeting, Participant
+
+    now = now or timezone.now()
+    with transaction.atomic():
+        left = Participant.objects.filter(
+            meeting_id=meeting.pk, user=user, is_attending=True
+        ).update(
+            is_attending=False,
+            exit_time=now,
+            attendance_duration=_duration_until(now),
+        )
+        if not left:
+            return False, None
+        Meeting.objects.filter(pk=meeting.pk, live_attendees_count__gt=0).update(
+            live_attendees_count=F('live_attendees_count') - 1
+        )
+    analytics.invalidate(meeting.pk)
+    return True, Participant.objects.filter(
+        meeting_id=meeting.pk, user=user
+    ).values_list('attendance_duration', flat=True).first()
+
+
+def _duration_until(moment):
+    return ExpressionWrapper(
+        Value(moment, output_field=models.DateTimeField()) - F('attendance_time'),
+        output_field=models.DurationField(),
+    )
+
+
+def recount(meeting_ids):
+    """Resynchronize ``live_attendees_count`` from the participant rows.
+
+    Used after writes that change ``is_attending`` outside join()/leave(),
+    e.g. an instructor editing attendance or the end-of-meeting finalizer.
+    """
+    from .models import Meeting, Participant
+
+    attending = (
+        Participant.objects.filter(meeting=OuterRef('pk'), is_attending=True)
+        .order_by().values('meeting').annotate(count=Count('pk')).values('count')
+    )
+    Meeting.objects.filter(pk__in=meeting_ids).update(
+        live_attendees_count=Coalesce(Subquery(attending, output_field=models.IntegerField()), Value(0))
+    )
+
+
+def mark_absent(meeting_id):
+    """Mark every participant who never attended as absent; returns the count"""
+    from .models import Participant
+
+    absent = Participant.objects.filter(
+        meeting_id=meeting_id, attendance_status='registered'
+    ).update(attendance_status='absent')
+    if absent:
+        analytics.invalidate(meeting_id)
+    return absent
+
+
+def finalize_attendance(meeting_id, ended_at=None):
+    """Close every open attendance at ``ended_at`` and mark no-shows absent.
+
+    Returns ``(exited, absent)`` participant counts.
+    """
+    from .models import Meeting, Participant
+
+    ended_at = ended_at or timezone.now()
+    with transaction.atomic():
+        exited = Participant.objects.filter(
+            meeting_id=meeting_id, is_attending=True, exit_time__isnull=True
+        ).update(
+            is_attending=False,
+            exit_time=ended_at,
+            attendance_duration=_duration_until(ended_at),
+        )
+        absent = mark_absent(meeting_id)
+        Meeting.objects.filter(pk=meeting_id).update(live_attendees_count=0)
+    analytics.invalidate(meeting_id)
+    return exited, absent
+
+
+def finalize_ended_meetings():
+    """Finalize every ended meeting that still has open attendances or no-shows.
+
+    Recovers finalizations lost with the background worker (restart, deploy,
+    crash); finalizing is idempotent, so racing the worker is harmless.
+    Returns the number of meetings finalized.
+    """
+    from .models import Meeting, Participant
+
+    unfinalized = Participant.objects.filter(
+        Q(is_attending=True) | Q(attendance_status='registered'), meeting=OuterRef('pk')
+    )
+    pending = Meeting.objects.filter(live_ended_at__isnull=False).filter(
+        Exists(unfinalized)
+    ).values_list('pk', 'live_ended_at')
+    finalized = 0
+    for meeting_id, ended_at in pending:
+        try:
+            finalize_attendance(meeting_id, ended_at)
+        except Exception:
+            logger.exception('Error finalizing attendance of meeting %s', meeting_id)
+            continue
+        finalized += 1
+    return finalized
+
+
+_executor = None
+
+
+def _run_finalization(meeting_id, ended_at):
+    close_old_connections()
+    try:
+        finalize_attendance(meeting_id, ended_at)
+    except Exception:
+        logger.exception('Error finalizing attendance of meeting %s', meeting_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_finalization(meeting_id, ended_at):
+    """Run finalize_attendance() once the current transaction commits.
+
+    With ``MEETING_FINALIZE_ASYNC`` it runs on a single background worker
+    thread, so the calling request does not wait for the participant writes.
+    """
+    def run():
+        global _executor
+        if not getattr(settings, 'MEETING_FINALIZE_ASYNC', True):
+            finalize_attendance(meeting_id, ended_at)
+            return
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='meeting-finalize')
+        _executor.submit(_run_finalization, meeting_id, ended_at)
+
+    transaction.on_commit(run)
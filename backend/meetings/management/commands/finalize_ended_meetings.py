@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from meetings.live import finalize_ended_meetings
+
+
+class Command(BaseCommand):
+    help = 'Finalize attendance of ended live meetings left open (run periodically, e.g. every few minutes)'
+
+    def handle(self, *args, **options):
+        finalized = finalize_ended_meetings()
+        self.stdout.write(self.style.SUCCESS(f'Finalized {finalized} meetings'))
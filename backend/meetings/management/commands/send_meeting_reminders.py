@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from meetings.reminders import dispatch_due_reminders
+
+
+class Command(BaseCommand):
+    help = 'Send due meeting reminders/notifications in batches (run periodically, e.g. every minute)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of notifications loaded and sent per batch',
+        )
+
+    def handle(self, *args, **options):
+        sent = dispatch_due_reminders(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} meeting notifications'))
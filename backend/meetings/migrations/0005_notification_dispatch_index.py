@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetings', '0004_participant_attendance_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['sent', 'scheduled_time'], name='meetings_no_sent_b48034_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:39
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_live_attendees(apps, schema_editor):
+    Meeting = apps.get_model('meetings', 'Meeting')
+    Participant = apps.get_model('meetings', 'Participant')
+
+    attending = (
+        Participant.objects.filter(is_attending=True)
+        .values('meeting_id').annotate(count=Count('id'))
+    )
+    for row in attending:
+        Meeting.objects.filter(pk=row['meeting_id']).update(live_attendees_count=row['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetings', '0005_notification_dispatch_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meeting',
+            name='live_attendees_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='عدد الحاضرين حالياً'),
+        ),
+        migrations.RunPython(backfill_live_attendees, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,32 @@
 from datetime import datetime, timedelta
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Exists, F, OuterRef, Value
 from django.contrib.auth.models import User
 from django_ckeditor_5.fields import CKEditor5Field
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils.functional import cached_property
+from core.aggregates import count_subquery
 from users.models import Organization, Instructor, Student
 
 
+class MeetingQuerySet(models.QuerySet):
+    def with_listing_stats(self, user=None):
+        """إضافة عدد المشاركين والحضور وحالة تسجيل المستخدم الحالي في استعلام واحد"""
+        participants = Participant.objects.filter(meeting=OuterRef('pk'))
+        if user is not None and user.is_authenticated:
+            viewer_registered = Exists(participants.filter(user=user))
+        else:
+            viewer_registered = Value(False, output_field=models.BooleanField())
+        return self.select_related('creator__profile').annotate(
+            participants_count=count_subquery(participants, 'meeting'),
+            attending_count=count_subquery(participants.filter(is_attending=True), 'meeting'),
+            viewer_registered=viewer_registered,
+        )
+
+
 class Meeting(models.Model):
     MEETING_TYPES = (
         ('ZOOM', 'اجتماع عبر زووم'),
@@ -38,6 +58,7 @@ class Meeting(models.Model):
     live_started_at = models.DateTimeField(blank=True, null=True, verbose_name="وقت بدء الاجتماع المباشر")
     live_ended_at = models.DateTimeField(blank=True, null=True, verbose_name="وقت انتهاء الاجتماع المباشر")
     max_participants = models.IntegerField(default=50, verbose_name="الحد الأقصى للمشاركين")
+    live_attendees_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="عدد الحاضرين حالياً")
     enable_screen_share = models.BooleanField(default=True, verbose_name="تمكين مشاركة الشاشة")
     enable_chat = models.BooleanField(default=True, verbose_name="تمكين الدردشة")
     enable_recording = models.BooleanField(default=False, verbose_name="تمكين التسجيل")
@@ -45,6 +66,8 @@ class Meeting(models.Model):
     updated_at = models.DateTimeField(auto_now=True, verbose_name="تاريخ التحديث")
     notification_task_id = models.CharField(max_length=255, blank=True, null=True)
 
+    objects = MeetingQuerySet.as_manager()
+
     class Meta:
         verbose_name = "اجتماع"
         verbose_name_plural = "الاجتماعات"
@@ -76,12 +99,22 @@ class Meeting(models.Model):
     @property
     def attendance_rate(self):
         """حساب معدل الحضور"""
-        total_participants = self.participants.count()
+        if hasattr(self, 'participants_count') and hasattr(self, 'attending_count'):
+            # Annotated by Meeting.objects.with_listing_stats()
+            total_participants, attending_participants = self.participants_count, self.attending_count
+        else:
+            stats = self.attendance_stats
+            total_participants, attending_participants = stats['total'], stats['attending']
         if total_participants == 0:
             return 0
-        attending_participants = self.participants.filter(is_attending=True).count()
         return (attending_participants / total_participants) * 100
 
+    @cached_property
+    def attendance_stats(self):
+        """جميع إحصائيات الحضور في استعلام واحد (مخزنة مؤقتاً بعد انتهاء الاجتماع)"""
+        from .analytics import get_attendance_stats
+        return get_attendance_stats(self)
+
     def get_participants(self):
         """الحصول على قائمة المشاركين"""
         return self.participants.all()
@@ -112,13 +145,12 @@ class Meeting(models.Model):
     def end_live_meeting(self):
         """إنهاء الاجتماع المباشر"""
         if self.is_live_started:
+            from .live import schedule_finalization
             self.live_ended_at = timezone.now()
             self.save(update_fields=['live_ended_at'])
             
-            # تحديث مدة الحضور للمشاركين المتصلين
-            active_participants = self.participants.filter(is_attending=True, exit_time__isnull=True)
-            for participant in active_participants:
-                participant.mark_exit()
+            # إغلاق الحضور وتسجيل الغياب دفعة واحدة بعد حفظ الإنهاء
+            schedule_finalization(self.pk, self.live_ended_at)
 
     @property
     def can_join_live(self):
@@ -138,40 +170,31 @@ class Meeting(models.Model):
         """عدد المشاركين المتصلين حالياً"""
         if not self.is_live_started:
             return 0
-        return self.participants.filter(
-            is_attending=True,
-            attendance_time__isnull=False,
-            exit_time__isnull=True
-        ).count()
+        return self.live_attendees_count
 
     def setup_notifications(self):
-        """إعداد الإشعارات التلقائية"""
-        # إشعار قبل يوم واحد
-        day_before = self.start_time - timedelta(days=1)
-        if day_before > timezone.now():
-            Notification.create_for_meeting(
-                meeting=self,
-                notification_type='DAY_BEFORE',
-                message=f"تذكير: اجتماع '{self.title}' غداً في تمام الساعة {self.start_time.strftime('%H:%M')}",
-                scheduled_time=day_before
-            )
-        
-        # إشعار قبل ساعة واحدة
-        hour_before = self.start_time - timedelta(hours=1)
-        if hour_before > timezone.now():
-            Notification.create_for_meeting(
-                meeting=self,
-                notification_type='HOUR_BEFORE',
-                message=f"تذكير: اجتماع '{self.title}' خلال ساعة واحدة",
-                scheduled_time=hour_before
-            )
+        """إعداد الإشعارات التلقائية (تستبدل التذكيرات غير المرسلة)"""
+        from .reminders import schedule_meeting_reminders
+        return schedule_meeting_reminders(self)
 
     def save(self, *args, **kwargs):
+        previous_start_time = None
+        if self.pk:
+            previous_start_time = Meeting.objects.filter(pk=self.pk).values_list('start_time', flat=True).first()
+        created = self._state.adding
+        if not created and kwargs.get('update_fields') is None:
+            # live_attendees_count only changes through atomic UPDATEs (meetings.live);
+            # a full save must not write back the value loaded with this instance
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'live_attendees_count'
+            ]
+
         super().save(*args, **kwargs)
-        # إعداد الإشعارات عند إنشاء اجتماع جديد
-        if not hasattr(self, '_notifications_setup'):
+
+        # التذكيرات تُنشأ فقط عند إنشاء الاجتماع أو إعادة جدولته
+        if created or previous_start_time != self.start_time:
             self.setup_notifications()
-            self._notifications_setup = True
 
 
 class Participant(models.Model):
@@ -212,7 +235,11 @@ class Participant(models.Model):
             self.is_attending = True
             self.attendance_time = timezone.now()
             self.attendance_status = 'present'
-            self.save(update_fields=['is_attending', 'attendance_time', 'attendance_status'])
+            with transaction.atomic():
+                self.save(update_fields=['is_attending', 'attendance_time', 'attendance_status'])
+                Meeting.objects.filter(pk=self.meeting_id).update(
+                    live_attendees_count=F('live_attendees_count') + 1
+                )
 
     def mark_exit(self):
         """تسجيل المغادرة"""
@@ -221,7 +248,11 @@ class Participant(models.Model):
             self.is_attending = False
             if self.attendance_time:
                 self.attendance_duration = self.exit_time - self.attendance_time
-            self.save(update_fields=['exit_time', 'is_attending', 'attendance_duration'])
+            with transaction.atomic():
+                self.save(update_fields=['exit_time', 'is_attending', 'attendance_duration'])
+                Meeting.objects.filter(pk=self.meeting_id, live_attendees_count__gt=0).update(
+                    live_attendees_count=F('live_attendees_count') - 1
+                )
 
     @property
     def attendance_status_display(self):
@@ -240,6 +271,22 @@ class Participant(models.Model):
             return "غير محدد"
 
 
+@receiver([post_save, post_delete], sender=Participant)
+def invalidate_meeting_analytics(sender, instance, **kwargs):
+    """إلغاء إحصائيات الحضور المخزنة عند تغيير أي مشارك"""
+    from .analytics import invalidate
+    invalidate(instance.meeting_id)
+
+
+@receiver(post_delete, sender=Participant)
+def release_live_seat(sender, instance, **kwargs):
+    """تحرير مقعد المشارك الحاضر عند حذفه (من لوحة الإدارة أو بحذف المستخدم)"""
+    if instance.is_attending:
+        Meeting.objects.filter(pk=instance.meeting_id, live_attendees_count__gt=0).update(
+            live_attendees_count=F('live_attendees_count') - 1
+        )
+
+
 class Notification(models.Model):
     NOTIFICATION_TYPES = (
         ('DAY_BEFORE', 'قبل يوم'),
@@ -262,6 +309,9 @@ class Notification(models.Model):
         verbose_name = "إشعار"
         verbose_name_plural = "الإشعارات"
         ordering = ['-scheduled_time']
+        indexes = [
+            models.Index(fields=['sent', 'scheduled_time']),
+        ]
 
     def __str__(self):
         return f"{self.get_notification_type_display()} - {self.meeting.title}"
@@ -294,13 +344,9 @@ class Notification(models.Model):
             scheduled_time=scheduled_time
         )
         
-        # إضافة جميع المشاركين كمستلمين
-        participants = meeting.participants.all()
-        for participant in participants:
-            notification.recipients.add(participant.user)
-        
-        # إضافة منشئ الاجتماع أيضاً
-        notification.recipients.add(meeting.creator)
+        # إضافة جميع المشاركين ومنشئ الاجتماع كمستلمين في إدخال واحد
+        from .reminders import add_recipients
+        add_recipients([notification])
         
         return notification
 
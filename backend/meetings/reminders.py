@@ -0,0 +1,108 @@
+"""
+Meeting reminder scheduling and dispatch.
+
+Reminders (``DAY_BEFORE``/``HOUR_BEFORE`` notifications) are created when a
+meeting is created or rescheduled, never on ordinary edits. Recipients are
+written with one bulk insert on the M2M through table, and refreshed the
+same way right before dispatch so participants who registered after the
+reminder was scheduled still receive it.
+
+``dispatch_due_reminders()`` is meant to run periodically (the
+``send_meeting_reminders`` management command, e.g. from cron).
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+REMINDER_TYPES = ('DAY_BEFORE', 'HOUR_BEFORE')
+
+
+def reminder_specs(meeting):
+    """``(notification_type, scheduled_time, message)`` for each reminder of a meeting"""
+    return [
+        (
+            'DAY_BEFORE',
+            meeting.start_time - timedelta(days=1),
+            f"تذكير: اجتماع '{meeting.title}' غداً في تمام الساعة {meeting.start_time.strftime('%H:%M')}",
+        ),
+        (
+            'HOUR_BEFORE',
+            meeting.start_time - timedelta(hours=1),
+            f"تذكير: اجتماع '{meeting.title}' خلال ساعة واحدة",
+        ),
+    ]
+
+
+def add_recipients(notifications):
+    """Add each meeting's participants and creator as recipients in one bulk insert.
+
+    Existing (notification, user) pairs are skipped by the unique constraint
+    of the through table, so this is safe to call again before sending.
+    """
+    from .models import Notification, Participant
+
+    notifications = list(notifications)
+    if not notifications:
+        return
+    meeting_ids = {notification.meeting_id for notification in notifications}
+    users_by_meeting = {}
+    for meeting_id, user_id in Participant.objects.filter(
+        meeting_id__in=meeting_ids
+    ).values_list('meeting_id', 'user_id'):
+        users_by_meeting.setdefault(meeting_id, set()).add(user_id)
+
+    through = Notification.recipients.through
+    through.objects.bulk_create(
+        [
+            through(notification_id=notification.pk, user_id=user_id)
+            for notification in notifications
+            for user_id in users_by_meeting.get(notification.meeting_id, set()) | {notification.meeting.creator_id}
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def schedule_meeting_reminders(meeting):
+    """(Re)create the future reminders of a meeting, replacing any unsent ones"""
+    from .models import Notification
+
+    now = timezone.now()
+    with transaction.atomic():
+        Notification.objects.filter(
+            meeting=meeting, notification_type__in=REMINDER_TYPES, sent=False
+        ).delete()
+        reminders = Notification.objects.bulk_create([
+            Notification(
+                meeting=meeting,
+                notification_type=notification_type,
+                message=message,
+                scheduled_time=scheduled_time,
+            )
+            for notification_type, scheduled_time, message in reminder_specs(meeting)
+            if scheduled_time > now
+        ])
+        add_recipients(reminders)
+    return reminders
+
+
+def dispatch_due_reminders(now=None, batch_size=100):
+    """Send every due, unsent meeting notification in batches; returns the number sent"""
+    from .models import Notification
+
+    now = now or timezone.now()
+    sent = 0
+    last_id = 0
+    while True:
+        batch = list(
+            Notification.objects.filter(sent=False, scheduled_time__lte=now, pk__gt=last_id)
+            .select_related('meeting')
+            .order_by('pk')[:batch_size]
+        )
+        if not batch:
+            return sent
+        last_id = batch[-1].pk
+        with transaction.atomic():
+            add_recipients(n for n in batch if n.notification_type in REMINDER_TYPES)
+            for notification in batch:
+                sent += notification.send()
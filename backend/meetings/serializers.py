@@ -7,6 +7,15 @@ from datetime import datetime, timedelta
 from users.models import Profile
 
 
+def viewer_is_registered(meeting, request):
+    """Whether the requesting user is a participant, preferring the listing annotation"""
+    if not (request and request.user.is_authenticated):
+        return False
+    if hasattr(meeting, 'viewer_registered'):
+        return meeting.viewer_registered
+    return meeting.participants.filter(user=request.user).exists()
+
+
 class MeetingBasicSerializer(serializers.ModelSerializer):
     """Serializer for basic meeting information"""
     creator_name = serializers.CharField(source='creator.profile.name', read_only=True)
@@ -52,13 +61,13 @@ class MeetingBasicSerializer(serializers.ModelSerializer):
         return None
     
     def get_participants_count(self, obj):
+        # Annotated by Meeting.objects.with_listing_stats()
+        if hasattr(obj, 'participants_count'):
+            return obj.participants_count
         return obj.participants.count()
     
     def get_user_is_registered(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.participants.filter(user=request.user).exists()
-        return False
+        return viewer_is_registered(obj, self.context.get('request'))
     
     def get_status(self, obj):
         now = timezone.now()
@@ -138,10 +147,7 @@ class MeetingDetailSerializer(serializers.ModelSerializer):
         return None
     
     def get_user_is_registered(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.participants.filter(user=request.user).exists()
-        return False
+        return viewer_is_registered(obj, self.context.get('request'))
     
     def get_status(self, obj):
         now = timezone.now()
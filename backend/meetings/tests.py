@@ -0,0 +1,331 @@
+import json
+import time
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, close_old_connections, connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from meetings import live
+from meetings.models import Meeting, Notification, Participant
+from meetings.reminders import dispatch_due_reminders
+
+
+def create_meeting(creator, **kwargs):
+    defaults = {
+        'title': 'Meeting',
+        'description': 'Description',
+        'meeting_type': 'LIVE',
+        'start_time': timezone.now() + timedelta(days=2),
+    }
+    defaults.update(kwargs)
+    return Meeting.objects.create(creator=creator, **defaults)
+
+
+class MeetingListingQueryTests(APITestCase):
+    """Meeting list endpoints must not issue per-meeting participant queries"""
+
+    def setUp(self):
+        self.instructor = User.objects.create_user(username='instructor', password='testpass123')
+        self.instructor.profile.status = 'Instructor'
+        self.instructor.profile.save()
+        self.student = User.objects.create_user(username='student', password='testpass123')
+
+    def _seed(self, count):
+        for _ in range(count):
+            meeting = create_meeting(self.instructor)
+            Participant.objects.create(meeting=meeting, user=self.student)
+            attendee = User.objects.create_user(username=f'attendee{Participant.objects.count()}', password='x')
+            Participant.objects.create(meeting=meeting, user=attendee, is_attending=True)
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_list_endpoints_query_count_is_constant(self):
+        self.client.force_authenticate(self.student)
+        urls = [reverse('my-meetings'), reverse('upcoming-meetings'), reverse('meeting-list')]
+
+        self._seed(2)
+        small = [self._count_queries(url)[0] for url in urls]
+        self._seed(5)
+        large = [self._count_queries(url)[0] for url in urls]
+        self.assertEqual(small, large)
+
+        _, response = self._count_queries(reverse('my-meetings'))
+        meeting = response.data['meetings'][0]
+        self.assertEqual(response.data['total'], 7)
+        self.assertEqual(meeting['participants_count'], 2)
+        self.assertTrue(meeting['user_is_registered'])
+
+    def test_available_meetings_excludes_full_and_registered(self):
+        self._seed(1)
+        open_meeting = create_meeting(self.instructor, max_participants=2)
+        full_meeting = create_meeting(self.instructor, max_participants=1)
+        Participant.objects.create(meeting=full_meeting, user=self.instructor)
+
+        self.client.force_authenticate(self.student)
+        _, response = self._count_queries(reverse('available-meetings'))
+        self.assertEqual([m['id'] for m in response.data['meetings']], [open_meeting.pk])
+        self.assertFalse(response.data['meetings'][0]['user_is_registered'])
+
+        annotated = Meeting.objects.with_listing_stats(self.student).get(pk=full_meeting.pk)
+        self.assertEqual((annotated.participants_count, annotated.attending_count), (1, 0))
+
+
+class MeetingAnalyticsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = User.objects.create_user(username='host', password='testpass123')
+        self.meeting = create_meeting(self.instructor, start_time=timezone.now() - timedelta(hours=3))
+        for status_name, count in (('present', 3), ('late', 1), ('absent', 2), ('registered', 4)):
+            for i in range(count):
+                user = User.objects.create_user(username=f'{status_name}{i}', password='x')
+                Participant.objects.create(
+                    meeting=self.meeting, user=user, attendance_status=status_name,
+                    is_attending=status_name in ('present', 'late'),
+                )
+        self.client.force_authenticate(self.instructor)
+
+    def test_stats_use_one_query_and_cache_after_end(self):
+        url = reverse('meeting-analytics', kwargs={'meeting_id': self.meeting.pk})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        stats = response.data['attendance_stats']
+        self.assertEqual(
+            (stats['total'], stats['present'], stats['late'], stats['absent'], stats['not_marked']),
+            (10, 3, 1, 2, 4),
+        )
+        self.assertEqual(stats['attendance_rate'], 40.0)
+        self.assertEqual(sum('meetings_participant' in q['sql'] for q in queries), 1)
+
+        # Ended meeting: served from the cache until a participant changes
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertFalse(any('meetings_participant' in q['sql'] for q in queries))
+
+        Participant.objects.filter(attendance_status='registered').first().delete()
+        response = self.client.get(url)
+        self.assertEqual(response.data['attendance_stats']['total'], 9)
+
+    def test_attendance_report_streams_csv_and_json_lines(self):
+        url = reverse('meeting-attendance-report', kwargs={'meeting_id': self.meeting.pk})
+
+        response = self.client.get(url, {'export': 'csv'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['id', 'user_id', 'username'])
+        self.assertEqual(len(lines), 11)
+
+        response = self.client.get(url, {'export': 'jsonl'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(rows[0]['statistics']['total'], 10)
+        self.assertEqual(len(rows), 11)
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['statistics']['present'], 3)
+        self.assertEqual(len(response.data['participants']), 10)
+
+
+class MeetingReminderTests(APITestCase):
+    def setUp(self):
+        self.instructor = User.objects.create_user(username='host', password='testpass123')
+        self.students = [User.objects.create_user(username=f'student{i}', password='x') for i in range(5)]
+
+    def test_reminders_only_on_create_or_reschedule(self):
+        meeting = create_meeting(self.instructor)
+        reminders = Notification.objects.filter(meeting=meeting)
+        self.assertEqual(
+            sorted(reminders.values_list('notification_type', flat=True)), ['DAY_BEFORE', 'HOUR_BEFORE']
+        )
+        original_ids = set(reminders.values_list('pk', flat=True))
+
+        meeting.title = 'Renamed'
+        meeting.save()
+        self.assertEqual(set(reminders.values_list('pk', flat=True)), original_ids)
+
+        meeting.start_time += timedelta(days=1)
+        meeting.save()
+        self.assertEqual(reminders.count(), 2)
+        self.assertFalse(original_ids & set(reminders.values_list('pk', flat=True)))
+
+    def test_recipients_bulk_inserted_and_due_reminders_dispatched(self):
+        meeting = create_meeting(self.instructor)
+        for student in self.students:
+            Participant.objects.create(meeting=meeting, user=student)
+
+        with CaptureQueriesContext(connection) as queries:
+            notification = Notification.create_for_meeting(meeting, 'CUSTOM', 'hello')
+        inserts = [q for q in queries if q['sql'].startswith('INSERT') and 'recipients' in q['sql']]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(notification.recipients.count(), 6)
+
+        # Reminders scheduled before anyone registered get the current participants at dispatch
+        Notification.objects.filter(meeting=meeting, notification_type='HOUR_BEFORE').update(
+            scheduled_time=timezone.now() - timedelta(minutes=1)
+        )
+        self.assertEqual(dispatch_due_reminders(batch_size=1), 2)
+        reminder = Notification.objects.get(meeting=meeting, notification_type='HOUR_BEFORE')
+        self.assertTrue(reminder.sent)
+        self.assertEqual(reminder.recipients.count(), 6)
+        self.assertFalse(Notification.objects.get(meeting=meeting, notification_type='DAY_BEFORE').sent)
+        self.assertEqual(dispatch_due_reminders(), 0)
+
+
+class LiveJoinTests(APITestCase):
+    def setUp(self):
+        self.instructor = User.objects.create_user(username='instructor', password='testpass123')
+        self.meeting = create_meeting(self.instructor, start_time=timezone.now(), max_participants=1)
+        self.students = [
+            User.objects.create_user(username=f'student{i}', password='testpass123') for i in range(2)
+        ]
+        for student in self.students:
+            Participant.objects.create(meeting=self.meeting, user=student)
+
+    def test_join_leave_and_capacity(self):
+        first, second = self.students
+        self.assertEqual(live.join(self.meeting, first)[0], live.JOINED)
+        self.assertEqual(live.join(self.meeting, first)[0], live.ALREADY_JOINED)
+        self.assertEqual(live.join(self.meeting, second)[0], live.FULL)
+        self.assertFalse(Participant.objects.get(meeting=self.meeting, user=second).is_attending)
+        self.assertEqual(live.join(self.meeting, self.instructor)[0], live.NOT_REGISTERED)
+
+        left, duration = live.leave(self.meeting, first)
+        self.assertTrue(left)
+        self.assertIsNotNone(duration)
+        self.assertEqual(live.join(self.meeting, second)[0], live.JOINED)
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.live_attendees_count, 1)
+
+    def test_deleting_attending_participant_frees_the_seat(self):
+        first, second = self.students
+        live.join(self.meeting, first)
+        Participant.objects.get(meeting=self.meeting, user=first).delete()
+        self.assertEqual(live.join(self.meeting, second)[0], live.JOINED)
+
+        second.delete()
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.live_attendees_count, 0)
+
+    def test_full_save_keeps_the_live_counter(self):
+        stale = Meeting.objects.get(pk=self.meeting.pk)
+        live.join(self.meeting, self.students[0])
+        stale.title = 'Renamed'
+        stale.save()
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.title, 'Renamed')
+        self.assertEqual(self.meeting.live_attendees_count, 1)
+
+    def test_join_endpoint_reports_full_meeting(self):
+        live.join(self.meeting, self.students[0])
+        self.client.force_authenticate(self.students[1])
+        response = self.client.post(reverse('meeting-join', args=[self.meeting.pk]))
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(MEETING_FINALIZE_ASYNC=False)
+class AttendanceFinalizationTests(APITestCase):
+    def setUp(self):
+        self.instructor = User.objects.create_user(username='instructor', password='testpass123')
+        self.instructor.profile.status = 'Instructor'
+        self.instructor.profile.save()
+        self.meeting = create_meeting(
+            self.instructor, start_time=timezone.now() - timedelta(hours=1), max_participants=10
+        )
+        self.meeting.is_live_started = True
+        self.meeting.save()
+        students = [User.objects.create_user(username=f'student{i}', password='x') for i in range(6)]
+        Participant.objects.bulk_create([Participant(meeting=self.meeting, user=s) for s in students])
+        for student in students[:4]:
+            live.join(self.meeting, student)
+        live.leave(self.meeting, students[0])
+
+    def test_end_live_finalizes_with_set_based_updates(self):
+        self.client.force_authenticate(self.instructor)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post(reverse('meeting-end-live', args=[self.meeting.pk]))
+        self.assertEqual(response.status_code, 200)
+        # Nothing is finalized until the deferred job runs
+        self.assertEqual(self.meeting.participants.filter(is_attending=True).count(), 3)
+
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+        self.assertLessEqual(len(queries), 8)
+
+        participants = self.meeting.participants.all()
+        self.assertFalse(participants.filter(is_attending=True).exists())
+        self.assertEqual(participants.filter(attendance_duration__isnull=False).count(), 4)
+        self.assertEqual(participants.filter(attendance_status='absent').count(), 2)
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.live_attendees_count, 0)
+
+    def test_sweep_finalizes_meetings_whose_job_was_lost(self):
+        other = create_meeting(self.instructor, start_time=timezone.now() - timedelta(hours=1))
+        Participant.objects.create(meeting=other, user=self.instructor)
+        self.client.force_authenticate(self.instructor)
+        with self.captureOnCommitCallbacks(execute=False):
+            # The deferred job is dropped, as on a worker restart
+            self.client.post(reverse('meeting-end-live', args=[self.meeting.pk]))
+        self.assertEqual(self.meeting.participants.filter(is_attending=True).count(), 3)
+
+        call_command('finalize_ended_meetings', stdout=StringIO())
+        participants = self.meeting.participants.all()
+        self.assertFalse(participants.filter(is_attending=True).exists())
+        self.assertEqual(participants.filter(attendance_status='absent').count(), 2)
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.live_attendees_count, 0)
+        # Meetings that have not ended are left alone, and a second sweep has nothing to do
+        self.assertEqual(other.participants.get().attendance_status, 'registered')
+        self.assertEqual(live.finalize_ended_meetings(), 0)
+
+    def test_mark_absent_is_single_update(self):
+        self.meeting.participants.filter(is_attending=True).update(attendance_status='present')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(live.mark_absent(self.meeting.pk), 2)
+        self.assertEqual(len(queries), 1)
+
+
+class ConcurrentLiveJoinTests(TransactionTestCase):
+    """A burst of simultaneous joins must never exceed max_participants"""
+
+    CAPACITY = 50
+    USERS = 200
+
+    def _join(self, meeting, user):
+        try:
+            # SQLite serializes writers; retry the whole transaction when locked
+            for _ in range(200):
+                try:
+                    return live.join(meeting, user)[0]
+                except OperationalError:
+                    time.sleep(0.01)
+            raise AssertionError('join never acquired the database')
+        finally:
+            close_old_connections()
+
+    def test_capacity_holds_under_burst(self):
+        instructor = User.objects.create_user(username='instructor', password='x')
+        meeting = create_meeting(instructor, start_time=timezone.now(), max_participants=self.CAPACITY)
+        User.objects.bulk_create([User(username=f'user{i}') for i in range(self.USERS)])
+        users = list(User.objects.filter(username__startswith='user'))
+        Participant.objects.bulk_create([Participant(meeting=meeting, user=user) for user in users])
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda user: self._join(meeting, user), users))
+
+        meeting.refresh_from_db()
+        self.assertEqual(results.count(live.JOINED), self.CAPACITY)
+        self.assertEqual(results.count(live.FULL), self.USERS - self.CAPACITY)
+        self.assertEqual(meeting.live_attendees_count, self.CAPACITY)
+        self.assertEqual(meeting.participants.filter(is_attending=True).count(), self.CAPACITY)
@@ -2,6 +2,7 @@ from rest_framework import generics, permissions, status, filters, viewsets
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
 from django.db.models import Q, Avg, Count, Sum, F
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
@@ -9,8 +10,10 @@ from datetime import timedelta, datetime
 from django.core.paginator import Paginator
 
 from .models import Meeting, Participant, Notification, MeetingChat, MeetingInvitation
+from . import analytics, live
 from courses.models import Course, Enrollment
 from users.models import Instructor, Profile
+from core.replica import read_from_replica
 from .serializers import (
     MeetingDetailSerializer, MeetingCreateSerializer,
     MeetingAttendanceSerializer, MeetingInvitationSerializer,
@@ -20,6 +23,19 @@ from .serializers import (
 )
 
 
+def join_error_response(result):
+    """Error response for a failed live.join() result, or None on success"""
+    if result == live.NOT_REGISTERED:
+        return Response({
+            'error': 'يجب التسجيل في الاجتماع للانضمام إليه'
+        }, status=status.HTTP_403_FORBIDDEN)
+    if result == live.FULL:
+        return Response({
+            'error': 'الاجتماع ممتلئ'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    return None
+
+
 class MeetingViewSet(viewsets.ModelViewSet):
     """إدارة الاجتماعات المباشرة"""
     queryset = Meeting.objects.all()
@@ -40,8 +56,10 @@ class MeetingViewSet(viewsets.ModelViewSet):
         return MeetingBasicSerializer
 
     def get_queryset(self):
-        queryset = self.queryset
         user = self.request.user
+        queryset = self.queryset
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.with_listing_stats(user)
         
         # For retrieve action, allow access to all meetings
         if self.action == 'retrieve':
@@ -163,41 +181,16 @@ class MeetingViewSet(viewsets.ModelViewSet):
                 'error': 'الاجتماع غير نشط'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Check if user is a participant
-        if not meeting.participants.filter(user=user).exists():
-            return Response({
-                'error': 'يجب التسجيل في الاجتماع للانضمام إليه'
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Check if meeting is full
-        current_attendees = meeting.participants.filter(
-            is_attending=True
-        ).count()
-        
-        if current_attendees >= meeting.max_participants:
-            return Response({
-                'error': 'الاجتماع ممتلئ'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Get or create participant record
-        participant, created = Participant.objects.get_or_create(
-            meeting=meeting,
-            user=user,
-            defaults={
-                'attendance_status': 'registered'
-            }
-        )
-        
-        # Mark attendance and update join time
-        participant.is_attending = True
-        participant.attendance_time = timezone.now()
-        participant.attendance_status = 'present'
-        participant.save()
+        # Reserve a seat and record attendance atomically (capacity-safe under bursts)
+        result, participant_id, _ = live.join(meeting, user, track_lateness=False)
+        error = join_error_response(result)
+        if error:
+            return error
         
         return Response({
             'message': 'تم الانضمام للاجتماع بنجاح',
             'meeting_url': meeting.zoom_link,
-            'participant_id': participant.id
+            'participant_id': participant_id
         })
     
     @action(detail=True, methods=['post'])
@@ -208,30 +201,16 @@ class MeetingViewSet(viewsets.ModelViewSet):
         meeting = self.get_object()
         user = request.user
         
-        try:
-            participant = Participant.objects.get(
-                meeting=meeting,
-                user=user,
-                is_attending=True
-            )
-            
-            participant.exit_time = timezone.now()
-            participant.is_attending = False
-            # Calculate attendance duration
-            if participant.attendance_time:
-                duration = participant.exit_time - participant.attendance_time
-                participant.attendance_duration = duration
-            participant.save()
-            
-            return Response({
-                'message': 'تم مغادرة الاجتماع',
-                'attendance_duration': str(participant.attendance_duration) if participant.attendance_duration else None
-            })
-        
-        except Participant.DoesNotExist:
+        left, attendance_duration = live.leave(meeting, user)
+        if not left:
             return Response({
                 'error': 'لم تنضم للاجتماع بعد'
             }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'message': 'تم مغادرة الاجتماع',
+            'attendance_duration': str(attendance_duration) if attendance_duration else None
+        })
     
     @action(detail=True, methods=['get'])
     def participants(self, request, pk=None):
@@ -376,6 +355,9 @@ class MeetingViewSet(viewsets.ModelViewSet):
         meeting.live_ended_at = timezone.now()
         meeting.save()
         
+        # Close open attendances and mark no-shows absent in the background
+        live.schedule_finalization(meeting.pk, meeting.live_ended_at)
+        
         return Response({
             'message': 'تم إنهاء الاجتماع المباشر بنجاح',
             'meeting_id': meeting.id,
@@ -390,19 +372,15 @@ class MeetingViewSet(viewsets.ModelViewSet):
         meeting = self.get_object()
         user = request.user
         
-        # Check if user is a participant
-        try:
-            participant = Participant.objects.get(meeting=meeting, user=user)
-        except Participant.DoesNotExist:
+        # Mark attendance (capacity-safe, see meetings.live)
+        result, _, _ = live.join(meeting, user, track_lateness=False)
+        if result == live.NOT_REGISTERED:
             return Response({
                 'error': 'يجب التسجيل في الاجتماع أولاً'
             }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Mark attendance
-        participant.is_attending = True
-        participant.attendance_time = timezone.now()
-        participant.attendance_status = 'present'
-        participant.save()
+        error = join_error_response(result)
+        if error:
+            return error
         
         return Response({
             'message': 'تم تسجيل الحضور بنجاح',
@@ -451,6 +429,7 @@ class MeetingViewSet(viewsets.ModelViewSet):
                 participant.attendance_time = timezone.now()
             
             participant.save()
+            live.recount([meeting.pk])
             
             return Response({
                 'message': f'تم تحديث حالة الحضور إلى {attendance_status}',
@@ -533,12 +512,7 @@ def mark_absent_participants(request, meeting_id):
     
     # Only mark absent if meeting has ended or is significantly past start time
     if now > meeting.start_time + timedelta(minutes=30):
-        absent_count = 0
-        
-        for participant in meeting.participants.filter(attendance_status='registered'):
-            participant.attendance_status = 'absent'
-            participant.save()
-            absent_count += 1
+        absent_count = live.mark_absent(meeting.pk)
         
         return Response({
             'message': f'تم تسجيل {absent_count} طالب كغائبين',
@@ -580,52 +554,28 @@ def auto_join_meeting(request, meeting_id):
             'error': 'الاجتماع غير نشط'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    # Check if user is a participant
-    if not meeting.participants.filter(user=user).exists():
-        return Response({
-            'error': 'يجب التسجيل في الاجتماع للانضمام إليه'
-        }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Get or create participant record
-    participant, created = Participant.objects.get_or_create(
-        meeting=meeting,
-        user=user,
-        defaults={
-            'attendance_status': 'registered'
-        }
-    )
+    # Reserve a seat and record attendance atomically
+    result, participant_id, attendance_status = live.join(meeting, user)
     
     # Check if already attended (prevent duplicate attendance)
-    if participant.is_attending and participant.attendance_time:
+    if result == live.ALREADY_JOINED:
         return Response({
             'message': 'تم تسجيل الحضور مسبقاً',
-            'attendance_status': participant.attendance_status,
+            'attendance_status': attendance_status,
             'meeting_url': meeting.zoom_link,
-            'participant_id': participant.id,
+            'participant_id': participant_id,
             'already_attended': True
         })
     
-    # Auto mark attendance and update join time
-    participant.is_attending = True
-    participant.attendance_time = timezone.now()
-    
-    # Determine attendance status based on join time
-    meeting_start = meeting.start_time
-    current_time = timezone.now()
-    
-    # If joined more than 15 minutes after meeting start, mark as late
-    if current_time > meeting_start + timedelta(minutes=15):
-        participant.attendance_status = 'late'
-    else:
-        participant.attendance_status = 'present'
-    
-    participant.save()
+    error = join_error_response(result)
+    if error:
+        return error
     
     return Response({
         'message': 'تم الانضمام التلقائي للاجتماع وتسجيل الحضور',
-        'attendance_status': participant.attendance_status,
+        'attendance_status': attendance_status,
         'meeting_url': meeting.zoom_link,
-        'participant_id': participant.id
+        'participant_id': participant_id
     })
     
     @action(detail=True, methods=['post'])
@@ -753,19 +703,17 @@ def my_meetings(request):
     """Get current user's meetings"""
     user = request.user
     
-    # Get meetings user created (for teachers/instructors)
-    created_meetings = Meeting.objects.filter(creator=user)
-    
-    # Get meetings user is registered for (for students)
-    registered_meetings = Meeting.objects.filter(participants__user=user)
-    
-    # Combine and remove duplicates
-    all_meetings = (created_meetings | registered_meetings).distinct().order_by('-start_time')
+    # Meetings user created (for teachers/instructors) or is registered for (for students);
+    # the subquery avoids the duplicate rows (and DISTINCT) of a participants join
+    all_meetings = Meeting.objects.filter(
+        Q(creator=user) | Q(pk__in=Participant.objects.filter(user=user).values('meeting'))
+    ).with_listing_stats(user).order_by('-start_time')
     
     serializer = MeetingBasicSerializer(all_meetings, many=True, context={'request': request})
+    data = serializer.data
     return Response({
-        'meetings': serializer.data,
-        'total': all_meetings.count()
+        'meetings': data,
+        'total': len(data)
     })
 
 
@@ -793,16 +741,15 @@ def available_meetings(request):
         start_time__gte=now - timedelta(hours=1)  # Include meetings that started within the last hour
     ).exclude(
         participants__user=user
-    ).annotate(
-        registered_count=Count('participants')
-    ).filter(
-        registered_count__lt=F('max_participants')
+    ).with_listing_stats(user).filter(
+        participants_count__lt=F('max_participants')
     ).order_by('start_time')
     
     serializer = MeetingBasicSerializer(available_meetings, many=True, context={'request': request})
+    data = serializer.data
     return Response({
-        'meetings': serializer.data,
-        'total': available_meetings.count()
+        'meetings': data,
+        'total': len(data)
     })
 
 
@@ -822,12 +769,13 @@ def joinable_meetings(request):
         # Currently ongoing meetings
         Q(start_time__lte=now) &
         Q(start_time__gte=now - timedelta(hours=2))  # Started within last 2 hours
-    ).order_by('start_time')
+    ).with_listing_stats(user).order_by('start_time')
     
     serializer = MeetingBasicSerializer(joinable_meetings, many=True, context={'request': request})
+    data = serializer.data
     return Response({
-        'meetings': serializer.data,
-        'total': joinable_meetings.count()
+        'meetings': data,
+        'total': len(data)
     })
 
 
@@ -846,12 +794,13 @@ def teaching_meetings(request):
     # Get meetings created by the teacher
     teaching_meetings = Meeting.objects.filter(
         creator=user
-    ).order_by('-start_time')
+    ).with_listing_stats(user).order_by('-start_time')
     
     serializer = MeetingBasicSerializer(teaching_meetings, many=True, context={'request': request})
+    data = serializer.data
     return Response({
-        'meetings': serializer.data,
-        'total': teaching_meetings.count()
+        'meetings': data,
+        'total': len(data)
     })
 
 
@@ -865,12 +814,13 @@ def attending_meetings(request):
     attending_meetings = Meeting.objects.filter(
         participants__user=user,
         is_active=True
-    ).order_by('-start_time')
+    ).with_listing_stats(user).order_by('-start_time')
     
     serializer = MeetingBasicSerializer(attending_meetings, many=True, context={'request': request})
+    data = serializer.data
     return Response({
-        'meetings': serializer.data,
-        'total': attending_meetings.count()
+        'meetings': data,
+        'total': len(data)
     })
 
 
@@ -887,12 +837,13 @@ def meeting_history(request):
         participants__user=user,
         start_time__lt=now - timedelta(hours=1),
         is_active=True
-    ).order_by('-start_time')
+    ).with_listing_stats(user).order_by('-start_time')
     
     serializer = MeetingBasicSerializer(history_meetings, many=True, context={'request': request})
+    data = serializer.data
     return Response({
-        'meetings': serializer.data,
-        'total': history_meetings.count()
+        'meetings': data,
+        'total': len(data)
     })
 
 
@@ -998,18 +949,18 @@ def meeting_status(request, meeting_id):
     
     # Determine meeting status
     if meeting.start_time > now:
-        status = 'upcoming'
+        meeting_state = 'upcoming'
     elif meeting.start_time <= now <= meeting.start_time + meeting.duration:
-        status = 'live'
+        meeting_state = 'live'
     else:
-        status = 'completed'
+        meeting_state = 'completed'
     
     # Get participant count
     participant_count = meeting.participants.count()
     
     return Response({
         'meeting_id': meeting.id,
-        'status': status,
+        'status': meeting_state,
         'participant_count': participant_count,
         'max_participants': meeting.max_participants,
         'start_time': meeting.start_time,
@@ -1035,25 +986,13 @@ def meeting_analytics(request, meeting_id):
             'error': 'ليس لديك صلاحية لعرض إحصائيات هذا الاجتماع'
         }, status=status.HTTP_403_FORBIDDEN)
     
-    # Get attendance statistics
-    participants = meeting.participants.all()
-    total_participants = participants.count()
-    
+    # All attendance buckets in one aggregate query (cached once the meeting ended)
+    stats = analytics.get_attendance_stats(meeting)
     attendance_stats = {
-        'total': total_participants,
-        'present': participants.filter(attendance_status='present').count(),
-        'absent': participants.filter(attendance_status='absent').count(),
-        'late': participants.filter(attendance_status='late').count(),
-        'not_marked': participants.filter(attendance_status='registered').count(),
+        key: stats[key]
+        for key in ('total', 'present', 'absent', 'late', 'not_marked', 'attendance_rate')
     }
     
-    if total_participants > 0:
-        attendance_stats['attendance_rate'] = round(
-            (attendance_stats['present'] + attendance_stats['late']) / total_participants * 100, 2
-        )
-    else:
-        attendance_stats['attendance_rate'] = 0
-    
     return Response({
         'meeting_id': meeting.id,
         'attendance_stats': attendance_stats,
@@ -1083,41 +1022,36 @@ def meeting_attendance_report(request, meeting_id):
             'error': 'ليس لديك صلاحية لعرض تقرير الحضور لهذا الاجتماع'
         }, status=status.HTTP_403_FORBIDDEN)
     
-    # Get all participants with their details
-    participants = meeting.participants.select_related('user__profile').all()
-    
-    participant_data = []
-    for participant in participants:
-        participant_data.append({
-            'id': participant.id,
-            'user_id': participant.user.id,
-            'name': f"{participant.user.first_name} {participant.user.last_name}",
-            'email': participant.user.email,
-            'attendance_status': participant.attendance_status,
-            'joined_at': participant.joined_at,
-            'left_at': participant.left_at
-        })
-    
-    # Calculate statistics
-    total = len(participant_data)
-    present = len([p for p in participant_data if p['attendance_status'] == 'present'])
-    absent = len([p for p in participant_data if p['attendance_status'] == 'absent'])
-    late = len([p for p in participant_data if p['attendance_status'] == 'late'])
-    not_marked = len([p for p in participant_data if p['attendance_status'] == 'registered'])
-    
-    attendance_rate = round((present + late) / total * 100, 2) if total > 0 else 0
+    # Large webinars: stream the rows instead of building the whole report in memory
+    export = request.query_params.get('export')
+    if export == 'csv':
+        response = StreamingHttpResponse(analytics.stream_report_csv(meeting), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="meeting-{meeting.id}-attendance.csv"'
+        return response
+    if export == 'jsonl':
+        return StreamingHttpResponse(analytics.stream_report_jsonl(meeting), content_type='application/x-ndjson')
+    
+    participant_data = [
+        {
+            'id': row['id'],
+            'user_id': row['user_id'],
+            'name': f"{row['first_name']} {row['last_name']}",
+            'email': row['email'],
+            'attendance_status': row['attendance_status'],
+            'joined_at': row['joined_at'],
+            'left_at': row['left_at']
+        }
+        for row in analytics.iter_report_rows(meeting)
+    ]
+    stats = analytics.get_attendance_stats(meeting)
     
     return Response({
         'meeting_id': meeting.id,
         'meeting_title': meeting.title,
         'meeting_date': meeting.start_time,
         'statistics': {
-            'total': total,
-            'present': present,
-            'absent': absent,
-            'late': late,
-            'not_marked': not_marked,
-            'attendance_rate': attendance_rate
+            key: stats[key]
+            for key in ('total', 'present', 'absent', 'late', 'not_marked', 'attendance_rate')
         },
         'participants': participant_data
     })
@@ -1160,12 +1094,13 @@ def upcoming_meetings(request):
     upcoming_meetings = Meeting.objects.filter(
         start_time__gt=now,
         is_active=True
-    ).order_by('start_time')
+    ).with_listing_stats(user).order_by('start_time')
     
     serializer = MeetingBasicSerializer(upcoming_meetings, many=True, context={'request': request})
+    data = serializer.data
     return Response({
-        'meetings': serializer.data,
-        'total': upcoming_meetings.count()
+        'meetings': data,
+        'total': len(data)
     })
 
 
@@ -1239,16 +1174,19 @@ def search_meetings(request):
             Q(creator=user) | Q(participants__user=user)
         )
     
+    meetings = meetings.with_listing_stats(user)
     serializer = MeetingBasicSerializer(meetings, many=True, context={'request': request})
+    data = serializer.data
     return Response({
-        'meetings': serializer.data,
-        'total': meetings.count(),
+        'meetings': data,
+        'total': len(data),
         'query': query
     })
 
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@read_from_replica
 def dashboard_stats(request):
     """Get meeting statistics for dashboard"""
     user = request.user
@@ -1311,6 +1249,7 @@ def dashboard_stats(request):
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@read_from_replica
 def general_stats(request):
     """Get general meeting statistics"""
     now = timezone.now()
@@ -1401,51 +1340,17 @@ def meeting_join(request, meeting_id):
             'error': 'الاجتماع غير نشط'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    # Check if user is a participant
-    if not meeting.participants.filter(user=user).exists():
-        return Response({
-            'error': 'يجب التسجيل في الاجتماع للانضمام إليه'
-        }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Check if meeting is full
-    current_attendees = meeting.participants.filter(
-        is_attending=True
-    ).count()
-    
-    if current_attendees >= meeting.max_participants:
-        return Response({
-            'error': 'الاجتماع ممتلئ'
-        }, status=status.HTTP_400_BAD_REQUEST)
-    
-    # Get or create participant record
-    participant, created = Participant.objects.get_or_create(
-        meeting=meeting,
-        user=user,
-        defaults={
-            'attendance_status': 'registered'
-        }
-    )
-    
-    # Mark attendance and update join time
-    participant.is_attending = True
-    participant.attendance_time = timezone.now()
-    
-    # Determine attendance status based on join time
-    meeting_start = meeting.start_time
-    current_time = timezone.now()
-    
-    # If joined more than 15 minutes after meeting start, mark as late
-    if current_time > meeting_start + timedelta(minutes=15):
-        participant.attendance_status = 'late'
-    else:
-        participant.attendance_status = 'present'
-    
-    participant.save()
+    # Reserve a seat and record attendance atomically; joining more than
+    # 15 minutes after the start marks the attendee as late
+    result, participant_id, _ = live.join(meeting, user)
+    error = join_error_response(result)
+    if error:
+        return error
     
     return Response({
         'message': 'تم الانضمام للاجتماع بنجاح',
         'meeting_url': meeting.zoom_link,
-        'participant_id': participant.id
+        'participant_id': participant_id
     })
 
 
@@ -3,7 +3,7 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.contrib.admin import SimpleListFilter
-from django.db.models import Count, Q
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
 from .models import Notification, NotificationSettings, NotificationTemplate, NotificationLog
 
@@ -70,7 +70,8 @@ class DeliveryStatusFilter(SimpleListFilter):
 
     def queryset(self, request, queryset):
         if self.value():
-            return queryset.filter(logs__status=self.value()).distinct()
+            logs = NotificationLog.objects.filter(notification=OuterRef('pk'), status=self.value())
+            return queryset.filter(Exists(logs))
         return queryset
 
 
@@ -155,13 +156,17 @@ class NotificationAdmin(admin.ModelAdmin):
     read_status.short_description = 'حالة القراءة'
     
     def delivery_status(self, obj):
+        # Logs are prefetched in get_queryset (newest first)
         logs = obj.logs.all()
-        if not logs.exists():
+        if not logs:
             return format_html('<span style="color: #6c757d;">لم يتم الإرسال</span>')
         
+        def latest_log(method):
+            return next((log for log in logs if log.delivery_method == method), None)
+        
         statuses = []
         if obj.email_sent:
-            email_log = logs.filter(delivery_method='email').first()
+            email_log = latest_log('email')
             if email_log:
                 if email_log.status == 'delivered':
                     statuses.append('📧✅')
@@ -171,7 +176,7 @@ class NotificationAdmin(admin.ModelAdmin):
                     statuses.append('📧⏳')
         
         if obj.push_sent:
-            push_log = logs.filter(delivery_method='push').first()
+            push_log = latest_log('push')
             if push_log:
                 if push_log.status == 'delivered':
                     statuses.append('📱✅')
@@ -198,7 +203,7 @@ class NotificationAdmin(admin.ModelAdmin):
     
     def delivery_summary(self, obj):
         logs = obj.logs.all()
-        if not logs.exists():
+        if not logs:
             return 'لم يتم الإرسال'
         
         summary = []
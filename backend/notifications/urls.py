@@ -7,9 +7,6 @@ router = DefaultRouter()
 router.register(r'', views.NotificationViewSet, basename='notification')
 
 urlpatterns = [
-    # Include router URLs for notifications at root level
-    path('', include(router.urls)),
-    
     # Bulk operations
     path('bulk-send/', views.send_bulk_notification, name='bulk-send-notification'),
     path('search/', views.search_notifications, name='search-notifications'),
@@ -21,4 +18,8 @@ urlpatterns = [
     # Statistics
     path('stats/dashboard/', views.dashboard_stats, name='notification-dashboard-stats'),
     path('stats/general/', views.general_stats, name='notification-general-stats'),
+
+    # Router URLs for notifications at root level; last, so that its <pk>/
+    # route does not shadow the paths above
+    path('', include(router.urls)),
 ] 
@@ -12,6 +12,7 @@ from datetime import timedelta
 
 from .models import Notification
 from courses.models import Course
+from core.replica import read_from_replica
 from .serializers import (
     NotificationBasicSerializer, NotificationDetailSerializer, NotificationCreateSerializer,
     BulkNotificationSerializer, NotificationMarkReadSerializer, NotificationSettingsSerializer,
@@ -319,6 +320,7 @@ def notification_settings(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def dashboard_stats(request):
     """Get notification statistics for dashboard"""
     user = request.user
@@ -361,6 +363,7 @@ def dashboard_stats(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def general_stats(request):
     """Get general notification statistics (admin only)"""
     if request.user.profile.status not in ['admin', 'manager']:
@@ -1,13 +1,65 @@
-from django.db import models
-from django.db.models import Avg
+from django.db import models, transaction
+from django.db.models import Avg, Exists, OuterRef, Prefetch, Value
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from core.aggregates import count_subquery
+
 User = get_user_model()
 
+
+def viewer_has_liked_expression(like_queryset, user):
+    """Exists() expression for the viewer's like, False for anonymous users"""
+    if user is None or not user.is_authenticated:
+        return Value(False, output_field=models.BooleanField())
+    return Exists(like_queryset.filter(user=user))
+
+
+class CourseReviewQuerySet(models.QuerySet):
+    def with_listing_stats(self, user=None):
+        """Annotate like_count, reply_count and viewer_has_liked in one statement
+        and prefetch replies, so listing reviews costs a fixed number of queries.
+        """
+        return self.select_related('user__profile').annotate(
+            like_count=count_subquery(ReviewLike.objects.filter(review=OuterRef('pk')), 'review'),
+            reply_count=count_subquery(ReviewReply.objects.filter(review=OuterRef('pk')), 'review'),
+            viewer_has_liked=viewer_has_liked_expression(
+                ReviewLike.objects.filter(review=OuterRef('pk')), user
+            ),
+        ).prefetch_related(
+            Prefetch('replies', queryset=ReviewReply.objects.select_related('user__profile'))
+        )
+
+
+class CommentQuerySet(models.QuerySet):
+    def with_listing_stats(self, user=None, reply_depth=2):
+        """Annotate like_count, reply_count and viewer_has_liked in one statement.
+        
+        Active replies are prefetched (annotated the same way) into
+        ``active_replies`` down to ``reply_depth`` levels.
+        """
+        queryset = self.select_related('user__profile').annotate(
+            like_count=count_subquery(CommentLike.objects.filter(comment=OuterRef('pk')), 'comment'),
+            reply_count=count_subquery(
+                Comment.objects.filter(parent=OuterRef('pk'), is_active=True), 'parent'
+            ),
+            viewer_has_liked=viewer_has_liked_expression(
+                CommentLike.objects.filter(comment=OuterRef('pk')), user
+            ),
+        )
+        if reply_depth > 0:
+            replies = Comment.objects.filter(is_active=True).with_listing_stats(
+                user, reply_depth=reply_depth - 1
+            ).order_by('created_at')
+            queryset = queryset.prefetch_related(
+                Prefetch('replies', queryset=replies, to_attr='active_replies')
+            )
+        return queryset
+
+
 class CourseReview(models.Model):
     """User reviews for courses"""
     RATING_CHOICES = [
@@ -27,6 +79,8 @@ class CourseReview(models.Model):
     is_approved = models.BooleanField(default=True)
     likes = models.ManyToManyField(User, through='ReviewLike', related_name='liked_reviews')
     
+    objects = CourseReviewQuerySet.as_manager()
+    
     class Meta:
         unique_together = ('course', 'user')
         ordering = ['-created_at']
@@ -35,32 +89,51 @@ class CourseReview(models.Model):
         return f"{self.user.username}'s review for {self.course.title}"
     
     def save(self, *args, **kwargs):
-        print(f"=== MODEL SAVE DEBUG ===")
-        print(f"Review ID: {getattr(self, 'id', 'NEW')}")
-        print(f"Rating: {self.rating}")
-        print(f"Review Text: '{self.review_text}'")
-        print(f"User: {self.user}")
-        print(f"Course: {self.course}")
-        print(f"=========================")
+        previous = None
+        if self.pk:
+            previous = CourseReview.objects.filter(pk=self.pk).values(
+                'course_id', 'rating', 'is_approved'
+            ).first()
         
-        # Update course rating when review is saved
-        super().save(*args, **kwargs)
-        self.update_course_rating()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.update_course_rating(previous)
+    
+    @property
+    def rating_contribution(self):
+        """Star value this review adds to the course aggregates (None if not counted)"""
+        return self.rating if self.is_approved else None
     
-    def update_course_rating(self):
-        """Update the course's average rating"""
-        self.course.update_statistics()
+    def update_course_rating(self, previous=None):
+        """Apply this review's create/update/approval change to the course aggregates"""
+        from courses.models import Course
+        
+        old_rating = None
+        if previous and previous['is_approved']:
+            old_rating = previous['rating']
+        
+        if previous and previous['course_id'] != self.course_id:
+            Course.apply_rating_change(previous['course_id'], old_rating=old_rating)
+            old_rating = None
+        Course.apply_rating_change(self.course_id, old_rating=old_rating, new_rating=self.rating_contribution)
     
     @property
     def like_count(self):
         """Get the number of likes for this review"""
-        return self.likes.count()
+        if hasattr(self, '_like_count'):
+            return self._like_count
+        return self.review_likes.count()
+    
+    @like_count.setter
+    def like_count(self, value):
+        # Set by CourseReviewQuerySet.with_listing_stats()
+        self._like_count = value
     
     def is_liked_by_user(self, user=None):
         """Check if this review is liked by a specific user"""
-        if not user:
+        if not user or not user.is_authenticated:
             return False
-        return self.likes.filter(user=user).exists()
+        return self.review_likes.filter(user=user).exists()
 
 
 class ReviewReply(models.Model):
@@ -91,6 +164,8 @@ class Comment(models.Model):
     parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE, related_name='replies')
     likes = models.ManyToManyField(User, through='CommentLike', related_name='liked_comments')
     
+    objects = CommentQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
     
@@ -105,7 +180,14 @@ class Comment(models.Model):
     @property
     def like_count(self):
         """Get the number of likes for this comment"""
-        return self.likes.count()
+        if hasattr(self, '_like_count'):
+            return self._like_count
+        return self.comment_likes.count()
+    
+    @like_count.setter
+    def like_count(self, value):
+        # Set by CommentQuerySet.with_listing_stats()
+        self._like_count = value
 
 
 class CommentLike(models.Model):
@@ -135,10 +217,11 @@ class ReviewLike(models.Model):
 
 
 # Signals
-@receiver(post_save, sender=CourseReview)
-def update_course_rating_on_save(sender, instance, **kwargs):
-    """Update course rating when a review is saved"""
-    instance.course.update_statistics()
+@receiver(post_delete, sender=CourseReview)
+def update_course_rating_on_delete(sender, instance, **kwargs):
+    """Remove a deleted review from the course rating aggregates"""
+    from courses.models import Course
+    Course.apply_rating_change(instance.course_id, old_rating=instance.rating_contribution)
 
 @receiver(post_save, sender=ReviewReply)
 def send_reply_notification(sender, instance, created, **kwargs):
@@ -40,6 +40,8 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'user']
     
     def get_replies_count(self, obj):
+        if hasattr(obj, 'reply_count'):
+            return obj.reply_count
         return obj.replies.count()
     
     def get_is_owner(self, obj):
@@ -52,45 +54,21 @@ class ReviewSerializer(serializers.ModelSerializer):
     def get_is_liked_by_user(self, obj):
         request = self.context.get('request')
         if request and hasattr(request, 'user') and request.user.is_authenticated:
+            if hasattr(obj, 'viewer_has_liked'):
+                return obj.viewer_has_liked
             return obj.is_liked_by_user(request.user)
         return False
     
     def get_user_name(self, obj):
         """Get user name from profile or fallback to username"""
         try:
-            print(f"=== GET_USER_NAME DEBUG ===")
-            print(f"User object: {obj.user}")
-            print(f"User ID: {obj.user.id if obj.user else 'NO USER'}")
-            print(f"Has profile: {hasattr(obj.user, 'profile')}")
-            
-            if hasattr(obj.user, 'profile'):
-                print(f"Profile object: {obj.user.profile}")
-                if obj.user.profile:
-                    print(f"Profile name: {obj.user.profile.name}")
-                    print(f"Profile name type: {type(obj.user.profile.name)}")
-                    if obj.user.profile.name:
-                        print(f"Returning profile name: {obj.user.profile.name}")
-                        return obj.user.profile.name
-                    else:
-                        print("Profile name is empty, checking first_name/last_name")
-                else:
-                    print("Profile is None")
-            
-            print(f"First name: {obj.user.first_name}")
-            print(f"Last name: {obj.user.last_name}")
+            profile = getattr(obj.user, 'profile', None)
+            if profile and profile.name:
+                return profile.name
             if obj.user.first_name and obj.user.last_name:
-                full_name = f"{obj.user.first_name} {obj.user.last_name}"
-                print(f"Returning full name: {full_name}")
-                return full_name
-            else:
-                print(f"Returning username: {obj.user.username}")
-                return obj.user.username
-                
-        except Exception as e:
-            print(f"Error getting user name: {e}")
-            print(f"Exception type: {type(e)}")
-            import traceback
-            traceback.print_exc()
+                return f"{obj.user.first_name} {obj.user.last_name}"
+            return obj.user.username
+        except Exception:
             return obj.user.username if obj.user else 'مستخدم'
     
     def get_user_image(self, obj):
@@ -104,23 +82,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         except Exception as e:
             print(f"Error getting user image: {e}")
             return None
-    
-    def to_representation(self, instance):
-        """Custom representation to add debugging info"""
-        data = super().to_representation(instance)
-        
-        # Debug user name
-        print(f"=== REVIEW SERIALIZER DEBUG ===")
-        print(f"Review ID: {instance.id}")
-        print(f"User: {instance.user}")
-        print(f"User name from profile: {getattr(instance.user.profile, 'name', 'NO PROFILE NAME') if hasattr(instance.user, 'profile') else 'NO PROFILE'}")
-        print(f"User first_name: {instance.user.first_name}")
-        print(f"User last_name: {instance.user.last_name}")
-        print(f"User username: {instance.user.username}")
-        print(f"Final user_name in data: {data.get('user_name', 'NOT FOUND')}")
-        print(f"=================================")
-        
-        return data
 
 
 class ReviewCreateSerializer(serializers.ModelSerializer):
@@ -163,8 +124,6 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
             **validated_data
         )
         print(f"Review created: ID={review.id}, Rating={review.rating}, Text='{review.review_text}'")
-        # Update course statistics
-        review.course.update_statistics()
         return review
 
 
@@ -184,10 +143,6 @@ class ReviewUpdateSerializer(serializers.ModelSerializer):
         instance.review_text = validated_data.get('review_text', instance.review_text)
         instance.updated_at = timezone.now()
         instance.save()
-        
-        # Update course statistics
-        instance.course.update_statistics()
-        
         return instance
 
 
@@ -211,22 +166,29 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'user']
     
     def get_likes_count(self, obj):
-        return obj.likes.count()
+        return obj.like_count
     
     def get_is_liked(self, obj):
         request = self.context.get('request')
         if request and hasattr(request, 'user') and request.user.is_authenticated:
-            return obj.likes.filter(user=request.user).exists()
+            if hasattr(obj, 'viewer_has_liked'):
+                return obj.viewer_has_liked
+            return obj.comment_likes.filter(user=request.user).exists()
         return False
     
     def get_replies(self, obj):
         # Only get direct replies (one level deep)
-        replies = obj.replies.filter(is_active=True).order_by('created_at')
+        if hasattr(obj, 'active_replies'):
+            replies = obj.active_replies
+        else:
+            replies = obj.replies.filter(is_active=True).order_by('created_at')
         serializer = CommentSerializer(
             replies, many=True, context=self.context)
         return serializer.data
     
     def get_replies_count(self, obj):
+        if hasattr(obj, 'reply_count'):
+            return obj.reply_count
         return obj.replies.filter(is_active=True).count()
     
     def get_is_owner(self, obj):
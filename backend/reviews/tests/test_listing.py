@@ -0,0 +1,69 @@
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from courses.models import Course
+from reviews.models import CourseReview, ReviewReply, ReviewLike, Comment, CommentLike
+
+User = get_user_model()
+
+
+class ReviewListingQueryTests(APITestCase):
+    """Listing reviews/comments must not issue per-row like/reply queries"""
+
+    def setUp(self):
+        self.viewer = User.objects.create_user(username='viewer', password='testpass123')
+        self.course = Course.objects.create(title='Listing Course', description='Description')
+
+    def _seed_reviews(self, count):
+        for i in range(count):
+            author = User.objects.create_user(username=f'author{CourseReview.objects.count()}', password='x')
+            review = CourseReview.objects.create(course=self.course, user=author, rating=4)
+            ReviewReply.objects.create(review=review, user=self.viewer, reply_text='thanks')
+            ReviewLike.objects.create(review=review, user=self.viewer)
+
+    def _seed_comments(self, count):
+        for i in range(count):
+            author = User.objects.create_user(username=f'commenter{Comment.objects.count()}', password='x')
+            comment = Comment.objects.create(course=self.course, user=author, content='hello')
+            Comment.objects.create(course=self.course, user=self.viewer, content='reply', parent=comment)
+            CommentLike.objects.create(comment=comment, user=self.viewer)
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_course_reviews_query_count_is_constant(self):
+        self.client.force_authenticate(self.viewer)
+        url = reverse('course-reviews', kwargs={'course_id': self.course.id})
+
+        self._seed_reviews(2)
+        small, _ = self._count_queries(url)
+        self._seed_reviews(6)
+        large, response = self._count_queries(url)
+
+        self.assertEqual(small, large)
+        review = response.data['results'][0]
+        self.assertEqual(review['like_count'], 1)
+        self.assertEqual(review['replies_count'], 1)
+        self.assertTrue(review['is_liked_by_user'])
+
+    def test_course_comments_query_count_is_constant(self):
+        self.client.force_authenticate(self.viewer)
+        url = reverse('course-comments', kwargs={'course_id': self.course.id})
+
+        self._seed_comments(2)
+        small, _ = self._count_queries(url)
+        self._seed_comments(6)
+        large, response = self._count_queries(url)
+
+        self.assertEqual(small, large)
+        comment = response.data['results'][0]
+        self.assertEqual(comment['likes_count'], 1)
+        self.assertEqual(comment['replies_count'], 1)
+        self.assertTrue(comment['is_liked'])
+        self.assertEqual(len(comment['replies']), 1)
@@ -0,0 +1,68 @@
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from courses.models import Course
+from reviews.models import CourseReview
+
+User = get_user_model()
+
+
+class CourseRatingAggregateTests(APITestCase):
+    """Course rating aggregates are maintained incrementally by review writes"""
+
+    def setUp(self):
+        self.course = Course.objects.create(title='Rated Course', description='Description')
+        self.users = [
+            User.objects.create_user(username=f'rater{i}', password='testpass123') for i in range(3)
+        ]
+
+    def _review(self, user, rating, **kwargs):
+        return CourseReview.objects.create(course=self.course, user=user, rating=rating, **kwargs)
+
+    def test_create_update_approve_and_delete(self):
+        first = self._review(self.users[0], 5)
+        self._review(self.users[1], 3)
+        self._review(self.users[2], 1, is_approved=False)
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.ratings_count, 2)
+        self.assertEqual(self.course.ratings_sum, 8)
+        self.assertEqual(self.course.average_rating, 4.0)
+        self.assertEqual(self.course.rating_distribution, {1: 0, 2: 0, 3: 1, 4: 0, 5: 1})
+
+        first.rating = 4
+        first.save()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.rating_distribution, {1: 0, 2: 0, 3: 1, 4: 1, 5: 0})
+        self.assertEqual(self.course.average_rating, 3.5)
+
+        first.is_approved = False
+        first.save()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.ratings_count, 1)
+        self.assertEqual(self.course.average_rating, 3.0)
+
+        CourseReview.objects.filter(rating=3).get().delete()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.ratings_count, 0)
+        self.assertEqual(self.course.ratings_sum, 0)
+        self.assertEqual(self.course.average_rating, 0.0)
+
+    def test_rating_stats_endpoint_reads_course_only(self):
+        self._review(self.users[0], 5)
+        self._review(self.users[1], 2)
+        url = reverse('course-rating', kwargs={'course_id': self.course.id})
+
+        self.client.force_authenticate(self.users[0])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('reviews_coursereview' in q['sql'] for q in queries))
+        self.assertEqual(response.data['total_reviews'], 2)
+        self.assertEqual(response.data['average_rating'], 3.5)
+        self.assertEqual(response.data['rating_distribution'][5]['count'], 1)
+        self.assertEqual(response.data['rating_distribution'][2]['percentage'], 50.0)
@@ -8,6 +8,7 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Avg, Count, Q
 from django.utils import timezone
 
+from courses.access import get_course_access
 from courses.models import Course
 from users.models import User
 from .models import CourseReview, ReviewReply, Comment, CommentLike, ReviewLike
@@ -30,7 +31,7 @@ def create_review(request, course_id):
     print(f"User: {request.user}")
     
     # Check if user is enrolled
-    if not course.enrollments.filter(student=request.user, status__in=['active', 'completed']).exists():
+    if not get_course_access(request).is_enrolled(course):
         print(f"User {request.user} is not enrolled in course {course_id}")
         return Response({
             'error': 'يجب أن تكون مسجلاً في الدورة لتتمكن من تقييمها'
@@ -78,7 +79,7 @@ def create_review(request, course_id):
 def course_reviews(request, course_id):
     """جلب تقييمات الدورة"""
     course = get_object_or_404(Course, id=course_id)
-    reviews = course.reviews.all().order_by('-created_at')
+    reviews = course.reviews.with_listing_stats(request.user).order_by('-created_at')
     
     # Pagination
     from rest_framework.pagination import PageNumberPagination
@@ -86,7 +87,7 @@ def course_reviews(request, course_id):
     paginator.page_size = 10
     page = paginator.paginate_queryset(reviews, request)
     
-    serializer = ReviewSerializer(page, many=True)
+    serializer = ReviewSerializer(page, many=True, context={'request': request})
     return paginator.get_paginated_response(serializer.data)
 
 
@@ -97,7 +98,7 @@ class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     
     def get_queryset(self):
-        return CourseReview.objects.all()
+        return CourseReview.objects.with_listing_stats(self.request.user)
     
     def get_permissions(self):
         if self.request.method in ['PUT', 'PATCH', 'DELETE']:
@@ -174,7 +175,7 @@ class CommentListCreateView(generics.ListCreateAPIView):
             course_id=course_id,
             parent__isnull=True,  # Only top-level comments
             is_active=True
-        ).order_by('-created_at')
+        ).with_listing_stats(self.request.user).order_by('-created_at')
     
     def perform_create(self, serializer):
         course = get_object_or_404(Course, id=self.kwargs['course_id'])
@@ -202,7 +203,7 @@ class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
         return Comment.objects.filter(
             course_id=self.kwargs['course_id'],
             is_active=True
-        )
+        ).with_listing_stats(self.request.user)
     
     def perform_update(self, serializer):
         if serializer.instance.user != self.request.user and not self.request.user.is_staff:
@@ -304,19 +305,21 @@ def like_review(request, review_id):
 def course_rating_stats(request, course_id):
     """Get course rating statistics"""
     try:
-        course = get_object_or_404(Course, id=course_id)
-        
-        # Get all approved reviews for this course
-        reviews = CourseReview.objects.filter(course=course, is_approved=True)
+        # Aggregates are maintained on the course by the review write paths
+        course = get_object_or_404(
+            Course.objects.only(
+                'id', 'ratings_count', 'ratings_sum',
+                *[f'rating_{star}_count' for star in range(1, 6)]
+            ),
+            id=course_id
+        )
         
-        # Calculate statistics
-        total_reviews = reviews.count()
-        average_rating = reviews.aggregate(Avg('rating'))['rating__avg'] or 0
+        total_reviews = course.ratings_count
+        average_rating = course.ratings_sum / total_reviews if total_reviews else 0
         
         # Rating distribution
         rating_distribution = {}
-        for i in range(1, 6):
-            count = reviews.filter(rating=i).count()
+        for i, count in course.rating_distribution.items():
             percentage = (count / total_reviews * 100) if total_reviews > 0 else 0
             rating_distribution[i] = {
                 'count': count,
@@ -3,6 +3,7 @@ from django.utils import timezone
 from django.db import transaction
 from decimal import Decimal
 from courses.models import Course
+from courses.viewer_context import get_viewer_context
 from users.models import User
 from .models import Cart, CartItem, Wishlist, Order, OrderItem, Coupon
 
@@ -74,7 +75,7 @@ class CartItemSerializer(serializers.ModelSerializer):
         
         # Check if the user is already enrolled in the course
         if request and hasattr(request, 'user') and request.user.is_authenticated:
-            if course.enrollments.filter(student=request.user).exists():
+            if get_viewer_context(request).has_enrollment(course):
                 raise serializers.ValidationError("You are already enrolled in this course.")
         
         return course
@@ -152,8 +153,7 @@ class WishlistCourseSerializer(serializers.ModelSerializer):
     def get_is_in_cart(self, obj):
         request = self.context.get('request')
         if request and hasattr(request, 'user') and request.user.is_authenticated:
-            cart, _ = Cart.objects.get_or_create(user=request.user)
-            return cart.items.filter(course=obj).exists()
+            return get_viewer_context(request).is_in_cart(obj)
         return False
 
 
@@ -180,14 +180,14 @@ class WishlistAddCourseSerializer(serializers.Serializer):
     def validate_course(self, course):
         request = self.context.get('request')
         if request and hasattr(request, 'user') and request.user.is_authenticated:
-            wishlist, _ = Wishlist.objects.get_or_create(user=request.user)
+            viewer = get_viewer_context(request)
             
             # Check if already in wishlist
-            if wishlist.courses.filter(id=course.id).exists():
+            if viewer.is_in_wishlist(course):
                 raise serializers.ValidationError("This course is already in your wishlist.")
             
             # Check if already enrolled
-            if course.enrollments.filter(student=request.user).exists():
+            if viewer.has_enrollment(course):
                 raise serializers.ValidationError("You are already enrolled in this course.")
         
         return course
@@ -206,9 +206,9 @@ class OrderItemSerializer(serializers.ModelSerializer):
         model = OrderItem
         fields = [
             'id', 'course_id', 'course_title', 'course_image',
-            'price', 'discount_amount', 'final_price', 'created_at'
+            'price', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at', 'price', 'discount_amount', 'final_price']
+        read_only_fields = ['id', 'created_at', 'price']
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -227,15 +227,15 @@ class OrderSerializer(serializers.ModelSerializer):
         model = Order
         fields = [
             'id', 'order_number', 'user', 'items', 'subtotal', 'tax', 'total',
-            'discount_amount', 'final_total', 'status', 'status_display',
+            'discount_amount', 'status', 'status_display',
             'payment_method', 'payment_method_display', 'payment_status',
-            'billing_address', 'shipping_address', 'coupon', 'transaction_id',
+            'billing_name', 'billing_email', 'billing_address', 'coupon', 'payment_id',
             'created_at', 'updated_at'
         ]
         read_only_fields = [
             'id', 'order_number', 'user', 'subtotal', 'tax', 'total',
-            'discount_amount', 'final_total', 'status', 'payment_status',
-            'transaction_id', 'created_at', 'updated_at'
+            'discount_amount', 'status', 'payment_status',
+            'payment_id', 'created_at', 'updated_at'
         ]
     
     def create(self, validated_data):
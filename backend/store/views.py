@@ -14,6 +14,7 @@ import json
 import requests
 
 from courses.models import Course
+from courses.viewer_context import get_viewer_context
 from users.models import User
 from .models import Cart, CartItem, Wishlist, Order, OrderItem, Coupon
 from .serializers import (
@@ -31,6 +32,10 @@ class CartDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_object(self):
         cart, created = Cart.objects.get_or_create(user=self.request.user)
         return cart
+    
+    def perform_destroy(self, instance):
+        instance.delete()
+        get_viewer_context(self.request).invalidate()
 
 
 class CartItemCreateView(generics.CreateAPIView):
@@ -56,6 +61,8 @@ class CartItemCreateView(generics.CreateAPIView):
             raise serializers.ValidationError("You are already enrolled in this course.")
         
         serializer.save(cart=cart)
+        # Cart membership was loaded (validation) before this request changed it
+        get_viewer_context(self.request).invalidate()
 
 
 class CartItemDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -67,8 +74,13 @@ class CartItemDetailView(generics.RetrieveUpdateDestroyAPIView):
         cart, created = Cart.objects.get_or_create(user=self.request.user)
         return CartItem.objects.filter(cart=cart)
     
+    def perform_update(self, serializer):
+        serializer.save()
+        get_viewer_context(self.request).invalidate()
+    
     def perform_destroy(self, instance):
         instance.delete()
+        get_viewer_context(self.request).invalidate()
 
 
 # Wishlist Views
@@ -94,6 +106,7 @@ class WishlistAddView(generics.CreateAPIView):
         course = serializer.validated_data['course']
         wishlist, _ = Wishlist.objects.get_or_create(user=request.user)
         wishlist.courses.add(course)
+        get_viewer_context(request).invalidate()
         
         return Response(
             {"detail": "Course added to wishlist"},
@@ -118,6 +131,7 @@ class WishlistRemoveView(generics.DestroyAPIView):
                 )
                 
             wishlist.courses.remove(course)
+            get_viewer_context(request).invalidate()
             return Response(
                 {"detail": "Course removed from wishlist"},
                 status=status.HTTP_204_NO_CONTENT
@@ -183,6 +197,7 @@ class OrderListCreateView(generics.ListCreateAPIView):
         # Clear the cart
         cart.items.all().delete()
         cart.update_total()
+        get_viewer_context(request).invalidate()
         
         serializer = self.get_serializer(order)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -7,8 +7,11 @@ from rest_framework.views import APIView
 from .serializers_payment import PaymentMethodSerializer
 from django.shortcuts import get_object_or_404
 from django.conf import settings
+from django.db import models
 from django.utils import timezone
 
+from core.replica import ReplicaReadMixin
+
 from .models import Order
 from .models_payment import PaymentMethod, RefundRequest, Transaction
 from .serializers_payment import (
@@ -221,6 +224,7 @@ class RefundRequestViewSet(
 
 
 class TransactionViewSet(
+    ReplicaReadMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
@@ -229,6 +233,7 @@ class TransactionViewSet(
     API endpoints for viewing transactions
     """
     serializer_class = TransactionSerializer
+    replica_actions = ('summary',)
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
@@ -5,13 +5,14 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.contrib.admin import SimpleListFilter
-from django.db.models import Count
+from django.db.models import Case, OuterRef, When
 from django.conf import settings
 from .models import Profile, Organization, Instructor, Student
 from django.utils import timezone
 from django.http import JsonResponse
 from django.urls import path
 from django.shortcuts import get_object_or_404
+from core.aggregates import count_subquery
 
 class StatusFilter(SimpleListFilter):
     title = 'حالة المستخدم'
@@ -167,27 +168,32 @@ class CustomUserAdmin(BaseUserAdmin):
     profile_image.short_description = 'الصورة'
     
     def courses_count(self, obj):
-        try:
-            if obj.profile.status == 'Instructor':
-                count = obj.instructor.course_set.count() if hasattr(obj, 'instructor') else 0
-                if count > 0:
-                    url = reverse('admin:courses_course_changelist') + f'?instructor__profile__user__id__exact={obj.id}'
-                    return format_html('<a href="{}">{} دورة</a>', url, count)
-                return '0 دورة'
-            elif obj.profile.status == 'Student':
-                count = obj.course_enrollments.count()
-                if count > 0:
-                    url = reverse('admin:courses_enrollment_changelist') + f'?student__id__exact={obj.id}'
-                    return format_html('<a href="{}">{} دورة</a>', url, count)
-                return '0 دورة'
-            return '-'
-        except Profile.DoesNotExist:
+        # Annotated in get_queryset: courses taught by instructors, enrollments of students
+        count = obj.courses_total
+        if count is None:
             return '-'
+        if count > 0:
+            if obj.profile.status == 'Instructor':
+                url = reverse('admin:courses_course_changelist') + f'?instructor__profile__user__id__exact={obj.id}'
+            else:
+                url = reverse('admin:courses_enrollment_changelist') + f'?student__id__exact={obj.id}'
+            return format_html('<a href="{}">{} دورة</a>', url, count)
+        return '0 دورة'
     courses_count.short_description = 'الدورات'
+    courses_count.admin_order_field = 'courses_total'
     
     def get_queryset(self, request):
+        from courses.models import Course, Enrollment
+        
         queryset = super().get_queryset(request)
-        return queryset.select_related('profile').prefetch_related('course_enrollments')
+        taught = Course.instructors.through.objects.filter(instructor__profile__user=OuterRef('pk'))
+        enrolled = Enrollment.objects.filter(student=OuterRef('pk'))
+        return queryset.select_related('profile').annotate(
+            courses_total=Case(
+                When(profile__status='Instructor', then=count_subquery(taught, 'instructor__profile__user')),
+                When(profile__status='Student', then=count_subquery(enrolled, 'student')),
+            )
+        )
     
     def get_fieldsets(self, request, obj=None):
         """Hide permissions for non-superusers"""
@@ -437,16 +443,19 @@ class OrganizationAdmin(admin.ModelAdmin):
     profile_name.short_description = 'اسم المنظمة'
     
     def teachers_count(self, obj):
-        count = obj.instructor_set.count()
+        count = obj.teachers_total
         if count > 0:
             url = reverse('admin:users_instructor_changelist') + f'?organization__id__exact={obj.id}'
             return format_html('<a href="{}">{} معلم</a>', url, count)
         return '0 معلم'
     teachers_count.short_description = 'المعلمين'
+    teachers_count.admin_order_field = 'teachers_total'
     
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        return queryset.select_related('profile').prefetch_related('instructor_set')
+        return queryset.select_related('profile').annotate(
+            teachers_total=count_subquery(Instructor.objects.filter(organization=OuterRef('pk')), 'organization')
+        )
 
 @admin.register(Instructor)
 class InstructorAdmin(admin.ModelAdmin):
@@ -474,24 +483,32 @@ class InstructorAdmin(admin.ModelAdmin):
     profile_name.short_description = 'اسم المدرب'
     
     def courses_count(self, obj):
-        count = obj.courses_taught.count()
+        count = obj.courses_total
         if count > 0:
             url = reverse('admin:courses_course_changelist') + f'?instructor__id__exact={obj.id}'
             return format_html('<a href="{}">{} دورة</a>', url, count)
         return '0 دورة'
     courses_count.short_description = 'الدورات'
+    courses_count.admin_order_field = 'courses_total'
     
     def students_count(self, obj):
-        from django.db.models import Count
-        count = obj.courses_taught.aggregate(total=Count('enrollments'))['total'] or 0
+        count = obj.students_total
         if count > 0:
             url = reverse('admin:courses_enrollment_changelist') + f'?course__instructor__id__exact={obj.id}'
             return format_html('<a href="{}">{} طالب</a>', url, count)
         return '0 طالب'
     students_count.short_description = 'الطلاب'
+    students_count.admin_order_field = 'students_total'
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('profile', 'organization').prefetch_related('courses_taught', 'courses_taught__enrollments')
+        from courses.models import Course, Enrollment
+        
+        taught = Course.instructors.through.objects.filter(instructor=OuterRef('pk'))
+        enrollments = Enrollment.objects.filter(course__instructors=OuterRef('pk'))
+        return super().get_queryset(request).select_related('profile', 'organization').annotate(
+            courses_total=count_subquery(taught, 'instructor'),
+            students_total=count_subquery(enrollments, 'course__instructors'),
+        )
 
 
 @admin.register(Student)
@@ -515,21 +532,26 @@ class StudentAdmin(admin.ModelAdmin):
     
     def enrolled_courses(self, obj):
         if obj.profile and obj.profile.user:
-            count = obj.profile.user.course_enrollments.filter(status='active').count()
+            count = obj.active_enrollments_total
             if count > 0:
                 url = reverse('admin:courses_enrollment_changelist') + f'?student__id__exact={obj.profile.user.id}'
                 return format_html('<a href="{}">{} دورة</a>', url, count)
             return '0 دورة'
         return '-'
     enrolled_courses.short_description = 'الدورات المسجلة'
+    enrolled_courses.admin_order_field = 'active_enrollments_total'
     
     def completed_courses(self, obj):
-        if obj.profile and obj.profile.user:
-            count = obj.profile.user.course_enrollments.filter(status='completed').count()
-            return f'{count} دورة'
-        return '0 دورة'
+        return f'{obj.completed_enrollments_total} دورة'
     completed_courses.short_description = 'الدورات المكتملة'
+    completed_courses.admin_order_field = 'completed_enrollments_total'
     
     def get_queryset(self, request):
+        from courses.models import Enrollment
+        
         queryset = super().get_queryset(request)
-        return queryset.select_related('profile__user').prefetch_related('profile__user__course_enrollments')
+        enrollments = Enrollment.objects.filter(student=OuterRef('profile__user'))
+        return queryset.select_related('profile__user').annotate(
+            active_enrollments_total=count_subquery(enrollments.filter(status='active'), 'student'),
+            completed_enrollments_total=count_subquery(enrollments.filter(status='completed'), 'student'),
+        )
@@ -0,0 +1,68 @@
+"""
+JWT authentication backed by a cached identity snapshot.
+
+``JWTAuthentication`` loads the ``User`` row on every request, and most
+views then touch ``user.profile`` and ``profile.get_instructor_object()``.
+``CachedJWTAuthentication`` resolves the token's ``user_id`` claim to a
+snapshot -- the ``User`` with its profile and instructor already joined --
+kept in the shared cache for ``PRINCIPAL_CACHE_TIMEOUT`` seconds, so a warm
+request spends no queries on identity.
+
+The snapshot is a real ``User`` instance (views filter querysets by
+``request.user``), dropped by the receivers in ``users.models``
+whenever the user, their profile or instructor record is saved or deleted,
+which includes deactivation.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+CACHE_KEY = 'auth:principal:{user_id}'
+
+
+def _timeout():
+    return getattr(settings, 'PRINCIPAL_CACHE_TIMEOUT', 300)
+
+
+def load_principal(user_id):
+    """The user with profile and instructor preloaded, or None if it does not exist"""
+    key = CACHE_KEY.format(user_id=user_id)
+    user = cache.get(key)
+    if user is None:
+        user = (
+            get_user_model().objects
+            .select_related('profile', 'profile__instructor')
+            .filter(**{api_settings.USER_ID_FIELD: user_id})
+            .first()
+        )
+        if user is None:
+            return None
+        cache.set(key, user, _timeout())
+    return user
+
+
+def invalidate_principal(*user_ids):
+    cache.delete_many([CACHE_KEY.format(user_id=user_id) for user_id in user_ids if user_id])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """Drop-in replacement for JWTAuthentication that reads the cached snapshot"""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = load_principal(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
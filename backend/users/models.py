@@ -55,11 +55,16 @@ class Profile(models.Model):
         الحصول على كائن المدرب (أو إنشاؤه للأدمن إذا لم يكن موجوداً)
         """
         if self.status == 'Instructor':
+            # Reverse one-to-one: free when preloaded (e.g. the cached JWT principal)
             try:
-                return Instructor.objects.get(profile=self)
+                return self.instructor
             except Instructor.DoesNotExist:
                 return None
         elif self.status == 'Admin' or self.user.is_superuser:
+            try:
+                return self.instructor
+            except Instructor.DoesNotExist:
+                pass
             # إنشاء كائن مدرب للأدمن إذا لم يكن موجوداً
             instructor, created = Instructor.objects.get_or_create(
                 profile=self,
@@ -153,3 +158,30 @@ def update_user_profile(sender, instance, created, **kwargs):
             import logging
             logger = logging.getLogger(__name__)
             logger.error(f"Error updating profile for user {instance.username}: {str(e)}")
+
+
+# Cached JWT principal (users.authentication) -------------------------------
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_principal(sender, instance, **kwargs):
+    """Also covers deactivation (is_active=False is a user save)"""
+    from .authentication import invalidate_principal
+    invalidate_principal(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile_principal(sender, instance, **kwargs):
+    from .authentication import invalidate_principal
+    invalidate_principal(instance.user_id)
+
+
+@receiver(post_save, sender=Instructor)
+@receiver(post_delete, sender=Instructor)
+def invalidate_instructor_principal(sender, instance, **kwargs):
+    from .authentication import invalidate_principal
+    if instance.profile_id:
+        invalidate_principal(
+            Profile.objects.filter(pk=instance.profile_id).values_list('user_id', flat=True).first()
+        )
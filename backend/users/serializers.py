@@ -2,6 +2,7 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from users.models import Profile, Student, Organization, Instructor
+from core.images import ImageVariantsField
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
@@ -39,12 +40,13 @@ class ProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     user_id = serializers.CharField(source='user.id', read_only=True)
     user_email = serializers.CharField(source='user.email', read_only=True)
+    image_profile_variants = ImageVariantsField(source='image_profile')
     
     class Meta:
         model = Profile
         fields = [
             'id', 'name', 'user', 'user_id', 'user_email', 'email', 'phone', 'status',
-            'image_profile', 'shortBio', 'detail', 'github', 'youtube', 'twitter',
+            'image_profile', 'image_profile_variants', 'shortBio', 'detail', 'github', 'youtube', 'twitter',
             'facebook', 'instagram', 'linkedin', 'created_at'
         ]
         read_only_fields = ['id', 'user', 'user_id', 'user_email', 'created_at']
@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.authentication import CachedJWTAuthentication
+from users.models import Instructor
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """Warm requests must not query the database for identity"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='teacher', password='testpass123')
+        self.user.profile.status = 'Instructor'
+        self.user.profile.save()
+        self.instructor = Instructor.objects.create(profile=self.user.profile)
+        self.token = str(AccessToken.for_user(self.user))
+
+    def _authenticate(self):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return CachedJWTAuthentication().authenticate(request)[0]
+
+    def test_warm_identity_costs_no_queries(self):
+        self._authenticate()
+        with self.assertNumQueries(0):
+            user = self._authenticate()
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user.profile.status, 'Instructor')
+            self.assertEqual(user.profile.get_instructor_object(), self.instructor)
+
+    def test_snapshot_is_invalidated_on_changes(self):
+        self._authenticate()
+        self.user.profile.status = 'Student'
+        self.user.profile.save()
+        self.assertEqual(self._authenticate().profile.status, 'Student')
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate()
@@ -25,6 +25,8 @@ from rest_framework.parsers import MultiPartParser, FormParser
 
 from .models import Profile, Student, Organization, Instructor
 from courses.models import Enrollment, Course
+from core.replica import read_from_replica
+from core.images import variant_urls
 from .serializers import (
     ProfileSerializer, StudentSerializer, OrganizationSerializer,
     UserDetailSerializer, ProfileUpdateSerializer, UserListSerializer, UserRegistrationSerializer,
@@ -144,6 +146,7 @@ class OrganizationListView(generics.ListAPIView):
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@read_from_replica
 def user_stats(request):
     """
     إحصائيات المستخدمين (للإداريين فقط)
@@ -166,6 +169,7 @@ def user_stats(request):
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@read_from_replica
 def dashboard_stats(request):
     # إحصائيات لوحة التحكم
     user = request.user
@@ -561,7 +565,8 @@ def instructors_list(request):
                 'email': instructor.profile.email,
                 'department': instructor.department,
                 'bio': instructor.bio,
-                'profile_pic': instructor.profile.image_profile.url if instructor.profile.image_profile else None
+                'profile_pic': instructor.profile.image_profile.url if instructor.profile.image_profile else None,
+                'profile_pic_variants': variant_urls(instructor.profile.image_profile),
             }
             for instructor in instructors
         ]
@@ -98,8 +98,13 @@ class EmailVerificationView(APIView):
     """
     permission_classes = [AllowAny]
     
-    def get(self, request, uidb64, token):
+    def get(self, request, uidb64=None, token=None):
         # This handles GET requests from email links
+        if not (uidb64 and token):
+            return Response(
+                {"detail": "Verification link is missing the uid or token."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         context = {'uid': uidb64, 'token': token}
         return Response(context)
     